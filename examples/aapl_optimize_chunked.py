@@ -8,6 +8,10 @@ from pystockfilter.data.stock_data_source import DataSourceModule as Data
 from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
 from pystockfilter.tool.start_chunked_optimizer import StartChunkedOptimizer
 from pystockfilter.tool.start_optimizer import StartOptimizer
+from pystockfilter import setup_module_logger
+
+# Show the warnings and progress of pystockfilter on the console
+setup_module_logger("pystockfilter")
 
 
 # Set multiprocessing method to enhance optimization speed
@@ -4,6 +4,10 @@ import multiprocessing as mp
 from pystockfilter.data.stock_data_source import DataSourceModule as Data
 from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
 from pystockfilter.tool.start_optimizer import StartOptimizer
+from pystockfilter import setup_module_logger
+
+# Show the warnings and progress of pystockfilter on the console
+setup_module_logger("pystockfilter")
 
 # Set multiprocessing method to enhance optimization speed
 mp.set_start_method("fork")
@@ -4,6 +4,10 @@ from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
 from pystockfilter.strategy.uo_ema_cross_close_strategy import UltimateEmaCrossCloseStrategy
 from pystockfilter.tool.start_backtest import StartBacktest
 from pytickersymbols import PyTickerSymbols as pts
+from pystockfilter import setup_module_logger
+
+# Show the warnings and progress of pystockfilter on the console
+setup_module_logger("pystockfilter")
 
 # Get list of DAX symbols
 symbols = pts()
@@ -5,7 +5,10 @@ from pystockfilter.strategy.macd_strategy import MACDStrategy
 from pystockfilter.tool.start_backtest import StartBacktest
 from pystockfilter.tool.start_batch_optimizer import StartBatchOptimizer
 from pytickersymbols import PyTickerSymbols as pts
-from pystockfilter import logger
+from pystockfilter import setup_module_logger
+
+# Show the warnings and progress of pystockfilter on the console
+setup_module_logger("pystockfilter")
 
 # Activate multiprocessing for backtesting
 mp.set_start_method("fork")
@@ -11,6 +11,10 @@ from pystockfilter.data.stock_data_source import DataSourceModule as Data
 from pystockfilter.strategy.uo_strategy import UltimateStrategy
 from pystockfilter.tool.start_chunked_optimizer import StartChunkedOptimizer
 from pystockfilter.tool.start_seq_optimizer import StartSequentialOptimizer
+from pystockfilter import setup_module_logger
+
+# Show the warnings and progress of pystockfilter on the console
+setup_module_logger("pystockfilter")
 
 # Set multiprocessing method to "fork" for optimized parallel processing in Unix-based systems.
 mp.set_start_method("fork")
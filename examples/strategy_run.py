@@ -1,6 +1,10 @@
 from pystockfilter.data.stock_data_source import DataSourceModule as Data
 from pystockfilter.strategy.bollinger_volume_strategy import BollingerVolumeStrategy
 from pystockfilter.tool.start_backtest import StartBacktest
+from pystockfilter import setup_module_logger
+
+# Show the warnings and progress of pystockfilter on the console
+setup_module_logger("pystockfilter")
 
 BollingerVolumeStrategy.caching = False
 strategies = [BollingerVolumeStrategy]
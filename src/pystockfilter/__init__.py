@@ -1,14 +1,11 @@
 __version__ = "2.3.1"
-import os
-import sys  
-sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
-
 
 import logging
 
 def setup_module_logger(name, level=logging.INFO, file_name=None):
     """
     Sets up a logger with the specified name, logging level, and optional file handler.
+    Called by applications, the package itself only attaches a NullHandler.
 
     Args:
         name (str): The name of the logger.
@@ -20,6 +17,9 @@ def setup_module_logger(name, level=logging.INFO, file_name=None):
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
+    # configure the handlers only once, e.g. when the module is reloaded
+    if any(not isinstance(h, logging.NullHandler) for h in logger.handlers):
+        return logger
     
     # Create console handler
     ch = logging.StreamHandler()
@@ -41,8 +41,11 @@ def setup_module_logger(name, level=logging.INFO, file_name=None):
     
     return logger
 
-# Configure the module-wide logger
-module_logger = setup_module_logger(name="pystockfilter")
+# The module-wide logger; output is configured by the application,
+# e.g. with setup_module_logger("pystockfilter")
+module_logger = logging.getLogger("pystockfilter")
+if not module_logger.handlers:
+    module_logger.addHandler(logging.NullHandler())
 
 # Optionally, add the logger to the module's globals
-globals()['logger'] = module_logger
\ No newline at end of file
+globals()['logger'] = module_logger
@@ -57,6 +57,14 @@ try:
 except ImportError:
     __version__ = '?.?.?'  # Package not installed
 
-from .backtesting import Backtest, Strategy  # noqa: F401
+from .backtesting import Backtest, PreparedData, Strategy  # noqa: F401
+from .streaming import StreamingBacktest  # noqa: F401
 from . import lib  # noqa: F401
-from ._plotting import set_bokeh_output  # noqa: F401
+
+
+def __getattr__(name):
+    # bokeh is only imported when plotting
+    if name == 'set_bokeh_output':
+        from ._plotting import set_bokeh_output
+        return set_bokeh_output
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
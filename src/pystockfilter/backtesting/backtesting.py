@@ -13,7 +13,7 @@ import warnings
 from abc import abstractmethod, ABCMeta
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from copy import copy
-from functools import lru_cache, partial
+from functools import cached_property, lru_cache, partial
 from itertools import repeat, product, chain, compress
 from math import copysign
 from numbers import Number
@@ -24,6 +24,8 @@ import pandas as pd
 from numpy.random import default_rng
 
 from pystockfilter.base.base_helper import BaseHelper
+from pystockfilter.cache.fingerprint import fingerprint, is_frozen
+from pystockfilter.data import with_precision
 
 try:
     from tqdm.auto import tqdm as _tqdm
@@ -35,7 +37,6 @@ except ImportError:
         return seq
 
 
-from ._plotting import plot
 from ._stats import compute_stats
 from ._util import _as_str, _Indicator, _Data, try_
 
@@ -154,6 +155,14 @@ class Strategy(metaclass=ABCMeta):
             value = try_(lambda: np.asarray(value, order="C"), None)
         is_arraylike = value is not None
 
+        # Indicators of float32 data are stored as float32 as well
+        if (
+            is_arraylike
+            and value.dtype == np.float64
+            and self._data.Close.dtype == np.float32
+        ):
+            value = value.astype(np.float32)
+
         # Optionally flip the array if the user returned e.g. `df.values`
         if is_arraylike and np.argmax(value.shape) == 0:
             value = value.T
@@ -645,14 +654,14 @@ class Trade:
     @property
     def entry_time(self) -> Union[pd.Timestamp, int]:
         """Datetime of when the trade was entered."""
-        return self.__broker._data.index[self.__entry_bar]
+        return self.__broker._time(self.__entry_bar)
 
     @property
     def exit_time(self) -> Optional[Union[pd.Timestamp, int]]:
         """Datetime of when the trade was exited."""
         if self.__exit_bar is None:
             return None
-        return self.__broker._data.index[self.__exit_bar]
+        return self.__broker._time(self.__exit_bar)
 
     @property
     def is_long(self):
@@ -728,6 +737,9 @@ class Trade:
 
 
 class _Broker:
+    # bar number of the first row of `_data`, see `StreamingBacktest`
+    _offset = 0
+
     def __init__(
         self,
         *,
@@ -820,7 +832,7 @@ class _Broker:
     @property
     def last_price(self) -> float:
         """Price at the last (current) close."""
-        return self._data.Close[-1]
+        return float(self._data.Close[-1])
 
     def _adjusted_price(self, size=None, price=None) -> float:
         """
@@ -839,8 +851,13 @@ class _Broker:
         margin_used = sum(trade.value / self._leverage for trade in self.trades)
         return max(0, self.equity - margin_used)
 
+    def _time(self, bar: int):
+        """Index value of the bar number `bar`."""
+        return self._data.index[bar - self._offset]
+
     def next(self):
-        i = self._i = len(self._data) - 1
+        i = len(self._data) - 1
+        self._i = self._offset + i
         self._process_orders()
 
         # Log account equity for the equity curve
@@ -851,15 +868,21 @@ class _Broker:
         if equity <= 0:
             assert self.margin_available <= 0
             for trade in self.trades:
-                self._close_trade(trade, self._data.Close[-1], i)
+                self._close_trade(trade, self.last_price, self._i)
             self._cash = 0
             self._equity[i:] = 0
             raise _OutOfMoneyError
 
     def _process_orders(self):
         data = self._data
-        open, high, low = data.Open[-1], data.High[-1], data.Low[-1]
-        prev_close = data.Close[-2]
+        # prices as Python floats: cash and P&L accumulate in float64
+        # even if the data is float32
+        open, high, low = (
+            float(data.Open[-1]),
+            float(data.High[-1]),
+            float(data.Low[-1]),
+        )
+        prev_close = float(data.Close[-2])
         reprocess_orders = False
 
         # Process orders
@@ -1071,6 +1094,109 @@ class _Broker:
             trade.sl = sl
 
 
+class PreparedData:
+    """
+    OHLCV data validated and converted once, to be shared read-only by
+    many `backtesting.backtesting.Backtest` instances (e.g. the stages of a
+    sequential optimization or the chunks of a chunked one).
+
+    The index is converted and sorted, the OHLCV columns are stored as
+    contiguous, read-only float arrays of the given `precision` and the
+    content fingerprint used by the indicator cache is computed once, on
+    first use. Strategies may add columns to `Strategy.data.df` but must
+    not replace the prepared ones.
+    """
+
+    def __init__(self, data: pd.DataFrame, precision: str = "float64"):
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError("`data` must be a pandas.DataFrame with columns")
+        data = data.copy(deep=False)
+
+        # Convert index to datetime index
+        if (
+            not isinstance(data.index, pd.DatetimeIndex)
+            and not isinstance(data.index, pd.RangeIndex)
+            and
+            # Numeric index with most large numbers
+            (
+                data.index.is_numeric()
+                and (data.index > pd.Timestamp("1975").timestamp()).mean() > 0.8
+            )
+        ):
+            try:
+                data.index = pd.to_datetime(data.index, infer_datetime_format=True)
+            except ValueError:
+                pass
+
+        if "Volume" not in data:
+            data["Volume"] = np.nan
+
+        if len(data) == 0:
+            raise ValueError("OHLC `data` is empty")
+        if (
+            len(data.columns.intersection({"Open", "High", "Low", "Close", "Volume"}))
+            != 5
+        ):
+            raise ValueError(
+                "`data` must be a pandas.DataFrame with columns "
+                "'Open', 'High', 'Low', 'Close', and (optionally) 'Volume'"
+            )
+        if data[["Open", "High", "Low", "Close"]].isnull().values.any():
+            raise ValueError(
+                "Some OHLC values are missing (NaN). "
+                "Please strip those lines with `df.dropna()` or "
+                "fill them in with `df.interpolate()` or whatever."
+            )
+        if not data.index.is_monotonic_increasing:
+            warnings.warn(
+                "Data index is not sorted in ascending order. Sorting.", stacklevel=3
+            )
+            data = data.sort_index()
+        if not isinstance(data.index, pd.DatetimeIndex):
+            warnings.warn(
+                "Data index is not datetime. Assuming simple periods, "
+                "but `pd.DateTimeIndex` is advised.",
+                stacklevel=3,
+            )
+
+        columns = {}
+        for column, values in with_precision(data, precision).items():
+            if column in ("Open", "High", "Low", "Close", "Volume"):
+                # read-only buffers (e.g. of a memory-mapped store) are shared,
+                # writeable ones are copied so that the caller cannot change
+                # the prepared data in place
+                values = np.ascontiguousarray(values, dtype=precision)
+                if not is_frozen(values):
+                    values = values.copy()
+                values.flags.writeable = False
+            columns[column] = values
+        data = pd.DataFrame(columns, index=data.index, copy=False)
+
+        self.df: pd.DataFrame = data
+        self.precision = precision
+        self.max_close = float(np.max(data["Close"]))
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Content fingerprint, computed on first use."""
+        return fingerprint(self.df)
+
+    def __len__(self):
+        return len(self.df)
+
+    def data(self) -> _Data:
+        """Returns a new `Strategy.data` accessor of the prepared data."""
+        data = _Data(self.df.copy(deep=False))
+        data._prepared = self
+        return data
+
+    def fingerprint_of(self, df: pd.DataFrame) -> Optional[str]:
+        """Returns `fingerprint` if `df` still holds the prepared data only."""
+        if len(df) == len(self.df) and df.columns.equals(self.df.columns):
+            return self.fingerprint
+        return None
+
+
 class Backtest:
     """
     Backtest a particular (parameterized) strategy
@@ -1093,6 +1219,7 @@ class Backtest:
         trade_on_close=False,
         hedging=False,
         exclusive_orders=False,
+        precision: str = "float64",
     ):
         """
         Initialize a backtest. Requires data and a strategy to test.
@@ -1137,75 +1264,43 @@ class Backtest:
         trade/position, making at most a single trade (long or short) in effect
         at each time.
 
+        `data` can also be a `backtesting.backtesting.PreparedData`, which
+        is validated and converted once and shared by many backtests.
+
+        `precision` is the float type of the OHLCV data and the indicators,
+        `"float64"` (default) or `"float32"`. float32 halves the memory
+        and bandwidth of the price data and indicators, e.g. for universe
+        wide optimizations. Cash, P&L and equity are still accumulated in
+        float64. Since float32 has about 7 significant digits, indicator
+        values differ from float64 by a relative error of about 1e-6;
+        signals only change where two indicators are equal within this
+        error, so results match float64 results up to rare, shifted trades.
+        The precision of a `PreparedData` is given when preparing it.
+
         [FIFO]: https://www.investopedia.com/terms/n/nfa-compliance-rule-2-43b.asp
         """
 
         if not (isinstance(strategy, type) and issubclass(strategy, Strategy)):
             raise TypeError("`strategy` must be a Strategy sub-type")
-        if not isinstance(data, pd.DataFrame):
+        if not isinstance(data, (pd.DataFrame, PreparedData)):
             raise TypeError("`data` must be a pandas.DataFrame with columns")
         if not isinstance(commission, Number):
             raise TypeError(
                 "`commission` must be a float value, percent of " "entry order price"
             )
 
-        data = data.copy(deep=False)
-
-        # Convert index to datetime index
-        if (
-            not isinstance(data.index, pd.DatetimeIndex)
-            and not isinstance(data.index, pd.RangeIndex)
-            and
-            # Numeric index with most large numbers
-            (
-                data.index.is_numeric()
-                and (data.index > pd.Timestamp("1975").timestamp()).mean() > 0.8
-            )
-        ):
-            try:
-                data.index = pd.to_datetime(data.index, infer_datetime_format=True)
-            except ValueError:
-                pass
-
-        if "Volume" not in data:
-            data["Volume"] = np.nan
-
-        if len(data) == 0:
-            raise ValueError("OHLC `data` is empty")
-        if (
-            len(data.columns.intersection({"Open", "High", "Low", "Close", "Volume"}))
-            != 5
-        ):
-            raise ValueError(
-                "`data` must be a pandas.DataFrame with columns "
-                "'Open', 'High', 'Low', 'Close', and (optionally) 'Volume'"
-            )
-        if data[["Open", "High", "Low", "Close"]].isnull().values.any():
-            raise ValueError(
-                "Some OHLC values are missing (NaN). "
-                "Please strip those lines with `df.dropna()` or "
-                "fill them in with `df.interpolate()` or whatever."
-            )
-        if np.any(data["Close"] > cash):
+        if not isinstance(data, PreparedData):
+            data = PreparedData(data, precision)
+        if data.max_close > cash:
             warnings.warn(
                 "Some prices are larger than initial cash value. Note that fractional "
                 "trading is not supported. If you want to trade Bitcoin, "
                 "increase initial cash, or trade μBTC or satoshis instead (GH-134).",
                 stacklevel=2,
             )
-        if not data.index.is_monotonic_increasing:
-            warnings.warn(
-                "Data index is not sorted in ascending order. Sorting.", stacklevel=2
-            )
-            data = data.sort_index()
-        if not isinstance(data.index, pd.DatetimeIndex):
-            warnings.warn(
-                "Data index is not datetime. Assuming simple periods, "
-                "but `pd.DateTimeIndex` is advised.",
-                stacklevel=2,
-            )
 
-        self._data: pd.DataFrame = data
+        self._prepared = data
+        self._data: pd.DataFrame = data.df
         self._broker = partial(
             _Broker,
             cash=cash,
@@ -1214,7 +1309,7 @@ class Backtest:
             trade_on_close=trade_on_close,
             hedging=hedging,
             exclusive_orders=exclusive_orders,
-            index=data.index,
+            index=data.df.index,
         )
         self._strategy = strategy
         self._results: Optional[pd.Series] = None
@@ -1258,7 +1353,7 @@ class Backtest:
             _trades                       Size  EntryB...
             dtype: object
         """
-        data = _Data(self._data.copy(deep=False))
+        data = self._prepared.data()
         broker: _Broker = self._broker(data=data)
         strategy: Strategy = self._strategy(broker, data, kwargs)
 
@@ -1453,6 +1548,12 @@ class Backtest:
                     f"optimization values: {k}={v}"
                 )
 
+        # Let the strategy precompute the indicators of the whole grid (e.g.
+        # as indicator banks) before any worker is started.
+        prepare = getattr(self._strategy, "prepare", None)
+        if callable(prepare):
+            prepare(self._data, **{k: _tuple(v) for k, v in kwargs.items()})
+
         class AttrDict(dict):
             def __getattr__(self, item):
                 return self[item]
@@ -1797,6 +1898,9 @@ class Backtest:
                 raise RuntimeError("First issue `backtest.run()` to obtain results.")
             results = self._results
 
+        # bokeh is only imported when plotting
+        from ._plotting import plot
+
         return plot(
             results=results,
             df=self._data,
@@ -19,9 +19,11 @@ from typing import Sequence, Optional, Union, Callable
 
 import numpy as np
 import pandas as pd
+from pandas.api.extensions import take
+
+from pystockfilter.cache.resample_cache import ResampleCache
 
 from .backtesting import Strategy
-from ._plotting import plot_heatmaps as _plot_heatmaps
 from ._stats import compute_stats as _compute_stats
 from ._util import _Array, _as_str
 
@@ -41,6 +43,11 @@ e.g.
     df.resample('4H', label='right').agg(OHLCV_AGG).dropna()
 """
 
+RESAMPLE_CACHE = ResampleCache()
+"""Resampled bars and their forward-fill mappings of `resample_apply`,
+shared by all strategies and runs of the process (e.g. every parameter
+combination of an optimization)."""
+
 TRADES_AGG = OrderedDict((
     ('Size', 'sum'),
     ('EntryBar', 'first'),
@@ -146,6 +153,8 @@ def plot_heatmaps(heatmap: pd.Series,
     [plot_objective]: \
         https://scikit-optimize.github.io/stable/modules/plots.html#plot-objective
     """
+    from ._plotting import plot_heatmaps as _plot_heatmaps
+
     return _plot_heatmaps(heatmap, agg, ncols, filename, plot_width, open_browser)
 
 
@@ -245,6 +254,10 @@ http://pandas.pydata.org/pandas-docs/stable/timeseries.html#offset-aliases
     implicit `backtesting.backtesting.Strategy.I` call
     are passed to `func`.
 
+    The resampled bars and the mapping back to the index of `series`
+    are cached in `RESAMPLE_CACHE` by the content of `series`, so
+    repeated calls on the same data only apply `func`.
+
     For example, if we have a typical moving average function
     `SMA(values, lookback_period)`, _hourly_ data source, and need to
     apply the moving average MA(10) on a _daily_ time frame,
@@ -299,7 +312,9 @@ http://pandas.pydata.org/pandas-docs/stable/timeseries.html#offset-aliases
             agg = {column: OHLCV_AGG.get(column, 'last')
                    for column in series.columns}
 
-    resampled = series.resample(rule, label='right').agg(agg).dropna()
+    resampled, positions = RESAMPLE_CACHE.get(series, rule, agg)
+    # the cached bars are shared, name a shallow copy
+    resampled = resampled.copy(deep=False)
     resampled.name = _as_str(series) + '[' + rule + ']'
 
     # Check first few stack frames if we are being called from
@@ -308,7 +323,7 @@ http://pandas.pydata.org/pandas-docs/stable/timeseries.html#offset-aliases
     while frame and level <= 3:
         frame = frame.f_back
         level += 1
-        if isinstance(frame.f_locals.get('self'), Strategy):  # type: ignore
+        if frame and isinstance(frame.f_locals.get('self'), Strategy):  # type: ignore
             strategy_I = frame.f_locals['self'].I             # type: ignore
             break
     else:
@@ -326,6 +341,8 @@ http://pandas.pydata.org/pandas-docs/stable/timeseries.html#offset-aliases
         # Resample back to data index
         if not isinstance(result.index, pd.DatetimeIndex):
             result.index = resampled.index
+        if positions is not None and result.index.equals(resampled.index):
+            return _ffill_take(result, positions, series.index)
         result = result.reindex(index=series.index.union(resampled.index),
                                 method='ffill').reindex(series.index)
         return result
@@ -336,6 +353,18 @@ http://pandas.pydata.org/pandas-docs/stable/timeseries.html#offset-aliases
     return array
 
 
+def _ffill_take(result, positions, index):
+    """`result` forward-filled onto `index` by the cached `positions`."""
+    if isinstance(result, pd.DataFrame):
+        columns = {i: take(result.iloc[:, i].to_numpy(), positions, allow_fill=True)
+                   for i in range(result.shape[1])}
+        taken = pd.DataFrame(columns, index=index)
+        taken.columns = result.columns
+        return taken
+    return pd.Series(take(result.to_numpy(), positions, allow_fill=True),
+                     index=index, name=result.name)
+
+
 def random_ohlc_data(example_data: pd.DataFrame, *,
                      frac=1., random_state: int = None) -> pd.DataFrame:
     """
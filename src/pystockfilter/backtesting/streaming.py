@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+
+  Out-of-core backtests. A `StreamingBacktest` reads the bars in blocks
+  (e.g. from `StockDataSource.iter_blocks`), carries the state of the
+  stateful indicators (`pystockfilter.indicators.Incremental`) from block
+  to block and appends the equity curve to a memory-mapped file, so the
+  memory of the simulation is bounded by the block size instead of the
+  length of the history.
+
+      blocks = lambda: source.iter_blocks("AAPL", start, end, 50_000)
+      stats = StreamingBacktest(blocks, RSIStrategy, cash=10_000).run()
+"""
+import os
+import shutil
+import tempfile
+import weakref
+from contextvars import ContextVar
+from numbers import Number
+from typing import Callable, Iterable, Optional, Type, Union
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.cache.indicator_cache import make_key
+
+from ._stats import compute_stats
+from ._util import _Data, _Indicator, try_
+from .backtesting import PreparedData, Strategy, _Broker, _OutOfMoneyError
+
+_active_stream: ContextVar[Optional["IndicatorStream"]] = ContextVar(
+    "indicator_stream", default=None
+)
+
+
+def active_stream() -> Optional["IndicatorStream"]:
+    """Returns the `IndicatorStream` of the running streaming backtest, if any."""
+    return _active_stream.get()
+
+
+class IndicatorStream:
+    """
+    Stateful indicators of a streaming backtest keyed by function and
+    parameters. The data of a block starts with the last `warmup` bars of
+    the previous blocks; `compute` only feeds the `new_bars` of the block
+    to the indicator and prepends the values kept from the previous block,
+    so the values equal those of a backtest over the whole history.
+    """
+
+    def __init__(self, warmup: int):
+        self.warmup = warmup
+        self.new_bars = 0
+        self._states = {}
+        self._block = {}
+
+    def begin(self, new_bars: int):
+        """Starts a block of data ending with `new_bars` unseen bars."""
+        self.new_bars = new_bars
+        self._block.clear()
+
+    def compute(self, namespace: str, func: Callable, indicator: Callable, args, kwargs):
+        """Returns `func(*args, **kwargs)` computed by the stateful `indicator`."""
+        data, params = args[0], args[1:]
+        key = (namespace, make_key(func, params, kwargs))
+        if key in self._block:
+            return self._block[key]
+        state, tail = self._states.get(key, (None, None))
+        columns = None
+        known = 0
+        if state is not None:
+            columns = state.inputs(data)
+            known = len(columns[0]) - self.new_bars
+            if known < 0 or len(tail) < known:
+                state = None  # not continuable, restart on this block
+        if state is None:
+            state = indicator(*params, **kwargs)
+            columns = state.inputs(data)
+            values = state.update(*columns)
+        else:
+            values = state.update(*(column[known:] for column in columns))
+            values = np.concatenate((tail[len(tail) - known :], values))
+        self._states[key] = (state, values[max(0, len(values) - self.warmup) :].copy())
+        result = self._block[key] = state.result(values, data)
+        return result
+
+
+class _BarFiles:
+    """
+    Append-only memory-mapped columns of a streaming backtest: the index
+    (int64), the close and the equity (float64) of every bar.
+    """
+
+    NAMES = ("Date", "Close", "Equity")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.paths = {
+            name: os.path.join(directory, f"{name}.bin") for name in self.NAMES
+        }
+        self._files = {name: open(path, "wb") for name, path in self.paths.items()}
+        self.tz = None
+        self.name = None
+        self.is_datetime = None
+        self.first_equity = None
+        self.index = None
+        self.bars = 0
+        self.equity_bars = 0
+
+    def append(self, index: pd.Index, close: np.ndarray):
+        if self.is_datetime is None:
+            self.is_datetime = isinstance(index, pd.DatetimeIndex)
+            self.tz = getattr(index, "tz", None)
+            self.name = index.name
+        if self.is_datetime:
+            values = pd.DatetimeIndex(index).asi8
+        else:
+            values = np.asarray(index, dtype=np.int64)
+        self._files["Date"].write(np.ascontiguousarray(values, dtype=np.int64).data)
+        self._files["Close"].write(np.ascontiguousarray(close, dtype=np.float64).data)
+        self.bars += len(values)
+
+    def append_equity(self, equity: np.ndarray):
+        equity = np.ascontiguousarray(equity, dtype=np.float64)
+        if self.first_equity is None:
+            valid = np.flatnonzero(~np.isnan(equity))
+            if len(valid):
+                self.first_equity = (self.equity_bars + valid[0], equity[valid[0]])
+        self._files["Equity"].write(equity.data)
+        self.equity_bars += len(equity)
+
+    def _to_index(self, values: np.ndarray):
+        if not self.is_datetime:
+            return pd.Index(values, name=self.name)
+        index = pd.DatetimeIndex(values.view("datetime64[ns]"), name=self.name)
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz else index
+
+    def time(self, bar: int):
+        """Index value of the bar number `bar`."""
+        if self.index is not None:
+            return self.index[bar]
+        self._files["Date"].flush()
+        value = np.fromfile(self.paths["Date"], np.int64, count=1, offset=bar * 8)
+        return self._to_index(value)[0]
+
+    def close(self, cash: float):
+        """
+        Closes the files and returns the index, close and equity columns
+        mapped from disk. Equity before the first simulated bar is
+        back-filled like `Backtest.run` does.
+        """
+        self.close_files()
+        columns = {
+            name: np.memmap(
+                path, np.int64 if name == "Date" else np.float64, "r+", shape=(self.bars,)
+            )
+            for name, path in self.paths.items()
+        }
+        first, value = self.first_equity or (self.bars, cash)
+        columns["Equity"][:first] = value
+        columns["Equity"].flush()
+        # plain ndarray views, pandas keeps np.memmap subclasses
+        index, close, equity = (np.asarray(columns[name]) for name in self.NAMES)
+        self.index = self._to_index(index)
+        return self.index, close, equity
+
+    def close_files(self):
+        for file in self._files.values():
+            file.close()
+
+
+class _StreamingBroker(_Broker):
+    """`_Broker` over the current block; bar numbers count from the first block."""
+
+    def __init__(self, *, files: _BarFiles, **kwargs):
+        super().__init__(data=None, index=(), **kwargs)
+        self._files = files
+
+    def _bind(self, data: _Data, offset: int):
+        self._data = data
+        self._offset = offset
+        self._equity = np.full(len(data), np.nan)
+
+    def _time(self, bar: int):
+        if bar >= self._offset:
+            return super()._time(bar)
+        return self._files.time(bar)
+
+
+class StreamingBacktest:
+    """
+    Backtest over data read in blocks, for histories (e.g. years of minute
+    bars) that do not fit in memory.
+
+    `blocks` is an iterable of consecutive OHLCV frames, e.g.
+    `StockDataSource.iter_blocks`, or a callable returning one so that
+    `run` can be called more than once. Every block is run with the last
+    `warmup` bars of the previous blocks in front of it: `Strategy.init` is
+    called per block, so signals and indicators see the bars before the
+    block. Indicators of `BaseStrategy.algo` with a stateful `_indicator`
+    continue their state and match a `Backtest` over the whole history;
+    other indicators match it as long as their window is at most `warmup`
+    bars. Attributes set on the strategy outside of `init` are kept from
+    block to block.
+
+    The index, close and equity of every bar are appended to files in
+    `directory` and the statistics are computed from their memory maps,
+    which stay referenced by the results. If `directory` is None, a
+    temporary directory is used and removed with the results of `run`.
+    The other arguments are those of `Backtest`.
+    """
+
+    def __init__(
+        self,
+        blocks: Union[Iterable[pd.DataFrame], Callable[[], Iterable[pd.DataFrame]]],
+        strategy: Type[Strategy],
+        *,
+        cash: float = 10_000,
+        commission: float = 0.0,
+        margin: float = 1.0,
+        trade_on_close=False,
+        hedging=False,
+        exclusive_orders=False,
+        warmup: int = 500,
+        directory: str = None,
+        precision: str = "float64",
+    ):
+        if not (isinstance(strategy, type) and issubclass(strategy, Strategy)):
+            raise TypeError("`strategy` must be a Strategy sub-type")
+        if not isinstance(commission, Number):
+            raise TypeError(
+                "`commission` must be a float value, percent of " "entry order price"
+            )
+        if warmup < 2:
+            raise ValueError("`warmup` must be at least 2 bars")
+        self._blocks = blocks
+        self._strategy = strategy
+        self._warmup = int(warmup)
+        self._directory = directory
+        self._precision = precision
+        self._broker_args = dict(
+            cash=cash,
+            commission=commission,
+            margin=margin,
+            trade_on_close=trade_on_close,
+            hedging=hedging,
+            exclusive_orders=exclusive_orders,
+        )
+        self._results: Optional[pd.Series] = None
+
+    def run(self, **kwargs) -> pd.Series:
+        """
+        Run the backtest. Returns `pd.Series` with results and statistics
+        like `Backtest.run`. Keyword arguments are strategy parameters.
+        """
+        blocks = self._blocks() if callable(self._blocks) else self._blocks
+        temporary = self._directory is None
+        if temporary:
+            directory = tempfile.mkdtemp(prefix="pystockfilter-stream-")
+        else:
+            directory = self._directory
+        files = _BarFiles(directory)
+        broker = _StreamingBroker(files=files, **self._broker_args)
+        stream = IndicatorStream(self._warmup)
+        strategy: Optional[Strategy] = None
+        tail: Optional[pd.DataFrame] = None
+        # equity of the new bars of the current block, written with the next block
+        pending = None
+        started = processed = out_of_money = False
+        token = _active_stream.set(stream)
+        try:
+            # Comparison np.nan >= 3 is not invalid; it's False.
+            with np.errstate(invalid="ignore"):
+                for block in blocks:
+                    if not len(block):
+                        continue
+                    block = PreparedData(block, self._precision).df
+                    window = block if tail is None else pd.concat([tail, block])
+                    first = len(window) - len(block)
+                    if pending is not None:
+                        files.append_equity(pending)
+                    files.append(block.index, block["Close"].to_numpy())
+                    tail = window.iloc[max(0, len(window) - self._warmup) :]
+                    if out_of_money:
+                        pending = np.zeros(len(block))
+                        continue
+
+                    data = _Data(window)
+                    broker._bind(data, files.bars - len(window))
+                    pending = broker._equity[first:]
+                    stream.begin(len(block))
+                    if strategy is None:
+                        strategy = self._strategy(broker, data, kwargs)
+                    else:
+                        strategy._data = data
+                        strategy._indicators = []
+                    strategy.init()
+                    data._update()  # Strategy.init might have changed/added to data.df
+
+                    indicator_attrs = {
+                        attr: indicator
+                        for attr, indicator in strategy.__dict__.items()
+                        if isinstance(indicator, _Indicator)
+                    }.items()
+                    start = first
+                    if not started:
+                        warming = [
+                            np.isnan(indicator.astype(float)).all(axis=-1).any()
+                            for _, indicator in indicator_attrs
+                        ]
+                        if any(warming):
+                            continue  # an indicator has no value yet
+                        started = True
+                        # +1 to have at least two entries available
+                        start = max(
+                            first,
+                            1
+                            + max(
+                                (
+                                    np.isnan(indicator.astype(float))
+                                    .argmin(axis=-1)
+                                    .max()
+                                    for _, indicator in indicator_attrs
+                                ),
+                                default=0,
+                            ),
+                        )
+
+                    for i in range(start, len(window)):
+                        data._set_length(i + 1)
+                        for attr, indicator in indicator_attrs:
+                            setattr(strategy, attr, indicator[..., : i + 1])
+                        try:
+                            broker.next()
+                        except _OutOfMoneyError:
+                            out_of_money = True
+                            break
+                        processed = True
+                        strategy.next()
+                    data._set_length(len(window))
+
+                if strategy is None:
+                    raise ValueError("OHLC `data` is empty")
+                if not out_of_money:
+                    # Close any remaining open trades so they produce some stats
+                    for trade in broker.trades:
+                        trade.close()
+                    # Re-run broker one last time to handle orders placed in
+                    # the last strategy iteration.
+                    if processed:
+                        try_(broker.next, exception=_OutOfMoneyError)
+                files.append_equity(pending)
+        except BaseException:
+            files.close_files()
+            if temporary:
+                shutil.rmtree(directory, ignore_errors=True)
+            raise
+        finally:
+            _active_stream.reset(token)
+
+        index, close, equity = files.close(broker._cash)
+        self._results = compute_stats(
+            trades=broker.closed_trades,
+            equity=equity,
+            ohlc_data=pd.DataFrame({"Close": close}, index=index, copy=False),
+            risk_free_rate=0.0,
+            strategy_instance=strategy,
+        )
+        if temporary:
+            weakref.finalize(self._results, shutil.rmtree, directory, True)
+        return self._results
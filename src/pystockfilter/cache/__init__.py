@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+from pystockfilter.cache.fingerprint import array_fingerprint, fingerprint
+from pystockfilter.cache.indicator_cache import (
+    MISSING,
+    CacheStats,
+    IndicatorCache,
+    UncacheableArgument,
+    make_key,
+    nbytes,
+)
+from pystockfilter.cache.disk_store import (
+    DiskArrayStore,
+    TieredStore,
+    default_cache_directory,
+)
+from pystockfilter.cache.policy import EvictionPolicy, LFUPolicy, LRUPolicy
+from pystockfilter.cache.resample_cache import ResampleCache
+from pystockfilter.cache.shared_store import SharedArrayStore, UnsupportedValue
+
+__all__ = [
+    "MISSING",
+    "CacheStats",
+    "DiskArrayStore",
+    "EvictionPolicy",
+    "IndicatorCache",
+    "LFUPolicy",
+    "LRUPolicy",
+    "ResampleCache",
+    "SharedArrayStore",
+    "TieredStore",
+    "UncacheableArgument",
+    "UnsupportedValue",
+    "array_fingerprint",
+    "default_cache_directory",
+    "fingerprint",
+    "make_key",
+    "nbytes",
+]
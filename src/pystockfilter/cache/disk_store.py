@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import hashlib
+import os
+import shutil
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+from pystockfilter.cache.indicator_cache import MISSING
+from pystockfilter.cache.shared_store import SharedArrayStore
+from pystockfilter import __version__, logger
+
+
+# modules of `pystockfilter.indicators` computing cached values
+KERNEL_MODULES = ("kernels.py", "incremental.py", "banks.py")
+
+
+@lru_cache(maxsize=None)
+def kernels_digest() -> str:
+    """Returns a digest of the source of the indicator kernel modules."""
+    directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), "indicators")
+    digest = hashlib.blake2b(digest_size=8)
+    for name in KERNEL_MODULES:
+        with open(os.path.join(directory, name), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def default_cache_directory() -> str:
+    """Returns $PYSTOCKFILTER_CACHE_DIR or ~/.cache/pystockfilter/indicators."""
+    directory = os.environ.get("PYSTOCKFILTER_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache"))
+    return os.path.join(os.path.expanduser(base), "pystockfilter", "indicators")
+
+
+class DiskArrayStore(SharedArrayStore):
+    """
+    Persistent indicator store of memory-mapped `.npy` files.
+
+    Entries are keyed by dataset fingerprint, indicator function (with a
+    digest of its code, see `code_fingerprint`) and parameters, salted
+    with the pystockfilter version and a digest of the indicator kernels
+    (see `kernels_digest`) so results of an older implementation are never
+    served. The store survives the process:
+    nightly optimizations and newly started workers map the indicators of
+    earlier runs instead of recomputing them. Unused entries are removed by
+    `cleanup`, which also runs when the store is opened.
+
+    Args:
+        directory (str): Directory of the store, `default_cache_directory()`
+            if None.
+        max_bytes (int): Capacity of the store in bytes.
+        max_age (timedelta): Entries not used for this long are removed.
+    """
+
+    def __init__(
+        self,
+        directory: str = None,
+        max_bytes: int = 2 * 1024**3,
+        max_age: Optional[timedelta] = timedelta(days=30),
+    ):
+        super().__init__(directory or default_cache_directory(), max_bytes)
+        self.salt = f"pystockfilter-{__version__}-{kernels_digest()}:"
+        self.owned = False
+        self.max_age = max_age
+        self.cleanup()
+
+    def cleanup(self, max_age: Optional[timedelta] = None):
+        """
+        Removes abandoned partial writes, entries older than `max_age` and
+        the least recently used entries beyond `max_bytes`.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        now = time.time()
+        removed = 0
+        for entry in os.scandir(self.directory):
+            try:
+                age = now - entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            stale_tmp = entry.name.startswith(".tmp-") and age > 3600
+            expired = (
+                max_age is not None
+                and not entry.name.startswith(".")
+                and age > max_age.total_seconds()
+            )
+            if stale_tmp or expired:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        self.evict(self.max_bytes)
+        if removed:
+            logger.debug(f"Removed {removed} entries from {self.directory}")
+
+
+class TieredStore:
+    """
+    Chains stores from fastest to slowest. Hits in a slower store are
+    promoted into the faster ones, results are published to all of them.
+    """
+
+    def __init__(self, *stores):
+        self.stores = [store for store in stores if store is not None]
+
+    def get(self, key, default=MISSING):
+        for i, store in enumerate(self.stores):
+            value = store.get(key)
+            if value is not MISSING:
+                for faster in self.stores[:i]:
+                    faster.put(key, value)
+                return value
+        return default
+
+    def put(self, key, value, replace: bool = False) -> bool:
+        stored = [store.put(key, value, replace) for store in self.stores]
+        return any(stored)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import hashlib
+import threading
+import types
+import weakref
+from functools import lru_cache
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+# Digests of read-only array buffers, keyed by the buffer owner and the
+# view geometry. Writeable buffers can change in place and are hashed on
+# every call.
+_memo: dict = {}
+_memo_owners: set = set()
+_memo_lock = threading.Lock()
+
+
+def _owner(array: np.ndarray) -> np.ndarray:
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def is_frozen(array: np.ndarray) -> bool:
+    """Returns True if the buffer of `array` cannot be changed in place."""
+    return not _owner(array).flags.writeable
+
+
+def _forget(owner_id: int):
+    with _memo_lock:
+        _memo_owners.discard(owner_id)
+        for key in [key for key in _memo if key[0] == owner_id]:
+            del _memo[key]
+
+
+def _hash_array(array: np.ndarray) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    if array.dtype.kind == "O":
+        flat = pd.Series(array.ravel())
+        digest.update(hash_pandas_object(flat, index=False).values.tobytes())
+    else:
+        digest.update(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+
+def array_fingerprint(array: np.ndarray) -> str:
+    """
+    Returns a digest of the full content of `array`. The digest of a
+    read-only buffer is memoized on the buffer owner, so views of the same
+    data (e.g. the `Close` column of `Strategy.data` in every run of an
+    optimization) are hashed only once.
+    """
+    owner = _owner(array)
+    if owner.flags.writeable:  # see `is_frozen`
+        return _hash_array(array)
+    key = (
+        id(owner),
+        array.__array_interface__["data"][0],
+        array.shape,
+        array.strides,
+        array.dtype.str,
+    )
+    with _memo_lock:
+        digest = _memo.get(key)
+    if digest is not None:
+        return digest
+    digest = _hash_array(array)
+    try:
+        with _memo_lock:
+            if key[0] not in _memo_owners:
+                weakref.finalize(owner, _forget, key[0])
+                _memo_owners.add(key[0])
+            _memo[key] = digest
+    except TypeError:
+        pass  # owner does not support weak references, skip memoization
+    return digest
+
+
+def _index_fingerprint(index: pd.Index) -> str:
+    if isinstance(index, pd.RangeIndex):
+        return f"range({index.start},{index.stop},{index.step})"
+    return f"{index.dtype}:{array_fingerprint(np.asarray(index.values))}"
+
+
+def _combine(*parts: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def columns_fingerprint(columns: list[np.ndarray], length: int) -> str:
+    """Returns a fingerprint of the first `length` rows of `columns`."""
+    return _combine(
+        "columns", *(array_fingerprint(column[:length]) for column in columns)
+    )
+
+
+@lru_cache(maxsize=None)
+def _code_digest(code: types.CodeType) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        # nested functions: their repr holds a memory address
+        if isinstance(const, types.CodeType):
+            const = _code_digest(const)
+        # the repr of a set depends on PYTHONHASHSEED
+        elif isinstance(const, frozenset):
+            const = sorted(map(repr, const))
+        digest.update(repr(const).encode())
+    return digest.hexdigest()
+
+
+def code_fingerprint(func: Callable) -> Optional[str]:
+    """
+    Returns a digest of the byte code and constants of `func`, or None if
+    it has no Python code. Edited functions get new cache keys without a
+    version bump.
+    """
+    code = getattr(getattr(func, "__func__", func), "__code__", None)
+    return _code_digest(code) if code is not None else None
+
+
+def fingerprint(data) -> Optional[str]:
+    """
+    Returns a content fingerprint of a dataset, or None if `data` is not a
+    dataset (pandas object, numpy array or `Strategy.data`).
+    """
+    if isinstance(data, np.ndarray):
+        return array_fingerprint(data)
+    if isinstance(data, pd.Series):
+        return _combine(
+            "series",
+            array_fingerprint(np.asarray(data.values)),
+            _index_fingerprint(data.index),
+        )
+    if isinstance(data, pd.DataFrame):
+        return _combine(
+            "frame",
+            _index_fingerprint(data.index),
+            *(
+                f"{column}={array_fingerprint(np.asarray(values))}"
+                for column, values in data.items()
+            ),
+        )
+    df = getattr(data, "df", None)
+    if isinstance(df, pd.DataFrame):  # backtesting `_Data`
+        prepared = getattr(data, "_prepared", None)
+        digest = prepared.fingerprint_of(df) if prepared is not None else None
+        return digest or fingerprint(df)
+    return None
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from functools import wraps
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.cache.fingerprint import (
+    code_fingerprint,
+    columns_fingerprint,
+    fingerprint,
+)
+from pystockfilter.cache.policy import EvictionPolicy, policy_from_name
+
+MISSING = object()
+
+# rows identifying the dataset of an incremental state, see `_compute_incremental`
+STATE_HEAD = 64
+
+
+class UncacheableArgument(TypeError):
+    """Raised when an argument can neither be fingerprinted nor hashed."""
+
+
+def make_token(value):
+    """Returns a hashable cache token of a function argument."""
+    digest = fingerprint(value)
+    if digest is not None:
+        return ("data", digest)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, *(make_token(item) for item in value))
+    try:
+        hash(value)
+    except TypeError as error:
+        raise UncacheableArgument(f"Cannot cache argument {value!r}") from error
+    return value
+
+
+def make_key(func: Callable, args: tuple, kwargs: dict) -> tuple:
+    """Returns the cache key of a call of `func`."""
+    return (
+        getattr(func, "__qualname__", repr(func)),
+        code_fingerprint(func),
+        tuple(make_token(arg) for arg in args),
+        tuple(sorted((key, make_token(val)) for key, val in kwargs.items())),
+    )
+
+
+def nbytes(value) -> int:
+    """Returns the memory held by an indicator result."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    extensions: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.store_hits + self.misses
+        return (self.hits + self.store_hits) / lookups if lookups else 0.0
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            *(getattr(self, f.name) + getattr(other, f.name) for f in fields(self))
+        )
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "hits", "used")
+
+    def __init__(self, value, size: int, used: int):
+        self.value = value
+        self.nbytes = size
+        self.hits = 0
+        self.used = used
+
+
+class IndicatorCache:
+    """
+    Thread-safe indicator result cache, bounded by bytes.
+
+    Datasets are keyed by a fingerprint of their full content (see
+    `fingerprint`), every other argument by its value. Entries are stored
+    in namespaces, usually one per strategy. When the cache exceeds
+    `max_bytes`, the entries ranked lowest by the eviction policy are
+    evicted across all namespaces, e.g. the least recently used ones of
+    the whole cache. Hits, misses, evictions and held bytes are counted per
+    namespace, see `stats`.
+
+    An optional second tier `store` (e.g. a `SharedArrayStore`) is consulted
+    on misses and receives every computed result.
+
+    Functions with a stateful `indicator` (see `pystockfilter.indicators`)
+    also keep the indicator state of their last result. When a call misses
+    because its data only grew at the tail, the cached values are extended
+    by the new bars instead of being recomputed.
+
+    Args:
+        max_bytes (int): Memory budget of all namespaces, None for no limit.
+        max_size (int): Maximum number of entries per namespace, or None.
+        policy: Eviction policy, "lru", "lfu" or an `EvictionPolicy`.
+        store: Second tier with `get(key, default)` and `put(key, value)`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = 256 * 1024**2,
+        max_size: Optional[int] = None,
+        policy: Union[str, EvictionPolicy] = "lru",
+        store=None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_size = max_size
+        self.policy = policy_from_name(policy)
+        self.store = store
+        self._namespaces: dict[str, OrderedDict] = {}
+        self._stats: dict[str, CacheStats] = {}
+        self._bytes = 0
+        self._tick = 0
+        self._lock = threading.RLock()
+
+    def _stats_of(self, namespace: str) -> CacheStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = CacheStats()
+        return stats
+
+    def _lookup(self, namespace: str, key) -> Optional[_Entry]:
+        entries = self._namespaces.get(namespace)
+        entry = None if entries is None else entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            entry.hits += 1
+            self._tick += 1
+            entry.used = self._tick
+        return entry
+
+    def get(self, namespace: str, key, default=MISSING):
+        with self._lock:
+            entry = self._lookup(namespace, key)
+            if entry is None:
+                self._stats_of(namespace).misses += 1
+                return default
+            self._stats_of(namespace).hits += 1
+            return entry.value
+
+    def put(self, namespace: str, key, value, max_size: Optional[int] = None):
+        max_size = self.max_size if max_size is None else max_size
+        size = nbytes(value)
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            stats = self._stats_of(namespace)
+            if key in entries:
+                self._remove(namespace, key)
+            self._tick += 1
+            entries[key] = _Entry(value, size, self._tick)
+            stats.entries += 1
+            stats.bytes += size
+            self._bytes += size
+            while max_size is not None and len(entries) > max_size:
+                self._evict(namespace, self.policy.victim(entries, key))
+            while self.max_bytes is not None and self._bytes > self.max_bytes:
+                self._evict(*self._victim(namespace, key))
+
+    def _victim(self, namespace: str, key) -> tuple:
+        # the lowest ranked entry of all namespaces, except the inserted one
+        candidates = []
+        for name, entries in self._namespaces.items():
+            victim = self.policy.victim(entries, key if name == namespace else None)
+            if victim is not None:
+                candidates.append((name, victim))
+        return min(
+            candidates,
+            key=lambda candidate: self.policy.rank(
+                self._namespaces[candidate[0]][candidate[1]]
+            ),
+        )
+
+    def _remove(self, namespace: str, key) -> _Entry:
+        entry = self._namespaces[namespace].pop(key)
+        stats = self._stats_of(namespace)
+        stats.entries -= 1
+        stats.bytes -= entry.nbytes
+        self._bytes -= entry.nbytes
+        return entry
+
+    def _evict(self, namespace: str, key):
+        entries = self._namespaces[namespace]
+        self._remove(namespace, key)
+        self._stats_of(namespace).evictions += 1
+        if not entries:
+            del self._namespaces[namespace]
+
+    def cached(
+        self,
+        namespace: str,
+        func: Callable,
+        max_size: Optional[int] = None,
+        indicator: Optional[Callable] = None,
+    ):
+        """
+        Returns `func` wrapped with a lookup in `namespace`. Calls with
+        arguments that cannot be keyed are passed through uncached.
+
+        `indicator` creates the stateful indicator computing
+        `func(data, *args, **kwargs)` from `args` and `kwargs`; it enables
+        incremental extension.
+        """
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = make_key(func, args, kwargs)
+            except UncacheableArgument:
+                return func(*args, **kwargs)
+            result = self.get(namespace, key)
+            if result is not MISSING:
+                return result
+            store = self.store
+            if store is not None:
+                result = store.get((namespace, key))
+                if result is not MISSING:
+                    with self._lock:
+                        self._stats_of(namespace).store_hits += 1
+                        self._stats_of(namespace).misses -= 1
+            if result is MISSING:
+                if indicator is not None and args:
+                    result = self._compute_incremental(
+                        namespace, func, indicator, args, kwargs, max_size
+                    )
+                else:
+                    result = func(*args, **kwargs)
+                if store is not None:
+                    store.put((namespace, key), result)
+            self.put(namespace, key, result, max_size)
+            return result
+
+        return wrapper
+
+    def seed(
+        self,
+        namespace: str,
+        func: Callable,
+        args: tuple,
+        value,
+        max_size: Optional[int] = None,
+    ):
+        """
+        Caches `value` as the result of `func(*args)` wrapped by `cached`,
+        e.g. a row of a precomputed indicator bank.
+        """
+        key = make_key(func, args, {})
+        if self.store is not None:
+            self.store.put((namespace, key), value)
+        self.put(namespace, key, value, max_size)
+
+    def _load_state(self, namespace: str, key):
+        with self._lock:
+            entry = self._lookup(namespace, key)
+        if entry is not None:
+            return entry.value
+        if self.store is not None:
+            record = self.store.get((namespace, key))
+            if record is not MISSING:
+                return record
+        return None
+
+    def _compute_incremental(
+        self, namespace, func, indicator, args, kwargs, max_size
+    ):
+        data, params = args[0], args[1:]
+        state = indicator(*params, **kwargs)
+        columns = state.inputs(data)
+        length = len(columns[0])
+        # one state per dataset: a grown dataset keeps the rows of its head
+        head = columns_fingerprint(columns, min(length, STATE_HEAD))
+        key = ("state", make_key(func, params, kwargs), head)
+        values = None
+        record = self._load_state(namespace, key)
+        if record is not None:
+            cached_length, digest, cached_values, cached_state = record
+            cached_length = int(cached_length[0])
+            if cached_length <= length and bytes(
+                np.asarray(digest)
+            ).hex() == columns_fingerprint(columns, cached_length):
+                state.load_state(cached_state)
+                new_values = state.update(*(column[cached_length:] for column in columns))
+                values = np.concatenate((cached_values, new_values))
+                with self._lock:
+                    self._stats_of(namespace).extensions += 1
+        if values is None:
+            values = state.update(*columns)
+        record = (
+            np.array([length]),
+            np.frombuffer(
+                bytes.fromhex(columns_fingerprint(columns, length)), dtype=np.uint8
+            ),
+            values,
+            state.state(),
+        )
+        self.put(namespace, key, record, max_size)
+        if self.store is not None:
+            self.store.put((namespace, key), record, replace=True)
+        return state.result(values, data)
+
+    def stats(self, namespace: Optional[str] = None) -> CacheStats:
+        """Returns the counters of `namespace`, or the totals of all namespaces."""
+        with self._lock:
+            if namespace is not None:
+                return CacheStats(**vars(self._stats_of(namespace)))
+            return sum(self._stats.values(), CacheStats())
+
+    def reset_stats(self):
+        """Resets the hit, miss and eviction counters."""
+        with self._lock:
+            for stats in self._stats.values():
+                stats.hits = stats.store_hits = stats.misses = 0
+                stats.extensions = stats.evictions = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            for name in [namespace] if namespace is not None else list(self._namespaces):
+                for key in list(self._namespaces.get(name, ())):
+                    self._remove(name, key)
+                self._namespaces.pop(name, None)
+
+    def namespaces(self) -> list[str]:
+        with self._lock:
+            return list(self._namespaces)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._namespaces.values())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+from collections import OrderedDict
+from typing import Union
+
+
+class EvictionPolicy:
+    """
+    Chooses the entry to evict from an `IndicatorCache`. Entries are
+    ordered from least to most recently used within a namespace, count
+    their hits in `entry.hits` and hold the tick of their last use in
+    `entry.used`. `rank` orders the entries of all namespaces, the entry
+    of the lowest rank is evicted first.
+    """
+
+    name = "base"
+
+    def rank(self, entry):
+        raise NotImplementedError("This method must be implemented by the subclass. ")
+
+    def victim(self, entries: OrderedDict, exclude=None):
+        """Returns the key of `entries` to evict, never `exclude`, or None."""
+        return min(
+            (key for key in entries if key != exclude),
+            key=lambda key: self.rank(entries[key]),
+            default=None,
+        )
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evicts the least recently used entry."""
+
+    name = "lru"
+
+    def rank(self, entry):
+        return entry.used
+
+    def victim(self, entries: OrderedDict, exclude=None):
+        for key in entries:
+            if key != exclude:
+                return key
+        return None
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evicts the least frequently used entry, the least recently used one on
+    ties. Suited for grids, where the indicators of a few window values are
+    requested over and over while threshold parameters vary. The entry
+    being inserted is never evicted, so new entries get the chance to
+    collect hits.
+    """
+
+    name = "lfu"
+
+    def rank(self, entry):
+        return entry.hits, entry.used
+
+
+POLICIES = {policy.name: policy for policy in (LRUPolicy, LFUPolicy)}
+
+
+def policy_from_name(policy: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    try:
+        return POLICIES[policy.lower()]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown eviction policy {policy!r}, use one of {list(POLICIES)}"
+        ) from None
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.cache.fingerprint import fingerprint
+from pystockfilter.cache.indicator_cache import nbytes
+
+Data = Union[pd.Series, pd.DataFrame]
+
+
+def _agg_key(agg) -> Optional[tuple]:
+    """Hashable key of an aggregation, None unless it only names functions."""
+    items = agg.items() if isinstance(agg, dict) else [(None, agg)]
+    items = tuple(items)
+    if not all(isinstance(value, str) for _, value in items):
+        return None
+    return items
+
+
+def resample(data: Data, rule: str, agg) -> Data:
+    """Bars of `data` resampled to `rule`, labeled by the end of their period."""
+    return data.resample(rule, label="right").agg(agg).dropna()
+
+
+def ffill_positions(index: pd.Index, resampled: pd.Index) -> Optional[np.ndarray]:
+    """
+    Returns for every row of `index` the position of the last `resampled`
+    label at or before it (-1 if none), i.e. the forward-fill mapping of
+    the resampled bars back to `index`, or None if `index` is not sorted.
+    """
+    if not index.is_monotonic_increasing:
+        return None
+    return resampled.searchsorted(index, side="right") - 1
+
+
+class ResampleCache:
+    """
+    Thread-safe LRU of resampled datasets. An entry holds the bars of a
+    series or frame resampled to a rule and their forward-fill mapping
+    back to the base index (see `ffill_positions`), keyed by the content
+    fingerprint of the data, the rule and the aggregation. Aggregations
+    given as functions instead of names are not cached.
+
+    Args:
+        max_bytes (int): Capacity in bytes of the cached bars and mappings.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024**2):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data: Data, rule: str, agg) -> tuple[Data, Optional[np.ndarray]]:
+        """
+        Returns the bars of `data` resampled to `rule` with `agg` and their
+        forward-fill positions in the index of `data`. Treat both as
+        read-only, they are shared by all callers.
+        """
+        agg_key = _agg_key(agg)
+        digest = fingerprint(data) if agg_key is not None else None
+        key = (digest, rule, agg_key)
+        if digest is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0], entry[1]
+        resampled = resample(data, rule, agg)
+        positions = ffill_positions(data.index, resampled.index)
+        if digest is not None:
+            size = nbytes(resampled) + (0 if positions is None else positions.nbytes)
+            with self._lock:
+                self.misses += 1
+                self._remove(key)
+                if size <= self.max_bytes:
+                    self._entries[key] = (resampled, positions, size)
+                    self.nbytes += size
+                    while self.nbytes > self.max_bytes:
+                        self._remove(next(iter(self._entries)))
+        return resampled, positions
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.cache.indicator_cache import MISSING
+from pystockfilter import logger
+
+_META = "meta.json"
+
+
+class UnsupportedValue(TypeError):
+    """Raised when a value cannot be stored as plain numpy arrays."""
+
+
+def _encode_index(index: pd.Index, arrays: list) -> dict:
+    if isinstance(index, pd.RangeIndex):
+        return {"range": [index.start, index.stop, index.step]}
+    arrays.append(_plain(np.asarray(index.values)))
+    return {"array": len(arrays) - 1, "name": _name(index.name), "tz": _tz(index)}
+
+
+def _decode_index(meta: dict, arrays: list) -> pd.Index:
+    if "range" in meta:
+        return pd.RangeIndex(*meta["range"])
+    index = pd.Index(arrays[meta["array"]], name=meta["name"])
+    if meta["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    return index
+
+
+def _tz(index: pd.Index) -> Optional[str]:
+    tz = getattr(index, "tz", None)
+    return None if tz is None else str(tz)
+
+
+def _name(name):
+    if name is None or isinstance(name, (str, int, float, bool)):
+        return name
+    raise UnsupportedValue(f"Unsupported name {name!r}")
+
+
+def _plain(array: np.ndarray) -> np.ndarray:
+    if array.dtype.hasobject:
+        raise UnsupportedValue("Object arrays cannot be memory-mapped")
+    return array
+
+
+def encode(value, arrays: list) -> dict:
+    """
+    Splits an indicator result (ndarray, Series, DataFrame or tuple/list of
+    those) into numpy arrays, appended to `arrays`, and a JSON description.
+    """
+    if isinstance(value, pd.Series):
+        arrays.append(_plain(value.to_numpy()))
+        return {
+            "kind": "series",
+            "array": len(arrays) - 1,
+            "name": _name(value.name),
+            "index": _encode_index(value.index, arrays),
+        }
+    if isinstance(value, pd.DataFrame):
+        columns = []
+        for column, values in value.items():
+            arrays.append(_plain(values.to_numpy()))
+            columns.append([_name(column), len(arrays) - 1])
+        return {
+            "kind": "frame",
+            "columns": columns,
+            "index": _encode_index(value.index, arrays),
+        }
+    if isinstance(value, (tuple, list)):
+        return {
+            "kind": type(value).__name__,
+            "items": [encode(item, arrays) for item in value],
+        }
+    if isinstance(value, np.ndarray):
+        arrays.append(_plain(np.asarray(value)))
+        return {"kind": "array", "array": len(arrays) - 1}
+    raise UnsupportedValue(f"Unsupported value of type {type(value).__name__}")
+
+
+def decode(meta: dict, arrays: list):
+    """Inverse of `encode`. Arrays are used without copying."""
+    kind = meta["kind"]
+    if kind == "series":
+        return pd.Series(
+            arrays[meta["array"]],
+            index=_decode_index(meta["index"], arrays),
+            name=meta["name"],
+            copy=False,
+        )
+    if kind == "frame":
+        return pd.DataFrame(
+            {column: arrays[array] for column, array in meta["columns"]},
+            index=_decode_index(meta["index"], arrays),
+            copy=False,
+        )
+    if kind in ("tuple", "list"):
+        items = [decode(item, arrays) for item in meta["items"]]
+        return tuple(items) if kind == "tuple" else items
+    return arrays[meta["array"]]
+
+
+def default_directory() -> str:
+    """Returns /dev/shm if available, the temp directory otherwise."""
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return tempfile.gettempdir()
+
+
+class SharedArrayStore:
+    """
+    Indicator store shared by processes through memory-mapped `.npy` files.
+
+    Every entry is a directory with one `.npy` file per array and a JSON
+    description. Entries are written to a private directory and published
+    with an atomic rename, so readers never see partial entries. Readers map
+    the arrays read-only, without copying. When the store exceeds
+    `max_bytes`, the least recently used entries are removed; processes
+    that still map a removed entry keep a valid view of it.
+
+    Forked workers of `Backtest.optimize` inherit the store, so indicators
+    computed by one worker are reused by its siblings.
+
+    Args:
+        directory (str): Directory of the store. A new directory below
+            `default_directory()` is created if None.
+        max_bytes (int): Capacity of the store in bytes.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = 512 * 1024**2):
+        self.owned = directory is None
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="pystockfilter-", dir=default_directory())
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    salt = ""
+
+    def digest(self, key) -> str:
+        return hashlib.blake2b(
+            f"{self.salt}{key!r}".encode(), digest_size=20
+        ).hexdigest()
+
+    def _path(self, key) -> str:
+        return os.path.join(self.directory, self.digest(key))
+
+    def get(self, key, default=MISSING):
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, _META)) as file:
+                meta = json.load(file)
+            arrays = [
+                np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")
+                for i in range(meta["arrays"])
+            ]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return default
+        return decode(meta["value"], arrays)
+
+    def put(self, key, value, replace: bool = False) -> bool:
+        """
+        Publishes `value`. Existing entries are kept unless `replace` is set.
+        Returns False if the value cannot be stored.
+        """
+        path = self._path(key)
+        if os.path.exists(path) and not replace:
+            return True
+        arrays = []
+        try:
+            meta = encode(value, arrays)
+        except UnsupportedValue as error:
+            logger.debug(f"Not sharing indicator: {error}")
+            return False
+        size = sum(array.nbytes for array in arrays)
+        if size > self.max_bytes:
+            return False
+        self.evict(self.max_bytes - size)
+        tmp = os.path.join(self.directory, f".tmp-{os.getpid()}-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            for i, array in enumerate(arrays):
+                np.save(os.path.join(tmp, f"{i}.npy"), array, allow_pickle=False)
+            with open(os.path.join(tmp, _META), "w") as file:
+                json.dump({"arrays": len(arrays), "value": meta}, file)
+            if replace and os.path.exists(path):
+                old = f"{tmp}.old"
+                os.rename(path, old)
+                shutil.rmtree(old, ignore_errors=True)
+            os.rename(tmp, path)
+        except OSError:
+            # another process published the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+        return True
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = sum(file.stat().st_size for file in os.scandir(entry.path))
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def evict(self, max_bytes: int):
+        """Removes least recently used entries until at most `max_bytes` remain."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        self.evict(0)
+
+    def close(self):
+        """Removes the store if it was created by this instance."""
+        if self.owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
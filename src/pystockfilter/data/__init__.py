@@ -6,8 +6,79 @@
   Use of this source code is governed by an MIT-style license that
   can be found in the LICENSE file.
 """
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+
+PRECISIONS = ("float64", "float32")
+
+
+def with_precision(data, precision: str = "float64"):
+    """
+    Returns `data` with its float columns as `precision` ("float64" or
+    "float32"). Integer columns (e.g. an integer Volume) are kept. The
+    frame is returned as is if nothing has to be converted.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision {precision}, use one of {PRECISIONS}")
+    dtype = np.dtype(precision)
+    columns = [
+        column
+        for column, column_dtype in data.dtypes.items()
+        if np.issubdtype(column_dtype, np.floating) and column_dtype != dtype
+    ]
+    if not columns:
+        return data
+    return data.astype({column: dtype for column in columns})
+
+
+def fetch_concurrently(
+    get_stock_data: Callable, symbols: Sequence[str], start, end, max_workers: int = 8
+) -> dict:
+    """
+    Returns symbol -> `get_stock_data(symbol, start, end)` of the distinct
+    `symbols`, fetching up to `max_workers` symbols at a time.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if len(symbols) <= 1 or max_workers <= 1:
+        return {symbol: get_stock_data(symbol, start, end) for symbol in symbols}
+    with ThreadPoolExecutor(min(max_workers, len(symbols))) as pool:
+        frames = pool.map(lambda symbol: get_stock_data(symbol, start, end), symbols)
+        return dict(zip(symbols, frames))
+
+
 class StockDataSource:
 
+    # float type of the returned prices, see `with_precision`
+    PRECISION = "float64"
+    # concurrent fetches of the default `get_many`
+    MAX_WORKERS = 8
+    # bars per frame of `iter_blocks`
+    BLOCK_SIZE = 100_000
+
     @staticmethod
     def get_stock_data(symbol: str, start: str, end: str, **kwargs):
         raise NotImplementedError()
+
+    @classmethod
+    def get_many(cls, symbols: Sequence[str], start, end) -> dict:
+        """
+        Returns the data of many symbols (symbol -> frame). Sources override
+        this with a bulk read where possible; by default the symbols are
+        fetched by `get_stock_data` in `MAX_WORKERS` threads.
+        """
+        return fetch_concurrently(cls.get_stock_data, symbols, start, end, cls.MAX_WORKERS)
+
+    @classmethod
+    def iter_blocks(cls, symbol: str, start, end, block_size: int = None) -> Iterator:
+        """
+        Yields the data of `symbol` as consecutive frames of up to
+        `block_size` (default `BLOCK_SIZE`) bars, e.g. for a
+        `StreamingBacktest`. Sources override this to read each block from
+        disk; by default the data is read at once and sliced.
+        """
+        block_size = block_size or cls.BLOCK_SIZE
+        data = cls.get_stock_data(symbol, start, end)
+        for offset in range(0, len(data), block_size):
+            yield data.iloc[offset : offset + block_size]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import asyncio
+import inspect
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Sequence
+
+import pandas as pd
+
+
+class AsyncDataSource:
+    """
+    asyncio interface of a data source (a `StockDataSource` or
+    `DataSourceModule`). A coroutine `get_stock_data` of the source is
+    awaited; a synchronous one runs in a pool of `max_workers` threads.
+
+        with AsyncDataSource(source) as data:
+            async for symbol, df in data.prefetch(symbols, start, end):
+                ...
+    """
+
+    def __init__(self, data_source, max_workers: int = 4):
+        self.data_source = data_source
+        self._executor = ThreadPoolExecutor(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, symbol: str, start, end) -> asyncio.Future:
+        """Starts fetching `symbol`; threads start right away, not at the first await."""
+        get_stock_data = self.data_source.get_stock_data
+        if inspect.iscoroutinefunction(get_stock_data):
+            return asyncio.ensure_future(get_stock_data(symbol, start, end))
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, get_stock_data, symbol, start, end)
+
+    async def get_stock_data(self, symbol: str, start, end) -> pd.DataFrame:
+        return await self._start(symbol, start, end)
+
+    async def prefetch(
+        self, symbols: Sequence[str], start, end, depth: int = 4
+    ) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+        """
+        Yields (symbol, data) in the order of `symbols` while the data of
+        up to `depth` following symbols is being fetched. Work done by the
+        consumer between two items overlaps with fetches running in threads;
+        coroutine sources only advance while the consumer awaits.
+        """
+        symbols = iter(symbols)
+        pending = deque()
+
+        def schedule():
+            symbol = next(symbols, None)
+            if symbol is not None:
+                pending.append((symbol, self._start(symbol, start, end)))
+
+        for _ in range(max(1, depth)):
+            schedule()
+        try:
+            while pending:
+                symbol, task = pending.popleft()
+                data = await task
+                schedule()
+                yield symbol, data
+        finally:
+            for _, task in pending:
+                task.cancel()
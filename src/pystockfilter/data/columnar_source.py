@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import json
+import os
+import shutil
+import uuid
+from glob import glob
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter import logger
+from pystockfilter.data import StockDataSource, with_precision
+
+_META = "meta.json"
+_DATE = "Date"
+
+
+def to_utc(value) -> pd.Timestamp:
+    """Returns `value` as UTC timestamp, naive values are taken as UTC."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize("UTC")
+    return timestamp.tz_convert("UTC")
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    """Reads a `SYMBOL.csv` like `LocalDataSource` (UTC `Date` index)."""
+    data = pd.read_csv(path)
+    data[_DATE] = pd.to_datetime(data[_DATE], utc=True)
+    return data.set_index(_DATE)
+
+
+class ColumnarStore:
+    """
+    Local price store with one directory per symbol holding a `.npy` file
+    per column and the sorted dates (UTC nanoseconds) in `Date.npy`.
+
+    Reads map the files and binary search the dates, so only the rows and
+    columns of the requested range are loaded. Symbols are written to a
+    temporary directory which is renamed into place, so readers never see
+    partial symbols.
+
+    Args:
+        directory (str): Directory of the store.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.directory, symbol.upper())
+
+    def symbols(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            entry.name
+            for entry in os.scandir(self.directory)
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+
+    def __contains__(self, symbol: str) -> bool:
+        return os.path.exists(os.path.join(self._path(symbol), _META))
+
+    def columns(self, symbol: str) -> list[str]:
+        with open(os.path.join(self._path(symbol), _META)) as file:
+            return json.load(file)["columns"]
+
+    def write(self, symbol: str, data: pd.DataFrame):
+        """Stores `data` (a frame with a datetime index) as `symbol`."""
+        dates = pd.DatetimeIndex(data.index)
+        if dates.tz is None:
+            dates = dates.tz_localize("UTC")
+        order = np.argsort(dates.asi8, kind="stable")
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = os.path.join(self.directory, f".tmp-{os.getpid()}-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            np.save(os.path.join(tmp, f"{_DATE}.npy"), dates.asi8[order])
+            for i, column in enumerate(data.columns):
+                values = data.iloc[:, i].to_numpy()[order]
+                np.save(os.path.join(tmp, f"{i}.npy"), values, allow_pickle=False)
+            with open(os.path.join(tmp, _META), "w") as file:
+                json.dump({"columns": [str(column) for column in data.columns]}, file)
+            path = self._path(symbol)
+            if os.path.exists(path):
+                old = f"{tmp}.old"
+                os.rename(path, old)
+                shutil.rmtree(old, ignore_errors=True)
+            os.rename(tmp, path)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def dates(self, symbol: str) -> np.ndarray:
+        """Returns the memory-mapped dates of `symbol` (int64 UTC nanoseconds)."""
+        return np.load(os.path.join(self._path(symbol), f"{_DATE}.npy"), mmap_mode="r")
+
+    def bounds(self, symbol: str, start=None, end=None) -> tuple[int, int]:
+        """Returns the row range of the dates in [start, end]."""
+        dates = self.dates(symbol)
+        lo = 0 if start is None else np.searchsorted(dates, to_utc(start).value, "left")
+        hi = (
+            len(dates)
+            if end is None
+            else np.searchsorted(dates, to_utc(end).value, "right")
+        )
+        return int(lo), int(max(lo, hi))
+
+    def read(
+        self,
+        symbol: str,
+        start=None,
+        end=None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Returns the rows of `symbol` dated within [start, end] (inclusive,
+        None for open ends) and the given `columns` (all if None).
+        """
+        if symbol not in self:
+            raise FileNotFoundError(f"Symbol {symbol} is not in {self.directory}")
+        lo, hi = self.bounds(symbol, start, end)
+        return self.read_rows(symbol, lo, hi, columns)
+
+    def read_rows(
+        self, symbol: str, lo: int, hi: int, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """Returns the rows [lo, hi) of `symbol`, see `bounds`."""
+        path = self._path(symbol)
+        stored = self.columns(symbol)
+        columns = stored if columns is None else list(columns)
+        index = pd.DatetimeIndex(
+            np.array(self.dates(symbol)[lo:hi]).view("datetime64[ns]"), name=_DATE
+        ).tz_localize("UTC")
+        values = {}
+        for column in columns:
+            if column not in stored:
+                raise KeyError(f"Column {column} is not stored for {symbol}")
+            array = np.load(
+                os.path.join(path, f"{stored.index(column)}.npy"), mmap_mode="r"
+            )
+            values[column] = np.array(array[lo:hi])
+        return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def convert_csv_directory(source: str, target: str, symbols: Sequence[str] = None) -> int:
+    """
+    Converts the `SYMBOL.csv` files of the `source` directory (all if
+    `symbols` is None) into a `ColumnarStore` at `target`. Returns the
+    number of converted symbols.
+    """
+    store = ColumnarStore(target)
+    if symbols is None:
+        paths = sorted(glob(os.path.join(source, "*.csv")))
+    else:
+        paths = [os.path.join(source, f"{symbol.upper()}.csv") for symbol in symbols]
+    for path in paths:
+        symbol = os.path.splitext(os.path.basename(path))[0]
+        store.write(symbol, read_csv(path))
+    logger.info(f"Converted {len(paths)} symbols from {source} to {target}")
+    return len(paths)
+
+
+class ColumnarDataSource(StockDataSource):
+    """
+    `StockDataSource` of a `ColumnarStore` at `STORE_PATH`, e.g. created
+    from a `LocalDataSource` directory by `convert_csv_directory`. Returns
+    the same frames as `LocalDataSource`.
+    """
+
+    STORE_PATH = None
+    # columns to load, all if None
+    COLUMNS = None
+
+    @staticmethod
+    def store() -> ColumnarStore:
+        if ColumnarDataSource.STORE_PATH is None or not os.path.exists(
+            ColumnarDataSource.STORE_PATH
+        ):
+            raise FileNotFoundError("Stock data path does not exist")
+        return ColumnarStore(ColumnarDataSource.STORE_PATH)
+
+    @staticmethod
+    def get_stock_data(symbol: str, start: str, end: str):
+        store = ColumnarDataSource.store()
+        data = store.read(symbol, start, end, ColumnarDataSource.COLUMNS)
+        return with_precision(data, ColumnarDataSource.PRECISION)
+
+    @classmethod
+    def iter_blocks(cls, symbol: str, start, end, block_size: int = None):
+        # only the rows of the current block are read from the maps
+        block_size = block_size or cls.BLOCK_SIZE
+        store = ColumnarDataSource.store()
+        if symbol not in store:
+            raise FileNotFoundError(f"Symbol {symbol} is not in {store.directory}")
+        lo, hi = store.bounds(symbol, start, end)
+        for offset in range(lo, hi, block_size):
+            data = store.read_rows(
+                symbol, offset, min(offset + block_size, hi), ColumnarDataSource.COLUMNS
+            )
+            yield with_precision(data, ColumnarDataSource.PRECISION)
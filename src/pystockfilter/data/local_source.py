@@ -7,12 +7,72 @@
   can be found in the LICENSE file.
 """
 
-from pystockfilter.data import StockDataSource
+import os
+import threading
+from collections import OrderedDict
 from os import path
+
 import pandas as pd
 
+from pystockfilter.data import StockDataSource, with_precision
+from pystockfilter.data.columnar_source import read_csv, to_utc
+
+
+class FrameCache:
+    """
+    Thread-safe LRU of parsed CSV frames keyed by path. An entry is only
+    served while the modification time and size of its file are unchanged.
+
+    Args:
+        max_bytes (int): Capacity in bytes of the cached frames.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024**2):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data_path: str) -> pd.DataFrame:
+        """Returns the parsed frame of `data_path`, reading it if needed."""
+        stat = os.stat(data_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._frames.get(data_path)
+            if entry is not None and entry[0] == version:
+                self._frames.move_to_end(data_path)
+                return entry[1]
+        # parse outside of the lock, other files can be served meanwhile
+        data = read_csv(data_path)
+        size = int(data.memory_usage(index=True).sum())
+        with self._lock:
+            self._remove(data_path)
+            if size <= self.max_bytes:
+                self._frames[data_path] = (version, data, size)
+                self.nbytes += size
+                while self.nbytes > self.max_bytes:
+                    self._remove(next(iter(self._frames)))
+        return data
+
+    def _remove(self, data_path: str):
+        entry = self._frames.pop(data_path, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+
 class LocalDataSource(StockDataSource):
-    STOCK_DATA_PATH = None 
+    STOCK_DATA_PATH = None
+    # parsed SYMBOL.csv frames, shared by all calls of the process
+    cache = FrameCache()
+
     @staticmethod
     def get_stock_data(symbol: str, start: str, end: str):
         if not path.exists(LocalDataSource.STOCK_DATA_PATH):
@@ -20,12 +80,14 @@ class LocalDataSource(StockDataSource):
         data_path = path.join(LocalDataSource.STOCK_DATA_PATH,f"{symbol.upper()}.csv")
         if not path.exists(data_path):
             raise FileNotFoundError("Stock data file does not exist")
-        data = pd.read_csv(data_path)
-        # Convert date to datetime
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        data.set_index("Date", inplace=True)
-        start = pd.to_datetime(start).tz_localize('UTC')
-        end = pd.to_datetime(end).tz_localize('UTC')
+        data = LocalDataSource.cache.get(data_path)
+        start, end = to_utc(start), to_utc(end)
         # Filter data
-        data = data[(data.index >= start) & (data.index <= end)]
-        return data
\ No newline at end of file
+        if data.index.is_monotonic_increasing:
+            lo = data.index.searchsorted(start, "left")
+            hi = data.index.searchsorted(end, "right")
+            data = data.iloc[lo:max(lo, hi)]
+        else:
+            data = data[(data.index >= start) & (data.index <= end)]
+        # callers may modify the frame, the cached one stays untouched
+        return with_precision(data.copy(), LocalDataSource.PRECISION)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import json
+import os
+import shutil
+import threading
+import uuid
+from glob import glob
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter import logger
+from pystockfilter.data import StockDataSource, with_precision
+from pystockfilter.data.columnar_source import read_csv, to_utc
+
+_INDEX = "index.json"
+_DATE = "Date"
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class PanelStore:
+    """
+    Universe panel of memory-mapped `.npy` files, one per field
+    (Open/High/Low/Close/Volume) plus the dates (UTC nanoseconds). The rows
+    of a symbol are contiguous and sorted by date; `index.json` maps each
+    symbol to its (offset, length).
+
+    `read` returns frames whose columns are read-only views of the maps,
+    so all processes of a node share the page cache instead of holding
+    copies of the data. Copy a frame before modifying it.
+
+    Args:
+        directory (str): Directory of the panel.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._maps = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            with open(os.path.join(self.directory, _INDEX)) as file:
+                self._index = json.load(file)
+        return self._index
+
+    @property
+    def fields(self) -> list[str]:
+        return self.index["fields"]
+
+    def symbols(self) -> list[str]:
+        return sorted(self.index["symbols"])
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.index["symbols"]
+
+    def _map(self, name: str) -> np.ndarray:
+        array = self._maps.get(name)
+        if array is None:
+            with self._lock:
+                array = self._maps.get(name)
+                if array is None:
+                    path = os.path.join(self.directory, f"{name}.npy")
+                    # plain ndarray view, pandas keeps np.memmap subclasses
+                    array = np.asarray(np.load(path, mmap_mode="r"))
+                    self._maps[name] = array
+        return array
+
+    def write(self, frames: Mapping[str, pd.DataFrame], fields: Sequence[str] = FIELDS):
+        """
+        Builds the panel of `frames` (symbol -> frame with a datetime index),
+        replacing an existing panel. The fields are filled in place through
+        `numpy.lib.format.open_memmap`, so the panel is never held in memory.
+        """
+        fields = list(fields)
+        symbols, offset = {}, 0
+        for symbol, data in frames.items():
+            symbols[symbol.upper()] = (offset, len(data))
+            offset += len(data)
+        os.makedirs(os.path.dirname(os.path.abspath(self.directory)), exist_ok=True)
+        tmp = f"{self.directory}.tmp-{os.getpid()}-{uuid.uuid4().hex}"
+        os.makedirs(tmp)
+        try:
+            dtypes = {
+                field: np.result_type(*(data[field].dtype for data in frames.values()))
+                for field in fields
+            }
+            dtypes[_DATE] = np.dtype(np.int64)
+            maps = {
+                name: np.lib.format.open_memmap(
+                    os.path.join(tmp, f"{name}.npy"), "w+", dtype, (offset,)
+                )
+                for name, dtype in dtypes.items()
+            }
+            for symbol, data in frames.items():
+                start, length = symbols[symbol.upper()]
+                dates = pd.DatetimeIndex(data.index)
+                if dates.tz is None:
+                    dates = dates.tz_localize("UTC")
+                order = np.argsort(dates.asi8, kind="stable")
+                rows = slice(start, start + length)
+                maps[_DATE][rows] = dates.asi8[order]
+                for field in fields:
+                    maps[field][rows] = data[field].to_numpy()[order]
+            for array in maps.values():
+                array.flush()
+            del maps
+            with open(os.path.join(tmp, _INDEX), "w") as file:
+                json.dump({"fields": fields, "symbols": symbols}, file)
+            if os.path.exists(self.directory):
+                old = f"{tmp}.old"
+                os.rename(self.directory, old)
+                shutil.rmtree(old, ignore_errors=True)
+            os.rename(tmp, self.directory)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._maps, self._index = {}, None
+
+    def bounds(self, symbol: str, start=None, end=None) -> tuple[int, int]:
+        """Returns the panel rows of `symbol` dated within [start, end]."""
+        offset, length = self.index["symbols"][symbol.upper()]
+        dates = self._map(_DATE)[offset : offset + length]
+        lo = 0 if start is None else np.searchsorted(dates, to_utc(start).value, "left")
+        hi = length if end is None else np.searchsorted(dates, to_utc(end).value, "right")
+        return offset + int(lo), offset + int(max(lo, hi))
+
+    def read(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Returns the rows of `symbol` dated within [start, end] (inclusive,
+        None for open ends). The field columns do not copy the panel.
+        """
+        if symbol not in self:
+            raise FileNotFoundError(f"Symbol {symbol} is not in {self.directory}")
+        lo, hi = self.bounds(symbol, start, end)
+        return self.rows(lo, hi)
+
+    def rows(self, lo: int, hi: int) -> pd.DataFrame:
+        """Returns the panel rows [lo, hi), see `bounds`."""
+        index = pd.DatetimeIndex(
+            self._map(_DATE)[lo:hi].view("datetime64[ns]"), name=_DATE
+        ).tz_localize("UTC")
+        return pd.DataFrame(
+            {field: self._map(field)[lo:hi] for field in self.fields},
+            index=index,
+            copy=False,
+        )
+
+
+def build_panel(source: str, target: str, symbols: Sequence[str] = None) -> int:
+    """
+    Builds a `PanelStore` at `target` of the `SYMBOL.csv` files of the
+    `source` directory (all if `symbols` is None). Returns the number of
+    symbols.
+    """
+    if symbols is None:
+        paths = sorted(glob(os.path.join(source, "*.csv")))
+    else:
+        paths = [os.path.join(source, f"{symbol.upper()}.csv") for symbol in symbols]
+    frames = {os.path.splitext(os.path.basename(p))[0]: read_csv(p) for p in paths}
+    PanelStore(target).write(frames)
+    logger.info(f"Built panel of {len(frames)} symbols from {source} in {target}")
+    return len(frames)
+
+
+class PanelDataSource(StockDataSource):
+    """
+    `StockDataSource` of the `PanelStore` at `STORE_PATH`. The panel is
+    mapped once per process and every frame is a view of it; it is mapped
+    again when `build_panel` replaces it, i.e. when its `index.json` changes.
+    """
+
+    STORE_PATH = None
+    _stores = {}
+
+    @staticmethod
+    def store() -> PanelStore:
+        path = PanelDataSource.STORE_PATH
+        try:
+            stat = os.stat(os.path.join(path, _INDEX))
+        except (TypeError, OSError):
+            raise FileNotFoundError("Stock data path does not exist") from None
+        version = (stat.st_mtime_ns, stat.st_ino)
+        cached = PanelDataSource._stores.get(path)
+        if cached is None or cached[0] != version:
+            cached = PanelDataSource._stores[path] = (version, PanelStore(path))
+        return cached[1]
+
+    @staticmethod
+    def get_stock_data(symbol: str, start: str, end: str):
+        data = PanelDataSource.store().read(symbol, start, end)
+        return with_precision(data, PanelDataSource.PRECISION)
+
+    @classmethod
+    def iter_blocks(cls, symbol: str, start, end, block_size: int = None):
+        # each block is a view of the maps, pages are loaded on access
+        block_size = block_size or cls.BLOCK_SIZE
+        store = PanelDataSource.store()
+        if symbol not in store:
+            raise FileNotFoundError(f"Symbol {symbol} is not in {store.directory}")
+        lo, hi = store.bounds(symbol, start, end)
+        for offset in range(lo, hi, block_size):
+            data = store.rows(offset, min(offset + block_size, hi))
+            yield with_precision(data, PanelDataSource.PRECISION)
@@ -6,21 +6,99 @@
   Use of this source code is governed by an MIT-style license that
   can be found in the LICENSE file.
 """
+from typing import Sequence
 
+import numpy as np
 import pandas as pd
-from pystockdb.db.schema.stocks import Price
+from pony.orm import db_session
+from pystockdb.db.schema.stocks import db
+
+from pystockfilter.data import StockDataSource, with_precision
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+DTYPES = {"Open": float, "High": float, "Low": float, "Close": float, "Volume": np.int64}
+
+
+def _date(value):
+    value = pd.Timestamp(value).to_pydatetime()
+    if db.provider.dialect == "SQLite":
+        # pony stores sqlite datetimes as text with microseconds
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return value
+
+
+def _frame(index: pd.DatetimeIndex, columns: dict) -> pd.DataFrame:
+    return pd.DataFrame(columns, index=index, columns=list(COLUMNS)).astype(DTYPES)
 
-from pystockfilter.data import StockDataSource  # Ensure the correct import for Price
 
 class PyStockDBDataSource(StockDataSource):
-    
+    """
+    Prices of a pystockdb database. The bars of up to `BATCH_SIZE` symbols
+    are fetched by one SQL query on the indexed symbol column and converted
+    column-wise into frames with a `Date` index and Open/High/Low/Close/Volume
+    columns.
+    """
+
+    # symbols per SQL query
+    BATCH_SIZE = 500
+
     @staticmethod
-    def get_stock_data(symbol: str, start: str, end: str):
-        bars = Price.select(
-            lambda p: symbol == p.symbol.name
-            and p.date >= start
-            and p.date <= end
+    def _query(symbols: Sequence[str]) -> str:
+        names = ", ".join(f"$symbol_{i}" for i in range(len(symbols)))
+        return (
+            "p.date, s.name, p.open, p.high, p.low, p.close, p.volume "
+            "FROM Price p JOIN Symbol s ON p.symbol = s.id "
+            f"WHERE s.name IN ({names}) AND p.date >= $start AND p.date <= $end "
+            "ORDER BY s.name, p.date"
         )
-        stock_data = [[i.close, i.open, i.low, i.high] for i in bars]
-        df = pd.DataFrame(stock_data, columns=["Close", "Open", "Low", "High"])
-        return df
\ No newline at end of file
+
+    @staticmethod
+    def _frames(rows: list) -> dict:
+        """Splits the rows sorted by symbol into one frame per symbol."""
+        if not rows:
+            return {}
+        dates, names, *values = zip(*rows)
+        names = np.asarray(names, dtype=object)
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+        ends = np.r_[starts[1:], len(names)]
+        index = pd.DatetimeIndex(pd.to_datetime(dates), name="Date")
+        columns = {
+            name: np.asarray(column, dtype=DTYPES[name])
+            for name, column in zip(COLUMNS, values)
+        }
+        return {
+            names[start]: _frame(
+                index[start:end],
+                {name: column[start:end] for name, column in columns.items()},
+            )
+            for start, end in zip(starts, ends)
+        }
+
+    @staticmethod
+    @db_session
+    def get_many(symbols: Sequence[str], start, end) -> dict:
+        """
+        Returns the frames of `symbols` (symbol -> frame) using one SQL query
+        per `BATCH_SIZE` symbols. Symbols without bars get empty frames.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        parameters = {"start": _date(start), "end": _date(end)}
+        frames = {}
+        size = PyStockDBDataSource.BATCH_SIZE
+        for offset in range(0, len(symbols), size):
+            batch = symbols[offset : offset + size]
+            parameters.update({f"symbol_{i}": name for i, name in enumerate(batch)})
+            rows = db.select(PyStockDBDataSource._query(batch), parameters)
+            frames.update(PyStockDBDataSource._frames(rows))
+        empty = pd.DatetimeIndex([], name="Date")
+        return {
+            symbol: with_precision(
+                frames[symbol] if symbol in frames else _frame(empty, {}),
+                PyStockDBDataSource.PRECISION,
+            )
+            for symbol in symbols
+        }
+
+    @staticmethod
+    def get_stock_data(symbol: str, start: str, end: str):
+        return PyStockDBDataSource.get_many([symbol], start, end)[symbol]
@@ -7,7 +7,9 @@
   can be found in the LICENSE file.
 """
 
+from pystockfilter.data.columnar_source import ColumnarDataSource
 from pystockfilter.data.local_source import LocalDataSource
+from pystockfilter.data.panel_source import PanelDataSource
 from pystockfilter.data.pystockdb_source import PyStockDBDataSource
 from pystockfilter.data.yfinance_source import YFinanceDataSource
 from pystockfilter.data.yfinance_source_cache import YFinanceDataSourceCache
@@ -19,6 +21,8 @@ class DataSourceModule:
     Y_FINANCE_CACHE = 'yfinance_cache'
     PY_STOCK_DB = 'pystockdb'
     LOCAL = 'local'
+    COLUMNAR = 'columnar'
+    PANEL = 'panel'
 
     def __init__(self, source: str, *args, **kwargs):
         if source == DataSourceModule.Y_FINANCE:
@@ -27,6 +31,10 @@ class DataSourceModule:
             self.data_source = PyStockDBDataSource
         elif source == DataSourceModule.LOCAL:
             self.data_source = LocalDataSource
+        elif source == DataSourceModule.COLUMNAR:
+            self.data_source = ColumnarDataSource
+        elif source == DataSourceModule.PANEL:
+            self.data_source = PanelDataSource
         elif source == DataSourceModule.Y_FINANCE_CACHE:
             self.data_source = YFinanceDataSourceCache
         else:
@@ -41,4 +49,11 @@ class DataSourceModule:
         
 
     def get_stock_data(self, symbol: str, start: str, end: str):
-        return self.data_source.get_stock_data(symbol, start, end)
\ No newline at end of file
+        return self.data_source.get_stock_data(symbol, start, end)
+
+    def get_many(self, symbols: list[str], start: str, end: str) -> dict:
+        """Returns the data of many symbols (symbol -> frame) in one step."""
+        return self.data_source.get_many(symbols, start, end)
+    def iter_blocks(self, symbol: str, start: str, end: str, block_size: int = None):
+        """Yields the data of `symbol` in frames of up to `block_size` bars."""
+        return self.data_source.iter_blocks(symbol, start, end, block_size)
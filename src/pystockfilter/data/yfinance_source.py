@@ -10,7 +10,7 @@
 from datetime import datetime
 import yfinance as yf
 
-from pystockfilter.data import StockDataSource
+from pystockfilter.data import StockDataSource, with_precision
 import pandas as pd
 
 class YFinanceDataSource(StockDataSource):
@@ -22,4 +22,23 @@ class YFinanceDataSource(StockDataSource):
         if isinstance(data.columns, pd.MultiIndex):
             # Select the price type (Open, Close, etc.) from the MultiIndex
             data.columns = data.columns.get_level_values(0)
-        return data
\ No newline at end of file
+        return with_precision(data, YFinanceDataSource.PRECISION)
+
+    @staticmethod
+    def get_many(symbols: list[str], start: datetime, end: datetime) -> dict:
+        """Downloads all symbols by one multi-ticker request."""
+        symbols = list(dict.fromkeys(symbols))
+        data = yf.download(symbols, start=start, end=end, group_by="ticker")
+        tickers = (
+            data.columns.get_level_values(0)
+            if isinstance(data.columns, pd.MultiIndex)
+            else []
+        )
+        frames = {}
+        for symbol in symbols:
+            # rows are the union of all dates, drop those without bars
+            frame = data[symbol] if symbol in tickers else data.iloc[:0, :0]
+            frame = frame.dropna(how="all")
+            frame.columns.name = None
+            frames[symbol] = with_precision(frame, YFinanceDataSource.PRECISION)
+        return frames
\ No newline at end of file
@@ -7,26 +7,120 @@
   can be found in the LICENSE file.
 """
 
+import os
+import threading
+import uuid
 from datetime import datetime, timedelta
-from pystockfilter.data.yfinance_source import YFinanceDataSource
-from joblib import Memory
+
+import pandas as pd
+
 from pystockfilter import logger
+from pystockfilter.data import fetch_concurrently, with_precision
+from pystockfilter.data.yfinance_source import YFinanceDataSource
+
+
+def _day(value) -> pd.Timestamp:
+    return pd.Timestamp(value).tz_localize(None).normalize()
 
-# Setup caching directory
-cache_dir = './yfinance_cache'
-memory = Memory(cache_dir, verbose=0)
+
+def _bound(value: pd.Timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """Returns the naive day `value` comparable with `index`."""
+    return value.tz_localize(index.tz) if index.tz is not None else value
 
 
 class YFinanceDataSourceCache(YFinanceDataSource):
-    
+    """
+    Yahoo Finance source with a history cache per symbol in `CACHE_DIR`.
+
+    An entry holds the bars of the days [start, end) fetched so far. A
+    request only downloads the days missing before or after this range;
+    the bars are merged, duplicates are replaced by the newer download, and
+    every request within the range is served locally. The current day is
+    never marked as fetched, so its (incomplete) bar is refreshed by the
+    next request.
+
+    `downloader(symbol, start, end)` fetches the bars of [start, end) and
+    can be replaced, e.g. by a stub in tests.
+    """
+
+    CACHE_DIR = "./yfinance_cache"
+    downloader = staticmethod(YFinanceDataSource.get_stock_data)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _path(symbol: str) -> str:
+        return os.path.join(YFinanceDataSourceCache.CACHE_DIR, f"{symbol.upper()}.pkl")
+
+    @staticmethod
+    def load(symbol: str):
+        """Returns the cached (start, end, data) of `symbol` or None."""
+        path = YFinanceDataSourceCache._path(symbol)
+        if not os.path.exists(path):
+            return None
+        entry = pd.read_pickle(path)
+        return entry["start"], entry["end"], entry["data"]
+
+    @staticmethod
+    def _save(symbol: str, start: pd.Timestamp, end: pd.Timestamp, data: pd.DataFrame):
+        os.makedirs(YFinanceDataSourceCache.CACHE_DIR, exist_ok=True)
+        path = YFinanceDataSourceCache._path(symbol)
+        tmp = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex}"
+        pd.to_pickle({"start": start, "end": end, "data": data}, tmp)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _download(symbol: str, start: pd.Timestamp, end: pd.Timestamp):
+        logger.info(f"Gather data for {symbol} from {start:%Y-%m-%d} to {end:%Y-%m-%d}")
+        return YFinanceDataSourceCache.downloader(
+            symbol, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+        )
+
+    @staticmethod
+    def history(symbol: str, start, end) -> pd.DataFrame:
+        """
+        Returns the cached bars of `symbol` covering the days [start, end),
+        downloading the missing head and tail first.
+        """
+        start, end = _day(start), _day(end)
+        with YFinanceDataSourceCache._lock:
+            # a missing entry is an empty range at the end of the request
+            cached_start, cached_end, cached = YFinanceDataSourceCache.load(
+                symbol
+            ) or (end, end, None)
+            download = YFinanceDataSourceCache._download
+            head = download(symbol, start, cached_start) if start < cached_start else None
+            tail = download(symbol, cached_end, end) if end > cached_end else None
+            if head is None and tail is None:
+                return cached
+            parts = [part for part in (head, cached, tail) if part is not None]
+            data = pd.concat([part for part in parts if len(part)] or parts[:1])
+            data = data[~data.index.duplicated(keep="last")].sort_index()
+            # the bar of the current day is not final yet
+            covered_end = min(max(end, cached_end), _day(datetime.now()))
+            YFinanceDataSourceCache._save(
+                symbol, min(start, cached_start), covered_end, data
+            )
+        return data
+
     @staticmethod
     def get_stock_data(symbol: str, start: datetime, end: datetime):
         # round end date to the next day
-        end_up = end + timedelta(days=1)
-        return YFinanceDataSourceCache.get_stock_data_cache(symbol, start.strftime('%Y-%m-%d'), end_up.strftime('%Y-%m-%d'))
-        
+        end_up = _day(end) + timedelta(days=1)
+        data = YFinanceDataSourceCache.history(symbol, start, end_up)
+        index = pd.DatetimeIndex(data.index)
+        data = data[
+            (index >= _bound(_day(start), index)) & (index < _bound(end_up, index))
+        ]
+        return with_precision(data, YFinanceDataSourceCache.PRECISION)
+
+
     @staticmethod
-    @memory.cache
-    def get_stock_data_cache(symbol: str, start: str, end: str):
-        logger.info(f"Gather data for {symbol} from {start} to {end}")
-        return YFinanceDataSource.get_stock_data(symbol, start, end)
\ No newline at end of file
+    def get_many(symbols: list[str], start: datetime, end: datetime) -> dict:
+        # per symbol, so that only missing ranges are downloaded
+        return fetch_concurrently(
+            YFinanceDataSourceCache.get_stock_data,
+            symbols,
+            start,
+            end,
+            YFinanceDataSourceCache.MAX_WORKERS,
+        )
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+
+  NumPy indicator kernels used by the built-in strategies. The kernels work
+  on float64 arrays and reproduce the pandas_ta functions of the same name.
+  The banks compute a window indicator for many window lengths at once from
+  one cumulative sum, one row per length. The recursive indicators (EMA,
+  RMA, RSI, ATR) have no such bank; their lengths are computed one by one.
+"""
+from pystockfilter.indicators.banks import sma_bank, stdev_bank
+from pystockfilter.indicators.incremental import (
+    ATR,
+    EMA,
+    MACD,
+    RMA,
+    RSI,
+    UO,
+    Incremental,
+    RollingSum,
+)
+from pystockfilter.indicators.kernels import (
+    as_float,
+    atr,
+    bbands,
+    cdl_doji,
+    ema,
+    macd,
+    non_zero_range,
+    rma,
+    rsi,
+    sma,
+    stdev,
+    to_series,
+    true_range,
+    uo,
+)
+
+__all__ = [
+    "ATR",
+    "EMA",
+    "MACD",
+    "RMA",
+    "RSI",
+    "UO",
+    "Incremental",
+    "RollingSum",
+    "as_float",
+    "atr",
+    "bbands",
+    "cdl_doji",
+    "ema",
+    "macd",
+    "non_zero_range",
+    "rma",
+    "rsi",
+    "sma",
+    "sma_bank",
+    "stdev",
+    "stdev_bank",
+    "to_series",
+    "true_range",
+    "uo",
+]
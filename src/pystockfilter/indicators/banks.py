@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import numpy as np
+
+
+def _lengths(lengths) -> np.ndarray:
+    return np.asarray([int(length) for length in lengths], dtype=np.int64)
+
+
+def _offset(values: np.ndarray) -> float:
+    # centering the data keeps the cumulative sums small
+    return values[0] if len(values) and np.isfinite(values[0]) else 0.0
+
+
+def _window_bank(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Sums over the last `lengths[i]` values in row i, NaN until the window
+    is filled. All rows are differences of one cumulative sum.
+    """
+    n = len(values)
+    if np.isnan(values).any():
+        bank = np.full((len(lengths), n), np.nan)
+        for row, length in zip(bank, lengths):
+            if 1 <= length <= n:
+                windows = np.lib.stride_tricks.sliding_window_view(values, length)
+                row[length - 1 :] = windows.sum(axis=1)
+        return bank
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    end = np.arange(1, n + 1)
+    start = end - lengths[:, None]
+    bank = sums[end] - sums[np.maximum(start, 0)]
+    bank[(start < 0) | (lengths[:, None] < 1)] = np.nan
+    return bank
+
+
+def sma_bank(close, lengths) -> np.ndarray:
+    """
+    Simple moving averages of `close` for all `lengths` at once. Returns a
+    (len(lengths), len(close)) array; row i equals `sma(close, lengths[i])`.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    lengths = _lengths(lengths)
+    offset = _offset(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _window_bank(close - offset, lengths) / lengths[:, None] + offset
+
+
+def stdev_bank(close, lengths, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviations of `close` with `ddof` delta degrees of
+    freedom, one row per length. Row i equals `stdev(close, lengths[i], ddof)`.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    lengths = _lengths(lengths)
+    centered = close - _offset(close)
+    sums = _window_bank(centered, lengths)
+    squares = _window_bank(centered * centered, lengths)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - sums * sums / lengths[:, None]) / (
+            lengths[:, None] - ddof
+        )
+    bank = np.sqrt(np.maximum(variance, 0.0))
+    bank[lengths <= ddof] = np.nan
+    return bank
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+
+  Declarative indicator specs. Nodes describe an indicator by its inputs
+  instead of computing it; an `IndicatorGraph` collects the nodes of a
+  strategy, merges identical ones (common subexpression elimination) and
+  evaluates each node once, inputs first.
+
+      close = Column("Close")
+      ema = Call(EmaCrossCloseStrategy.algo, close, 14)
+"""
+from collections import OrderedDict
+
+
+def _token(value):
+    if isinstance(value, Node):
+        return value.key
+    try:
+        hash(value)
+    except TypeError:
+        # unhashable constants (e.g. arrays) are only equal to themselves
+        return ("id", id(value))
+    return value
+
+
+class Node:
+    key: tuple = ()
+
+    @property
+    def inputs(self) -> list:
+        return []
+
+    @property
+    def label(self) -> str:
+        raise NotImplementedError("This method must be implemented by the subclass. ")
+
+    def compute(self, graph: "IndicatorGraph"):
+        raise NotImplementedError("This method must be implemented by the subclass. ")
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.label}>"
+
+
+class Column(Node):
+    """A column of the data, passed through without copying."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = ("column", name)
+
+    @property
+    def label(self) -> str:
+        return self.name
+
+    def compute(self, graph: "IndicatorGraph"):
+        return getattr(graph.data, self.name)
+
+
+class Call(Node):
+    """`func(*args, **kwargs)` where nodes in the arguments are replaced by their values."""
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = (
+            "call",
+            _token(func),
+            tuple(_token(arg) for arg in args),
+            tuple(sorted((name, _token(arg)) for name, arg in kwargs.items())),
+        )
+
+    @property
+    def inputs(self) -> list:
+        return [arg for arg in (*self.args, *self.kwargs.values()) if isinstance(arg, Node)]
+
+    @property
+    def label(self) -> str:
+        params = ",".join(
+            arg.label if isinstance(arg, Node) else str(arg)
+            for arg in (*self.args, *self.kwargs.values())
+        )
+        return f"{getattr(self.func, '__name__', 'Call')}({params})"
+
+    def compute(self, graph: "IndicatorGraph"):
+        def value(arg):
+            return graph.value(arg) if isinstance(arg, Node) else arg
+
+        return self.func(
+            *map(value, self.args),
+            **{name: value(arg) for name, arg in self.kwargs.items()},
+        )
+
+
+class IndicatorGraph:
+    """
+    Indicator DAG of one dataset. Nodes are kept in insertion order, which
+    is topological since inputs are added before the nodes using them.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._nodes = OrderedDict()
+        self._values = {}
+
+    def add(self, node: Node) -> tuple:
+        """Adds `node` and its inputs unless identical nodes exist. Returns its key."""
+        if node.key not in self._nodes:
+            for dependency in node.inputs:
+                self.add(dependency)
+            self._nodes[node.key] = node
+        return node.key
+
+    def evaluate(self, key: tuple = None):
+        """
+        Computes the pending nodes up to `key` (all if None) in topological
+        order and returns the value of `key`.
+        """
+        for current, node in self._nodes.items():
+            if current not in self._values:
+                self._values[current] = node.compute(self)
+            if current == key:
+                break
+        return self._values.get(key)
+
+    def value(self, node: Node):
+        return self.evaluate(self.add(node))
+
+    def __contains__(self, node: Node) -> bool:
+        return node.key in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
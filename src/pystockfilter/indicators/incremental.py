@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def _recursive(gain: float, decay: float, values: np.ndarray, last: float) -> np.ndarray:
+    """Returns y[t] = gain * values[t] + decay * y[t - 1] with y[-1] = last."""
+    last = 0.0 if np.isnan(last) else last
+    result, _ = lfilter([gain], [1.0, -decay], values, zi=[decay * last])
+    return result
+
+
+def _previous(values: np.ndarray, last: float) -> np.ndarray:
+    return np.concatenate(([last], values[:-1]))
+
+
+def _index(data, length: int) -> pd.Index:
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        return data.index
+    return pd.RangeIndex(length)
+
+
+def _precision(data) -> np.dtype:
+    """float32 if the prices of `data` are float32, float64 otherwise."""
+    if isinstance(data, pd.DataFrame):
+        data = data.get("Close")
+    elif not isinstance(data, (pd.Series, np.ndarray)):
+        data = getattr(data, "Close", None)
+    if getattr(data, "dtype", None) == np.float32:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+class Incremental:
+    """
+    Base class of stateful indicators.
+
+    `update` consumes new bars and returns the indicator values of these
+    bars only, keeping the recursive state (EMA seeds, Wilder averages,
+    window tails) in the instance. Computing a full history and extending
+    it bar by bar give the same values, so an indicator of a grown frame
+    is extended in O(new bars) instead of recomputed.
+
+    The state is exported as a flat float array by `state` and restored
+    by `load_state`, so it can be cached next to the indicator values.
+    """
+
+    columns: tuple = ("Close",)
+    # attributes and sub-indicators making up the state
+    _state: tuple = ()
+    _children: tuple = ()
+
+    @property
+    def name(self) -> str:
+        raise NotImplementedError("This method must be implemented by the subclass. ")
+
+    def inputs(self, data) -> list[np.ndarray]:
+        """Returns the input columns of `data` as float arrays."""
+        if isinstance(data, pd.Series) or (
+            isinstance(data, np.ndarray) and data.ndim == 1
+        ):
+            return [np.asarray(data, dtype=float)]
+        return [
+            np.asarray(
+                data[column] if isinstance(data, pd.DataFrame) else getattr(data, column),
+                dtype=float,
+            )
+            for column in self.columns
+        ]
+
+    def update(self, *columns: np.ndarray) -> np.ndarray:
+        columns = [np.asarray(column, dtype=float) for column in columns]
+        if not len(columns[0]):
+            return self._empty()
+        return self._update(*columns)
+
+    def _update(self, *columns: np.ndarray) -> np.ndarray:
+        raise NotImplementedError("This method must be implemented by the subclass. ")
+
+    def _empty(self) -> np.ndarray:
+        return np.empty(0)
+
+    def format(self, values: np.ndarray, index: pd.Index):
+        return pd.Series(values, index=index, name=self.name, copy=False)
+
+    def compute(self, data):
+        """Returns the indicator of `data` like the matching pandas_ta function."""
+        return self.result(self.update(*self.inputs(data)), data)
+
+    def result(self, values: np.ndarray, data):
+        """
+        Formats the indicator values of `data`. The values are computed in
+        float64 and stored in the precision of `data`.
+        """
+        values = values.astype(_precision(data), copy=False)
+        return self.format(values, _index(data, len(values)))
+
+    def state(self) -> np.ndarray:
+        parts = [
+            np.atleast_1d(np.asarray(getattr(self, name), dtype=float)).ravel()
+            for name in self._state
+        ]
+        parts += [getattr(self, child).state() for child in self._children]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def load_state(self, state: np.ndarray) -> int:
+        """Restores a state exported by `state`. Returns the consumed length."""
+        offset = 0
+        for name in self._state:
+            current = getattr(self, name)
+            size = np.size(current)
+            chunk = np.asarray(state[offset : offset + size], dtype=float)
+            if isinstance(current, np.ndarray):
+                setattr(self, name, chunk.copy())
+            else:
+                setattr(self, name, type(current)(chunk[0]))
+            offset += size
+        for child in self._children:
+            offset += getattr(self, child).load_state(state[offset:])
+        return offset
+
+    def copy(self) -> "Incremental":
+        return copy.deepcopy(self)
+
+
+class EMA(Incremental):
+    """pandas_ta `ema`: seeded with the SMA of the first `length` values."""
+
+    _state = ("count", "seed", "last")
+
+    def __init__(self, length: int):
+        self.length = int(length)
+        self.alpha = 2.0 / (self.length + 1)
+        self.count = 0
+        self.seed = 0.0
+        self.last = np.nan
+
+    @property
+    def name(self) -> str:
+        return f"EMA_{self.length}"
+
+    def _update(self, close: np.ndarray) -> np.ndarray:
+        result = np.full(len(close), np.nan)
+        start = 0
+        if self.count < self.length:
+            start = min(self.length - self.count, len(close))
+            self.seed += close[:start].sum()
+            self.count += start
+            if self.count == self.length:
+                self.last = self.seed / self.length
+                result[start - 1] = self.last
+        if start < len(close) and self.count >= self.length:
+            result[start:] = _recursive(
+                self.alpha, 1.0 - self.alpha, close[start:], self.last
+            )
+            self.last = result[-1]
+        return result
+
+
+class RMA(Incremental):
+    """
+    Wilder's moving average of pandas_ta `rma`, i.e.
+    `ewm(alpha=1 / length, min_periods=length).mean()`. Missing values
+    decay the weights like pandas does.
+    """
+
+    _state = ("nobs", "weighted_sum", "weight")
+
+    def __init__(self, length: int):
+        self.length = int(length)
+        self.nobs = 0
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"RMA_{self.length}"
+
+    def _update(self, values: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(values)
+        decay = 1.0 - 1.0 / self.length
+        weighted_sum = _recursive(1.0, decay, np.where(valid, values, 0.0), self.weighted_sum)
+        weight = _recursive(1.0, decay, valid.astype(float), self.weight)
+        nobs = self.nobs + np.cumsum(valid)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = np.where(nobs >= self.length, weighted_sum / weight, np.nan)
+        self.nobs = int(nobs[-1])
+        self.weighted_sum = weighted_sum[-1]
+        self.weight = weight[-1]
+        return result
+
+
+class RollingSum(Incremental):
+    """Sum over the last `length` values, NaN until the window is filled."""
+
+    _state = ("tail",)
+
+    def __init__(self, length: int):
+        self.length = int(length)
+        self.tail = np.full(self.length - 1, np.nan)
+
+    @property
+    def name(self) -> str:
+        return f"SUM_{self.length}"
+
+    def _update(self, values: np.ndarray) -> np.ndarray:
+        window = np.concatenate((self.tail, values))
+        result = np.lib.stride_tricks.sliding_window_view(window, self.length).sum(
+            axis=1
+        )
+        self.tail = window[len(window) - (self.length - 1) :]
+        return result
+
+
+class RSI(Incremental):
+    """pandas_ta `rsi`: Wilder averages of gains and losses."""
+
+    _state = ("prev",)
+    _children = ("positive", "negative")
+
+    def __init__(self, length: int = 14):
+        self.length = int(length)
+        self.prev = np.nan
+        self.positive = RMA(self.length)
+        self.negative = RMA(self.length)
+
+    @property
+    def name(self) -> str:
+        return f"RSI_{self.length}"
+
+    def _update(self, close: np.ndarray) -> np.ndarray:
+        diff = close - _previous(close, self.prev)
+        self.prev = close[-1]
+        positive = self.positive.update(np.maximum(diff, 0.0))
+        negative = self.negative.update(np.minimum(diff, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 100.0 * positive / (positive + np.abs(negative))
+
+
+class MACD(Incremental):
+    """pandas_ta `macd` with the columns MACD, MACDh (histogram) and MACDs (signal)."""
+
+    _children = ("fast_ema", "slow_ema", "signal_ema")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        fast, slow, signal = int(fast), int(slow), int(signal)
+        if slow < fast:
+            fast, slow = slow, fast
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self.fast_ema = EMA(fast)
+        self.slow_ema = EMA(slow)
+        self.signal_ema = EMA(signal)
+
+    @property
+    def name(self) -> str:
+        return f"MACD_{self.fast}_{self.slow}_{self.signal}"
+
+    @property
+    def names(self) -> list[str]:
+        props = f"_{self.fast}_{self.slow}_{self.signal}"
+        return [f"MACD{props}", f"MACDh{props}", f"MACDs{props}"]
+
+    def _empty(self) -> np.ndarray:
+        return np.empty((0, 3))
+
+    def _update(self, close: np.ndarray) -> np.ndarray:
+        macd = self.fast_ema.update(close) - self.slow_ema.update(close)
+        signal = np.full(len(close), np.nan)
+        # the signal line starts at the first valid MACD value
+        valid = ~np.isnan(macd)
+        if valid.any():
+            first = int(np.argmax(valid))
+            signal[first:] = self.signal_ema.update(macd[first:])
+        return np.column_stack((macd, macd - signal, signal))
+
+    def format(self, values: np.ndarray, index: pd.Index):
+        return pd.DataFrame(values, index=index, columns=self.names, copy=False)
+
+
+class ATR(Incremental):
+    """
+    pandas_ta `atr` (Wilder average of the true range). Unlike pandas_ta,
+    no epsilon is added to zero high-low ranges.
+    """
+
+    columns = ("High", "Low", "Close")
+    _state = ("prev",)
+    _children = ("average",)
+
+    def __init__(self, length: int = 14):
+        self.length = int(length)
+        self.prev = np.nan
+        self.average = RMA(self.length)
+
+    @property
+    def name(self) -> str:
+        return f"ATRr_{self.length}"
+
+    def _update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        prev = _previous(close, self.prev)
+        self.prev = close[-1]
+        true_range = np.max(np.abs([high - low, high - prev, prev - low]), axis=0)
+        return self.average.update(true_range)
+
+
+class UO(Incremental):
+    """
+    pandas_ta `uo` (Ultimate Oscillator). `columns` names the data columns
+    used as high, low and close.
+    """
+
+    columns = ("High", "Low", "Close")
+    _state = ("prev",)
+    _children = ("bp_fast", "tr_fast", "bp_medium", "tr_medium", "bp_slow", "tr_slow")
+
+    def __init__(
+        self,
+        fast: int = 7,
+        medium: int = 14,
+        slow: int = 28,
+        fast_w: float = 4.0,
+        medium_w: float = 2.0,
+        slow_w: float = 1.0,
+        columns: tuple = None,
+    ):
+        self.fast, self.medium, self.slow = int(fast), int(medium), int(slow)
+        self.weights = (float(fast_w), float(medium_w), float(slow_w))
+        if columns is not None:
+            self.columns = tuple(columns)
+        self.prev = np.nan
+        self.bp_fast, self.tr_fast = RollingSum(self.fast), RollingSum(self.fast)
+        self.bp_medium, self.tr_medium = RollingSum(self.medium), RollingSum(self.medium)
+        self.bp_slow, self.tr_slow = RollingSum(self.slow), RollingSum(self.slow)
+
+    @property
+    def name(self) -> str:
+        return f"UO_{self.fast}_{self.medium}_{self.slow}"
+
+    def _update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        prev = _previous(close, self.prev)
+        self.prev = close[-1]
+        low_or_prev = np.fmin(low, prev)
+        buying_pressure = close - low_or_prev
+        true_range = np.fmax(high, prev) - low_or_prev
+        fast_w, medium_w, slow_w = self.weights
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted = (
+                fast_w
+                * self.bp_fast.update(buying_pressure)
+                / self.tr_fast.update(true_range)
+                + medium_w
+                * self.bp_medium.update(buying_pressure)
+                / self.tr_medium.update(true_range)
+                + slow_w
+                * self.bp_slow.update(buying_pressure)
+                / self.tr_slow.update(true_range)
+            )
+        return 100.0 * weighted / sum(self.weights)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+from sys import float_info
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.indicators.banks import sma_bank, stdev_bank
+from pystockfilter.indicators.incremental import ATR, EMA, MACD, RMA, RSI, UO, _index, _precision
+
+
+def as_float(values) -> np.ndarray:
+    """Returns `values` as contiguous float64 array, without copying if possible."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def to_series(values: np.ndarray, data, name: str) -> pd.Series:
+    """
+    Wraps kernel output like pandas_ta would return it, without copying
+    unless `data` is float32.
+    """
+    values = np.asarray(values).astype(_precision(data), copy=False)
+    return pd.Series(values, index=_index(data, len(values)), name=name, copy=False)
+
+
+def non_zero_range(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """high - low, shifted by epsilon if any range is zero (as pandas_ta does)."""
+    diff = high - low
+    if (diff == 0).any():
+        diff = diff + float_info.epsilon
+    return diff
+
+
+def sma(close, length: int) -> np.ndarray:
+    """Simple moving average, NaN until `length` values are available."""
+    return sma_bank(close, (length,))[0]
+
+
+def stdev(close, length: int, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation with `ddof` delta degrees of freedom."""
+    return stdev_bank(close, (length,), ddof)[0]
+
+
+def ema(close, length: int) -> np.ndarray:
+    """Exponential moving average seeded with the SMA of the first `length` values."""
+    return EMA(length).update(as_float(close))
+
+
+def rma(close, length: int) -> np.ndarray:
+    """Wilder's moving average."""
+    return RMA(length).update(as_float(close))
+
+
+def rsi(close, length: int = 14) -> np.ndarray:
+    """Relative strength index."""
+    return RSI(length).update(as_float(close))
+
+
+def macd(
+    close, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the MACD line, histogram and signal line."""
+    values = MACD(fast, slow, signal).update(as_float(close))
+    return values[:, 0], values[:, 1], values[:, 2]
+
+
+def bbands(
+    close, length: int = 5, std: float = 2.0, ddof: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the lower, middle and upper band, the bandwidth and the %B."""
+    close = as_float(close)
+    deviations = float(std) * stdev(close, length, ddof)
+    mid = sma(close, length)
+    lower = mid - deviations
+    upper = mid + deviations
+    width = non_zero_range(upper, lower)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bandwidth = 100 * width / mid
+        percent = non_zero_range(close, lower) / width
+    return lower, mid, upper, bandwidth, percent
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range, NaN for the first bar."""
+    high, low, close = as_float(high), as_float(low), as_float(close)
+    prev = np.concatenate(([np.nan], close[:-1]))
+    return np.max(
+        np.abs([non_zero_range(high, low), high - prev, prev - low]), axis=0
+    )
+
+
+def atr(high, low, close, length: int = 14) -> np.ndarray:
+    """Average true range (Wilder)."""
+    return ATR(length).update(as_float(high), as_float(low), as_float(close))
+
+
+def uo(
+    high,
+    low,
+    close,
+    fast: int = 7,
+    medium: int = 14,
+    slow: int = 28,
+    fast_w: float = 4.0,
+    medium_w: float = 2.0,
+    slow_w: float = 1.0,
+) -> np.ndarray:
+    """Ultimate Oscillator."""
+    return UO(fast, medium, slow, fast_w, medium_w, slow_w).update(
+        as_float(high), as_float(low), as_float(close)
+    )
+
+
+def cdl_doji(
+    open_, high, low, close, length: int = 10, factor: float = 10, scalar: float = 100
+) -> np.ndarray:
+    """
+    Doji candles: `scalar` where the body is smaller than `factor` percent of
+    the average high-low range of the last `length` bars, 0 elsewhere.
+    """
+    open_, high, low, close = (as_float(x) for x in (open_, high, low, close))
+    body = np.abs(non_zero_range(close, open_))
+    average_range = sma(np.abs(non_zero_range(high, low)), length)
+    with np.errstate(invalid="ignore"):
+        doji = body < 0.01 * factor * average_range
+    return scalar * doji.astype(float)
@@ -1,19 +1,31 @@
 from enum import Enum
-from pystockfilter.strategy.base_strategy import BaseStrategy
-from pystockfilter.strategy.doji_rsi_strategy import DojiRsiStrategy
-from pystockfilter.strategy.uo_strategy import UltimateStrategy
-from pystockfilter.strategy.uo_ema_cross_ema_strategy import UltimateEmaCrossEmaStrategy
-from pystockfilter.strategy.uo_ema_cross_close_strategy import UltimateEmaCrossCloseStrategy
-from pystockfilter.strategy.ema_cross_close_strategy import EmaCrossCloseStrategy
-from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
-from pystockfilter.strategy.ema_cross_sma_strategy import EmaCrossSmaStrategy
-from pystockfilter.strategy.rsi_strategy import RSIStrategy
-from pystockfilter.strategy.sma_cross_sma_strategy import SmaCrossSmaStrategy
-from pystockfilter.strategy.sma_cross_close_strategy import SmaCrossCloseStrategy
-from pystockfilter.strategy.atr_strategy import ATRStrategy
-from pystockfilter.strategy.macd_strategy import MACDStrategy
-from pystockfilter.strategy.moving_average_rsi_strategy import MovingAverageRSIStrategy
-from pystockfilter.strategy.bollinger_volume_strategy import BollingerVolumeStrategy
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pystockfilter.strategy.base_strategy import BaseStrategy
+
+# Strategy modules are imported on first use (see `strategy_from_name` and
+# `__getattr__`), so importing the package stays cheap.
+_MODULES = {
+    "BaseStrategy": "base_strategy",
+    "DojiRsiStrategy": "doji_rsi_strategy",
+    "UltimateStrategy": "uo_strategy",
+    "UltimateEmaCrossEmaStrategy": "uo_ema_cross_ema_strategy",
+    "UltimateEmaCrossCloseStrategy": "uo_ema_cross_close_strategy",
+    "EmaCrossCloseStrategy": "ema_cross_close_strategy",
+    "EmaCrossEmaStrategy": "ema_cross_ema_strategy",
+    "EmaCrossSmaStrategy": "ema_cross_sma_strategy",
+    "RSIStrategy": "rsi_strategy",
+    "SmaCrossSmaStrategy": "sma_cross_sma_strategy",
+    "SmaCrossCloseStrategy": "sma_cross_close_strategy",
+    "ATRStrategy": "atr_strategy",
+    "MACDStrategy": "macd_strategy",
+    "MovingAverageRSIStrategy": "moving_average_rsi_strategy",
+    "BollingerVolumeStrategy": "bollinger_volume_strategy",
+    "EnsembleStrategy": "ensemble_strategy",
+}
+
 
 class StrategyName(Enum):
     ECCS = "eccs"
@@ -31,23 +43,41 @@ class StrategyName(Enum):
     UO = "uo"
     DOJI_RSI = "doji_rsi"
 
-def strategy_from_name(strategy_name: StrategyName) -> BaseStrategy:
-    strategy_map = {
-        StrategyName.ECCS: EmaCrossCloseStrategy,
-        StrategyName.ECES: EmaCrossEmaStrategy,
-        StrategyName.ECSS: EmaCrossSmaStrategy,
-        StrategyName.RSIS: RSIStrategy,
-        StrategyName.SCSS: SmaCrossSmaStrategy,
-        StrategyName.SCCS: SmaCrossCloseStrategy,
-        StrategyName.UECCS: UltimateEmaCrossCloseStrategy,
-        StrategyName.UECES: UltimateEmaCrossEmaStrategy,
-        StrategyName.UO: UltimateStrategy,
-        StrategyName.ATR: ATRStrategy,
-        StrategyName.MACD: MACDStrategy,
-        StrategyName.MARSI: MovingAverageRSIStrategy,
-        StrategyName.BVS: BollingerVolumeStrategy,
-        StrategyName.DOJI_RSI: DojiRsiStrategy,
-    }
-    strategy = strategy_map.get(strategy_name)
-    assert strategy is not None, f"Strategy {strategy_name} not found"
-    return strategy
+
+_STRATEGY_MAP = {
+    StrategyName.ECCS: "EmaCrossCloseStrategy",
+    StrategyName.ECES: "EmaCrossEmaStrategy",
+    StrategyName.ECSS: "EmaCrossSmaStrategy",
+    StrategyName.RSIS: "RSIStrategy",
+    StrategyName.SCSS: "SmaCrossSmaStrategy",
+    StrategyName.SCCS: "SmaCrossCloseStrategy",
+    StrategyName.UECCS: "UltimateEmaCrossCloseStrategy",
+    StrategyName.UECES: "UltimateEmaCrossEmaStrategy",
+    StrategyName.UO: "UltimateStrategy",
+    StrategyName.ATR: "ATRStrategy",
+    StrategyName.MACD: "MACDStrategy",
+    StrategyName.MARSI: "MovingAverageRSIStrategy",
+    StrategyName.BVS: "BollingerVolumeStrategy",
+    StrategyName.DOJI_RSI: "DojiRsiStrategy",
+}
+
+
+def _load(class_name: str):
+    module = import_module(f"{__name__}.{_MODULES[class_name]}")
+    return getattr(module, class_name)
+
+
+def strategy_from_name(strategy_name: StrategyName) -> "BaseStrategy":
+    class_name = _STRATEGY_MAP.get(strategy_name)
+    assert class_name is not None, f"Strategy {strategy_name} not found"
+    return _load(class_name)
+
+
+def __getattr__(name: str):
+    if name in _MODULES:
+        return _load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_MODULES])
@@ -7,11 +7,12 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
 import pandas as pd
 
+from pystockfilter.indicators import ATR
+from pystockfilter.indicators.graph import Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-from pystockfilter.backtesting.lib import gt
+from pystockfilter.strategy.signals import gt
 
 
 class ATRStrategy(BaseStrategy):
@@ -20,21 +21,20 @@ class ATRStrategy(BaseStrategy):
     para_atr_exit = 1.0  # Threshold for exiting position based on ATR
     caching = True
 
+    @staticmethod
+    def _indicator(para_atr_window: int):
+        return ATR(para_atr_window)
+
     @staticmethod
     def _algo(data: pd.DataFrame, para_atr_window: int):
         # Calculate ATR based on the window parameter
-        atr = ta.atr(
-            high=pd.Series(data.High),
-            low=pd.Series(data.Low),
-            close=pd.Series(data.Close),
-            length=para_atr_window,
-        )
+        atr = ATRStrategy._indicator(para_atr_window).compute(data)
         return atr
 
     def init(self):
         plot = not ATRStrategy.caching
         # Get close prices and ATR signals
-        self.close = self.I(lambda x: x.Close, self.data, plot=plot)
+        self.close = self.indicator(Column("Close"), plot=plot)
         self.atr_enter = self.I(
             ATRStrategy.algo_threshold,
             self.para_atr_enter,
@@ -50,7 +50,7 @@ class ATRStrategy(BaseStrategy):
             plot=plot,
         )
         self.atr = self.I(
-            ATRStrategy._algo,
+            ATRStrategy.algo,
             self.data,
             self.para_atr_window,
             name=f"ATR({self.para_atr_window})",
@@ -59,8 +59,16 @@ class ATRStrategy(BaseStrategy):
 
         # Set up the buy and sell signals based on ATR crossover thresholds
         super().setup(
-            buy_signal=lambda: gt(self.atr, self.atr_enter),
-            sell_signal=lambda: gt(self.atr_exit, self.atr),
+            buy_signal=gt(self.atr, self.atr_enter),
+            sell_signal=gt(self.atr_exit, self.atr),
+        )
+
+    @classmethod
+    def _prepare(cls, data, **grid) -> int:
+        lengths = cls._grid_values(grid, "para_atr_window")
+        # no bank for the recursive ATR: one computation per length
+        return ATRStrategy.seed_cache(
+            data, {(length,): ATRStrategy._algo(data, length) for length in lengths}
         )
 
     @staticmethod
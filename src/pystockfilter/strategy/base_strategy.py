@@ -7,20 +7,29 @@
   can be found in the LICENSE file.
 """
 
-from collections import OrderedDict
+from contextlib import contextmanager
 from enum import Enum
-from functools import wraps
-import uuid
-import zlib
 
 
 import pandas as pd
 from pystockfilter.backtesting import Strategy
-from pandas.util import hash_pandas_object
+from pystockfilter.backtesting.streaming import active_stream
+from pystockfilter.cache import (
+    CacheStats,
+    DiskArrayStore,
+    IndicatorCache,
+    SharedArrayStore,
+    TieredStore,
+)
+from pystockfilter.indicators.graph import Column, IndicatorGraph, Node
+from pystockfilter.strategy.signals import PrecomputedSignal
 
 from pystockfilter import logger
 
 
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+
 class Signals(Enum):
     BUY = 1
     SELL = 2
@@ -28,10 +37,13 @@ class Signals(Enum):
 
 
 class BaseStrategy(Strategy):
-    # Define cache size and storage
-    _cache_max_size = 100  # Set max size as needed
-    _cache = OrderedDict()
+    # Define cache storage, bounded by bytes (see IndicatorCache.max_bytes)
+    _cache_max_size = None  # optional entry limit per strategy
+    _cache = IndicatorCache()
     caching = True
+    # Creates the stateful indicator (see pystockfilter.indicators) computing
+    # `_algo` from its parameters. Enables incremental extension of the cache.
+    _indicator = None
 
     @staticmethod
     def _threshold(threshold: int, length: int):
@@ -49,64 +61,177 @@ class BaseStrategy(Strategy):
     @classmethod
     def algo(cls, *args, **kwargs):
         """General-purpose method to run and cache subclass-specific _algo methods."""
-        func = cls._algo if not cls.caching else cls.cache(cls._algo)
+        stream = active_stream()
+        if stream is not None:
+            # streaming backtest: blocks are not cached, stateful indicators
+            # continue from the previous block
+            if cls._indicator is not None:
+                return stream.compute(
+                    cls._cache_namespace(), cls._algo, cls._indicator, args, kwargs
+                )
+            return cls._algo(*args, **kwargs)
+        func = cls._algo if not cls.caching else cls.cache(cls._algo, cls._indicator)
         result = func(*args, **kwargs)
         return result
 
     @classmethod
-    def cache(cls, func):
+    def cache(cls, func, indicator=None):
         """Decorator to cache the results of the function based on its arguments."""
+        return cls._cache.cached(
+            cls._cache_namespace(), func, cls._cache_max_size, indicator
+        )
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Generate a unique cache key based on the function's arguments
-            # only take take tow rows at the beginning and two last rows of df to reduce hash caluclation time
-            # Directly select the first two and last two rows without appending or concatenation
-            if isinstance(args[0], pd.Series):
-                sample_data = (
-                    args[0].iloc[:2].values.tobytes()
-                    + args[0].iloc[-2:].values.tobytes()
-                )
-                data_hash = zlib.crc32(sample_data)
-            elif isinstance(args[0], pd.DataFrame):
-                close = args[0].get("Close", args[0].iloc[:, :1])
-                sample_data = (
-                    close.iloc[:2].values.tobytes() + close.iloc[-2:].values.tobytes()
-                )
-                data_hash = zlib.crc32(sample_data)
-            else:
-                # Use a random UUID for non-pandas arguments
-                data_hash = uuid.uuid4().int
-            cache_key = (func.__name__, data_hash, *args[1:], frozenset(kwargs.items()))
+    @classmethod
+    def _cache_namespace(cls) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
 
-            # Check if result is cached
-            if cache_key in cls._cache:
-                # Move accessed item to end to mark it as recently used
-                cls._cache.move_to_end(cache_key)
-                return cls._cache[cache_key]
+    @classmethod
+    def prepare(cls, data: pd.DataFrame, **grid) -> int:
+        """
+        Precomputes the indicators of an optimization grid (parameter name
+        -> values) on `data` and seeds the indicator cache with them.
+        `Backtest.optimize` calls it once before starting the workers.
+        Returns the number of seeded indicators, 0 if `caching` is off.
+        """
+        if not cls.caching:
+            return 0
+        return cls._prepare(data, **grid)
 
-            # Call the function and cache the result
-            result = func(*args, **kwargs)
-            cls._cache[cache_key] = result
-            cls._cache.move_to_end(cache_key)
+    @classmethod
+    def _prepare(cls, data: pd.DataFrame, **grid) -> int:
+        """Subclass-specific `prepare`, called only if `caching` is on."""
+        return 0
 
-            # Enforce cache size limit
-            if len(cls._cache) > cls._cache_max_size:
-                cls._cache.popitem(last=False)  # Remove the oldest item
+    @classmethod
+    def _grid_values(cls, grid: dict, *names: str) -> list:
+        """Sorted union of the grid values of `names`, or of their defaults."""
+        values = set()
+        for name in names:
+            if name in grid:
+                values.update(grid[name])
+            elif hasattr(cls, name):
+                values.add(getattr(cls, name))
+        return sorted(value for value in values if value > 0)
 
-            return result
+    @classmethod
+    def seed_cache(cls, data, results: dict, func=None) -> int:
+        """
+        Caches `results[params]` as the result of `cls.algo(data, *params)`,
+        or of `func(data, *params)` wrapped by `cls.cache`.
+        """
+        if not cls.caching:
+            return 0
+        for params, result in results.items():
+            cls._cache.seed(
+                cls._cache_namespace(),
+                func if func is not None else cls._algo,
+                (data, *params),
+                result,
+                cls._cache_max_size,
+            )
+        return len(results)
 
-        return wrapper
+    @classmethod
+    def cache_stats(cls) -> CacheStats:
+        """Returns the indicator cache counters of this strategy."""
+        return cls._cache.stats(cls._cache_namespace())
+
+    @classmethod
+    @contextmanager
+    def shared_cache(cls, directory: str = None, max_bytes: int = 512 * 1024**2):
+        """
+        Shares computed indicators between processes (e.g. the forked
+        workers of `Backtest.optimize`) through a memory-mapped store.
+        """
+        store = SharedArrayStore(directory, max_bytes)
+        previous = cls._cache.store
+        cls._cache.store = store if previous is None else TieredStore(store, previous)
+        try:
+            yield store
+        finally:
+            cls._cache.store = previous
+            store.close()
+
+    @staticmethod
+    def enable_disk_cache(
+        directory: str = None, max_bytes: int = 2 * 1024**3
+    ) -> DiskArrayStore:
+        """
+        Persists the computed indicators of all strategies on disk, so later
+        processes map them instead of recomputing them. See `DiskArrayStore`.
+        An active store (e.g. of `shared_cache`) is kept in front of it.
+        """
+        BaseStrategy.disable_disk_cache()
+        store = DiskArrayStore(directory, max_bytes)
+        previous = BaseStrategy._cache.store
+        BaseStrategy._cache.store = (
+            store if previous is None else TieredStore(previous, store)
+        )
+        return store
+
+    @staticmethod
+    def disable_disk_cache():
+        """Removes the stores of `enable_disk_cache`, keeping the others."""
+
+        def without_disk(store):
+            if isinstance(store, DiskArrayStore):
+                return None
+            if not isinstance(store, TieredStore):
+                return store
+            stores = [without_disk(tier) for tier in store.stores]
+            stores = [tier for tier in stores if tier is not None]
+            if len(stores) > 1:
+                return TieredStore(*stores)
+            return stores[0] if stores else None
+
+        BaseStrategy._cache.store = without_disk(BaseStrategy._cache.store)
 
     @staticmethod
     def get_optimizer_parameters() -> dict:
         raise NotImplementedError("This method must be implemented by the subclass. ")
 
+    def indicator(self, node: Node, **kwargs):
+        """
+        Declares the indicator `node` (see `pystockfilter.indicators.graph`)
+        like `I` does with a function. Identical nodes of this strategy,
+        e.g. the close column declared by a strategy and its subclass, are
+        computed and registered once; columns share the buffers of `data`.
+        `kwargs` are passed to `I`.
+        """
+        self._indicator_graph()
+        key = self._graph.add(node)
+        if key not in self._graph_indicators:
+            if isinstance(node, Column):
+                # price columns overlay the candlesticks, skip the heuristic
+                kwargs.setdefault("overlay", node.name in PRICE_COLUMNS)
+            kwargs.setdefault("name", node.label)
+            self._graph_indicators[key] = self.I(self._graph.evaluate, key, **kwargs)
+        return self._graph_indicators[key]
+
+    def _indicator_graph(self) -> IndicatorGraph:
+        """Returns the indicator graph of `data`, a new one for new data."""
+        if "_graph" not in self.__dict__ or self._graph.data is not self.data:
+            self._graph = IndicatorGraph(self.data)
+            self._graph_indicators = {}
+        return self._graph
+
     def setup(self, sell_signal, buy_signal):
-        self.sell_signal = sell_signal
-        self.buy_signal = buy_signal
-        self.bought = False
-        self.profit = 0
+        """
+        Sets the sell and buy signals. A signal is either a boolean array
+        with the value of every bar (see `pystockfilter.strategy.signals`),
+        computed once, or a callable evaluated at every bar.
+        """
+        self.sell_signal = self._signal(sell_signal)
+        self.buy_signal = self._signal(buy_signal)
+        if "bought" not in self.__dict__:
+            # kept across the blocks of a `StreamingBacktest`
+            self.bought = False
+            self.profit = 0
+
+    def _signal(self, signal):
+        if callable(signal):
+            return signal
+        return PrecomputedSignal(signal, self.data)
 
     @property
     def name(self):
@@ -7,11 +7,18 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
-import pandas as pd
+import numpy as np
 
+from pystockfilter.indicators import (
+    as_float,
+    sma,
+    sma_bank,
+    stdev,
+    stdev_bank,
+)
+from pystockfilter.indicators.graph import Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-from pystockfilter.backtesting.lib import crossover
+from pystockfilter.strategy.signals import crossover, gt
 
 
 class BollingerVolumeStrategy(BaseStrategy):
@@ -22,34 +29,28 @@ class BollingerVolumeStrategy(BaseStrategy):
     caching = True
 
     @staticmethod
-    def _algo(
-        data: pd.DataFrame,
-        para_bb_window: int,
-        para_bb_std_dev: float,
-        para_volume_window: float,
-    ):
-        # Calculate Bollinger Bands
-        para_bb_std_dev = float(para_bb_std_dev)
-        bbands_df = ta.bbands(
-            pd.Series(data.Close), length=para_bb_window, std=para_bb_std_dev
-        )
-        upper = bbands_df[f"BBU_{para_bb_window}_{para_bb_std_dev}"]
-        middle = bbands_df[f"BBM_{para_bb_window}_{para_bb_std_dev}"]
-        lower = bbands_df[f"BBL_{para_bb_window}_{para_bb_std_dev}"]
-        vol = pd.Series(data.Volume)
-        volume_ma = vol.rolling(window=para_volume_window).mean()
-        return lower, middle, upper, volume_ma, vol
+    def _bands(close, para_bb_window: int):
+        """Middle band and population standard deviation, shared by all std devs."""
+        return sma(close, para_bb_window), stdev(close, para_bb_window, ddof=0)
+
+    @staticmethod
+    def _volume_ma(volume, para_volume_window: int):
+        return sma(volume, para_volume_window)
+
+    @classmethod
+    def _compute(cls, func, *args):
+        return (func if not cls.caching else cls.cache(func))(*args)
 
     def init(self):
         plot = not BollingerVolumeStrategy.caching
         # Define and plot Bollinger Bands and Volume
-        self.close = self.I(lambda x: x.Close, self.data, plot=plot)
-        low, mid, up, vol_ma, vol = BollingerVolumeStrategy._algo(
-            self.data,
-            self.para_bb_window,
-            self.para_bb_std_dev,
-            self.para_volume_window,
+        self.close = self.indicator(Column("Close"), plot=plot)
+        # Only the bands depend on the std dev; mean and std are cached per window
+        mid, std = BollingerVolumeStrategy._compute(
+            BollingerVolumeStrategy._bands, self.data.Close, self.para_bb_window
         )
+        deviations = float(self.para_bb_std_dev) * std
+        low, up = mid - deviations, mid + deviations
         # Bollinger Bands
         self.bb_lower, self.bb_middle, self.bb_upper = self.I(
             lambda x: (x[0], x[1], x[2]),
@@ -59,6 +60,12 @@ class BollingerVolumeStrategy(BaseStrategy):
         )
         if self.para_volume_window > 0:
             # Volume and Volume Moving Average
+            vol = as_float(self.data.Volume)
+            vol_ma = BollingerVolumeStrategy._compute(
+                BollingerVolumeStrategy._volume_ma,
+                self.data.Volume,
+                self.para_volume_window,
+            )
             self.volume, self.volume_ma = self.I(
                 lambda x: (x[0], x[1]),
                 (vol, vol_ma),
@@ -67,17 +74,31 @@ class BollingerVolumeStrategy(BaseStrategy):
             )
 
         # Set up the buy and sell signals based on Bollinger Bands reversal and volume confirmation
-        super().setup(
-            buy_signal=lambda: crossover(self.close, self.bb_lower)
-            and (
-                self.para_volume_window == 0
-                or (self.volume > self.volume_ma * self.para_volume_multiplier)
-            ),
-            sell_signal=lambda: crossover(self.close, self.bb_upper)
-            and (
-                self.para_volume_window == 0
-                or (self.volume > self.volume_ma * self.para_volume_multiplier)
-            ),
+        buy_signal = crossover(self.close, self.bb_lower)
+        sell_signal = crossover(self.close, self.bb_upper)
+        if self.para_volume_window != 0:
+            high_volume = gt(self.volume, self.volume_ma * self.para_volume_multiplier)
+            buy_signal &= high_volume
+            sell_signal &= high_volume
+        super().setup(buy_signal=buy_signal, sell_signal=sell_signal)
+
+    @classmethod
+    def _prepare(cls, data, **grid) -> int:
+        close, volume = np.asarray(data.Close), np.asarray(data.Volume)
+        bb_windows = cls._grid_values(grid, "para_bb_window")
+        volume_windows = cls._grid_values(grid, "para_volume_window")
+        bands = zip(
+            bb_windows, sma_bank(close, bb_windows), stdev_bank(close, bb_windows, 0)
+        )
+        volume_mas = zip(volume_windows, sma_bank(volume, volume_windows))
+        return BollingerVolumeStrategy.seed_cache(
+            close,
+            {(window,): (mid, std) for window, mid, std in bands},
+            BollingerVolumeStrategy._bands,
+        ) + BollingerVolumeStrategy.seed_cache(
+            volume,
+            {(window,): volume_ma for window, volume_ma in volume_mas},
+            BollingerVolumeStrategy._volume_ma,
         )
 
     @staticmethod
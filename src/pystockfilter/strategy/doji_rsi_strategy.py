@@ -7,9 +7,10 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
+import numpy as np
 import pandas as pd
 
+from pystockfilter.indicators import as_float, cdl_doji, rsi
 from pystockfilter.strategy.base_strategy import BaseStrategy
 
 
@@ -27,13 +28,16 @@ class DojiRsiStrategy(BaseStrategy):
             overlay=False,
         )
 
-        # Store last Doji index for confirmation
-        self.last_doji_index = None
-
-        super().setup(
-            buy_signal=self.buy_condition,
-            sell_signal=self.sell_condition,
+        # next() is called from the first bar with all indicators available
+        # (see Backtest.run); earlier Doji candles are never seen
+        start = 1 + max(
+            np.isnan(np.asarray(x, dtype=float)).argmin()
+            for x in (self.doji, self.rsi, self.close)
+        )
+        buy_signal, sell_signal = DojiRsiStrategy._signals(
+            self.doji, self.rsi, self.close, self.para_confirmation_threshold, start
         )
+        super().setup(buy_signal=buy_signal, sell_signal=sell_signal)
 
     @staticmethod
     def _algo(
@@ -45,87 +49,53 @@ class DojiRsiStrategy(BaseStrategy):
         - RSI
         - Close prices (passed through directly for convenience)
         """
-        # Extract OHLC data from the DataFrame
-        open_ = pd.Series(data.Open)
-        high = pd.Series(data.High)
-        low = pd.Series(data.Low)
-        close = pd.Series(data.Close)
+        close = as_float(data.Close)
 
         # Doji pattern detection
-        doji = ta.cdl_doji(open_, high, low, close)
-
-        # RSI calculation
-        rsi = ta.rsi(close, para_rsi_period)
+        doji = cdl_doji(data.Open, data.High, data.Low, close)
 
-        # Return the calculated indicators in a dictionary
-        return doji, rsi, close
+        # Return the calculated indicators
+        return doji, rsi(close, para_rsi_period), close
 
-    def is_divergence(self, current_price, current_rsi, previous_price, previous_rsi):
+    @staticmethod
+    def is_divergence(current_price, current_rsi, previous_price, previous_rsi):
         """
         Detect divergence: Price and RSI moving in opposite directions.
         A bullish divergence occurs when the price is making lower lows but RSI makes higher lows.
         A bearish divergence occurs when the price is making higher highs but RSI makes lower highs.
+        Works element-wise on arrays.
         """
-        if previous_price is None or previous_rsi is None:
-            return False
-
         # Bullish divergence: price makes lower low, RSI makes higher low
-        if current_price < previous_price and current_rsi > previous_rsi:
-            return True
-
+        bullish = (current_price < previous_price) & (current_rsi > previous_rsi)
         # Bearish divergence: price makes higher high, RSI makes lower high
-        if current_price > previous_price and current_rsi < previous_rsi:
-            return True
-
-        return False
-
-    def buy_condition(self):
-        # Buy when a Doji forms, there is a bullish divergence with RSI, and the next candle confirms the reversal (i.e., bullish).
-        if self.doji != 0:
-            self.last_doji_index = len(self.close) - 1
-            return False
-
-        if self.last_doji_index is not None:
-            previous_close = self.close[self.last_doji_index]
-            previous_rsi = self.rsi[self.last_doji_index]
-            current_close = self.close
-            current_rsi = self.rsi
+        bearish = (current_price > previous_price) & (current_rsi < previous_rsi)
+        return bullish | bearish
 
-            # Check for bullish divergence
-            if self.is_divergence(
-                current_close, current_rsi, previous_close, previous_rsi
-            ):
-                # Wait for confirmation: the current close must be higher than the Doji close
-                if current_close > previous_close * (
-                    1 + self.para_confirmation_threshold / 100
-                ):
-                    return True
-
-        return False
-
-    def sell_condition(self):
-        # Sell when a Doji forms, there is a bearish divergence with RSI, and the next candle confirms the reversal (i.e., bearish).
-        if self.doji != 0:
-            self.last_doji_index = len(self.close) - 1
-            return False
-
-        if self.last_doji_index is not None:
-            previous_close = self.close[self.last_doji_index]
-            previous_rsi = self.rsi[self.last_doji_index]
-            current_close = self.close
-            current_rsi = self.rsi
-
-            # Check for bearish divergence
-            if self.is_divergence(
-                current_close, current_rsi, previous_close, previous_rsi
-            ):
-                # Wait for confirmation: the current close must be lower than the Doji close
-                if current_close < previous_close * (
-                    1 - self.para_confirmation_threshold / 100
-                ):
-                    return True
-
-        return False
+    @staticmethod
+    def _signals(doji, rsi, close, para_confirmation_threshold: float, start: int = 0):
+        """
+        Returns the buy and sell signals of all bars. Each bar is compared
+        with the last Doji candle since `start`:
+        - buy on a divergence confirmed by a close above the Doji close
+        - sell on a divergence confirmed by a close below the Doji close
+        Doji bars themselves never signal.
+        """
+        doji, rsi, close = (np.asarray(x, dtype=float) for x in (doji, rsi, close))
+        bars = np.arange(len(close))
+        is_doji = (doji != 0) & (bars >= start)
+        # index of the last Doji up to each bar (forward filled), -1 before
+        last_doji = np.maximum.accumulate(np.where(is_doji, bars, -1))
+        after_doji = (last_doji >= 0) & ~is_doji
+        previous_close = close[np.maximum(last_doji, 0)]
+        previous_rsi = rsi[np.maximum(last_doji, 0)]
+        with np.errstate(invalid="ignore"):
+            divergence = after_doji & DojiRsiStrategy.is_divergence(
+                close, rsi, previous_close, previous_rsi
+            )
+            confirmation = para_confirmation_threshold / 100
+            buy = divergence & (close > previous_close * (1 + confirmation))
+            sell = divergence & (close < previous_close * (1 - confirmation))
+        return buy, sell
 
     @staticmethod
     def get_optimizer_parameters() -> dict:
@@ -7,37 +7,49 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
-import pandas as pd
+import numpy as np
 
+from pystockfilter.indicators import EMA
+from pystockfilter.indicators.graph import Call, Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-
-from pystockfilter.backtesting.lib import cross, crossover
+from pystockfilter.strategy.signals import cross, crossover
 
 
 class EmaCrossCloseStrategy(BaseStrategy):
     para_ema_short = 14
 
     def init(self):
-        self.ema_short = self.I(
-            EmaCrossCloseStrategy.algo,
-            self.data.Close,
-            self.para_ema_short,
+        self.ema_short = self.indicator(
+            Call(EmaCrossCloseStrategy.algo, Column("Close"), self.para_ema_short),
             overlay=True,
             name=f"EMA({self.para_ema_short})",
         )
-        self.close = self.I(lambda x: x.Close, self.data)
+        self.close = self.indicator(Column("Close"))
 
         super().setup(
-            buy_signal=lambda: crossover(self.close, self.ema_short),
-            sell_signal=lambda: cross(self.ema_short, self.close),
+            buy_signal=crossover(self.close, self.ema_short),
+            sell_signal=cross(self.ema_short, self.close),
         )
 
+    @staticmethod
+    def _indicator(para_ema_short: int):
+        return EMA(para_ema_short)
+
     @staticmethod
     def _algo(data, para_ema_short: int):
-        ema = ta.ema(pd.Series(data), para_ema_short)
+        ema = EmaCrossCloseStrategy._indicator(para_ema_short).compute(data)
         return ema
 
+    @classmethod
+    def _prepare(cls, data, **grid) -> int:
+        lengths = cls._grid_values(grid, "para_ema_short", "para_ema_long")
+        close = np.asarray(data.Close)
+        # no bank for the recursive EMA: one computation per length
+        return EmaCrossCloseStrategy.seed_cache(
+            close,
+            {(length,): EmaCrossCloseStrategy._algo(close, length) for length in lengths},
+        )
+
     @staticmethod
     def get_optimizer_parameters() -> dict:
         def constraint(p):
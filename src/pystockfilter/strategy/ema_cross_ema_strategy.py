@@ -7,8 +7,9 @@
   can be found in the LICENSE file.
 """
 
+from pystockfilter.indicators.graph import Call, Column
 from pystockfilter.strategy.ema_cross_close_strategy import EmaCrossCloseStrategy
-from pystockfilter.backtesting.lib import crossover, cross
+from pystockfilter.strategy.signals import crossover, cross
 
 
 class EmaCrossEmaStrategy(EmaCrossCloseStrategy):
@@ -16,16 +17,14 @@ class EmaCrossEmaStrategy(EmaCrossCloseStrategy):
 
     def init(self):
         super().init()
-        self.ema_long = self.I(
-            EmaCrossCloseStrategy.algo,
-            self.data.Close,
-            self.para_ema_long,
+        self.ema_long = self.indicator(
+            Call(EmaCrossCloseStrategy.algo, Column("Close"), self.para_ema_long),
             overlay=True,
             name=f"EMA({self.para_ema_long})",
         )
         super().setup(
-            buy_signal=lambda: crossover(self.ema_long, self.ema_short),
-            sell_signal=lambda: cross(self.ema_short, self.ema_long),
+            buy_signal=crossover(self.ema_long, self.ema_short),
+            sell_signal=cross(self.ema_short, self.ema_long),
         )
 
     @staticmethod
@@ -6,9 +6,10 @@
   Use of this source code is governed by an MIT-style license that
   can be found in the LICENSE file.
 """
+from pystockfilter.indicators.graph import Call, Column
 from pystockfilter.strategy.ema_cross_close_strategy import EmaCrossCloseStrategy
 from pystockfilter.strategy.sma_cross_sma_strategy import SmaCrossSmaStrategy
-from pystockfilter.backtesting.lib import crossover, cross
+from pystockfilter.strategy.signals import crossover, cross
 
 
 class EmaCrossSmaStrategy(EmaCrossCloseStrategy):
@@ -16,16 +17,14 @@ class EmaCrossSmaStrategy(EmaCrossCloseStrategy):
 
     def init(self):
         super().init()
-        self.sma_short = self.I(
-            SmaCrossSmaStrategy.algo,
-            self.data.Close,
-            self.para_sma_short,
+        self.sma_short = self.indicator(
+            Call(SmaCrossSmaStrategy.algo, Column("Close"), self.para_sma_short),
             overlay=True,
             name=f"SMA({self.para_sma_short})",
         )
         super().setup(
-            buy_signal=lambda: crossover(self.sma_short, self.ema_short),
-            sell_signal=lambda: cross(self.ema_short, self.sma_short),
+            buy_signal=crossover(self.sma_short, self.ema_short),
+            sell_signal=cross(self.ema_short, self.sma_short),
         )
 
     @staticmethod
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+from enum import Enum
+
+import numpy as np
+
+from pystockfilter.backtesting._util import _Indicator
+from pystockfilter.cache.fingerprint import fingerprint
+from pystockfilter.strategy.base_strategy import BaseStrategy
+from pystockfilter.strategy.signals import PrecomputedSignal
+
+
+class Rule(Enum):
+    AND = "and"
+    OR = "or"
+    MAJORITY = "majority"
+
+
+class EnsembleStrategy(BaseStrategy):
+    """
+    Combines the buy and sell signals of member strategies with a `Rule`:
+    all members (AND), any member (OR) or more than half of them (MAJORITY).
+
+    Create ensembles with `EnsembleStrategy.of`. The members run on the same
+    data and share the indicator graph of the ensemble (see
+    `BaseStrategy.indicator`) and the indicator cache, so an indicator used
+    by several members (e.g. the EMAs of `EmaCrossEmaStrategy` and
+    `UltimateEmaCrossEmaStrategy`) is computed and registered once, with
+    caching on or off. Parameters with the same name are shared by all
+    members.
+    """
+
+    members: tuple = ()
+    rule: Rule = Rule.AND
+
+    @classmethod
+    def of(cls, *members, rule=Rule.AND, name: str = None) -> type:
+        """Returns an ensemble class of the `members` strategy classes."""
+        attributes = {"members": tuple(members), "rule": Rule(rule)}
+        for member in members:
+            for key in dir(member):
+                if key.startswith("para_"):
+                    attributes.setdefault(key, getattr(member, key))
+        if name is None:
+            name = "".join(member.__name__ for member in members) + "Ensemble"
+        return type(name, (cls,), attributes)
+
+    def init(self):
+        self.member_strategies = []
+        # (member, attribute of the member, attribute of the ensemble)
+        self._member_bindings = []
+        graph = self._indicator_graph()
+        registered = set()
+        for number, member in enumerate(self.members):
+            parameters = {
+                key: getattr(self, key) for key in dir(member) if key.startswith("para_")
+            }
+            strategy = member(self._broker, self._data, parameters)
+            strategy._graph, strategy._graph_indicators = graph, self._graph_indicators
+            strategy.init()
+            self.member_strategies.append(strategy)
+            # indicators declared with `I` by several members are registered once
+            for indicator in strategy._indicators:
+                key = (repr(indicator.name), fingerprint(np.asarray(indicator)))
+                if key not in registered:
+                    registered.add(key)
+                    self._indicators.append(indicator)
+            # Backtest.run warms up and slices the indicators of the ensemble
+            for attr, indicator in list(vars(strategy).items()):
+                if isinstance(indicator, _Indicator):
+                    name = f"_member{number}_{attr}"
+                    setattr(self, name, indicator)
+                    self._member_bindings.append((strategy, attr, name))
+        self.setup(
+            buy_signal=self._combine([s.buy_signal for s in self.member_strategies]),
+            sell_signal=self._combine([s.sell_signal for s in self.member_strategies]),
+        )
+
+    def _bind_members(self):
+        """Passes the indicators of the members, sliced to the current bar, back."""
+        for strategy, attr, name in self._member_bindings:
+            setattr(strategy, attr, getattr(self, name))
+
+    def next(self):
+        self._bind_members()
+        super().next()
+
+    def status(self):
+        self._bind_members()
+        return super().status()
+
+    def _vote(self, votes):
+        if self.rule is Rule.AND:
+            return np.all(votes, axis=0)
+        if self.rule is Rule.OR:
+            return np.any(votes, axis=0)
+        return 2 * np.sum(votes, axis=0) > len(self.members)
+
+    def _combine(self, signals: list):
+        if all(isinstance(signal, PrecomputedSignal) for signal in signals):
+            return self._vote([signal.values for signal in signals])
+
+        # members with per-bar signals see their indicators up to the current
+        # bar, rebound by `next`
+        def signal():
+            return bool(self._vote([bool(member()) for member in signals]))
+
+        return signal
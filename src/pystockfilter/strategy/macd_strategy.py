@@ -8,11 +8,11 @@
 """
 
 import pandas as pd
-import pandas_ta as ta
 
+from pystockfilter.indicators import MACD
+from pystockfilter.indicators.graph import Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-
-from pystockfilter.backtesting.lib import crossover
+from pystockfilter.strategy.signals import crossover
 
 
 class MACDStrategy(BaseStrategy):
@@ -21,17 +21,23 @@ class MACDStrategy(BaseStrategy):
     para_macd_signal = 9
     caching = True
 
+    @staticmethod
+    def _indicator(para_macd_fast: int, para_macd_slow: int, para_macd_signal: int):
+        return MACD(para_macd_fast, para_macd_slow, para_macd_signal)
+
     @staticmethod
     def _algo(
         data: pd.Series, para_macd_fast: int, para_macd_slow: int, para_macd_signal: int
     ):
-        macd = ta.macd(data, para_macd_fast, para_macd_slow, para_macd_signal)
+        macd = MACDStrategy._indicator(
+            para_macd_fast, para_macd_slow, para_macd_signal
+        ).compute(data)
         return macd
 
     def init(self):
         plot = not MACDStrategy.caching
         # create thresholds for buy and sell signals
-        self.close = self.I(lambda x: x.Close, self.data, plot=plot)
+        self.close = self.indicator(Column("Close"), plot=plot)
         self.macd_line, self.macd_histogram, self.macd_signal = self.I(
             MACDStrategy.algo,
             pd.Series(self.data.Close),
@@ -45,10 +51,10 @@ class MACDStrategy(BaseStrategy):
 
         # Define buy and sell signals based on MACD crossover
         self.setup(
-            buy_signal=lambda: crossover(
+            buy_signal=crossover(
                 self.macd_line, self.macd_signal
             ),  # MACD crosses above Signal line
-            sell_signal=lambda: crossover(
+            sell_signal=crossover(
                 self.macd_signal, self.macd_line
             ),  # MACD crosses below Signal line
         )
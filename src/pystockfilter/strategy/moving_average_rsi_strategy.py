@@ -7,11 +7,14 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
 import pandas as pd
 
+from pystockfilter.indicators import as_float
+from pystockfilter.indicators.graph import Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-from pystockfilter.backtesting.lib import crossover
+from pystockfilter.strategy.rsi_strategy import RSIStrategy
+from pystockfilter.strategy.sma_cross_close_strategy import SmaCrossCloseStrategy
+from pystockfilter.strategy.signals import crossover, gt
 
 
 class MovingAverageRSIStrategy(BaseStrategy):
@@ -23,16 +26,18 @@ class MovingAverageRSIStrategy(BaseStrategy):
 
     @staticmethod
     def _algo(data: pd.DataFrame, short_window: int, long_window: int, rsi_window: int):
-        # Calculate short, long moving averages and rsi
-        short_ma = ta.sma(pd.Series(data.Close), length=short_window)
-        long_ma = ta.sma(pd.Series(data.Close), length=long_window)
-        rsi = ta.rsi(pd.Series(data.Close), length=rsi_window)
-        return short_ma, long_ma, rsi
+        # Calculate short, long moving averages and rsi with the cached
+        # indicators of SmaCrossCloseStrategy and RSIStrategy (shared with them)
+        close = data.Close
+        short_ma = SmaCrossCloseStrategy.algo(close, short_window)
+        long_ma = SmaCrossCloseStrategy.algo(close, long_window)
+        rsi = RSIStrategy.algo(pd.Series(close), rsi_window)
+        return as_float(short_ma), as_float(long_ma), as_float(rsi)
 
     def init(self):
         plot = not MovingAverageRSIStrategy.caching
         # Get close prices and MA/RSI signals
-        self.close = self.I(lambda x: x.Close, self.data, plot=plot)
+        self.close = self.indicator(Column("Close"), plot=plot)
 
         self.short_ma, self.long_ma, self.rsi = self.I(
             MovingAverageRSIStrategy._algo,
@@ -45,12 +50,13 @@ class MovingAverageRSIStrategy(BaseStrategy):
         )
 
         # Set up the buy and sell signals based on MA crossover and RSI confirmation
-        super().setup(
-            buy_signal=lambda: crossover(self.short_ma, self.long_ma)
-            and (self.para_rsi_window == 0 or (self.rsi[-1] > self.para_rsi_threshold)),
-            sell_signal=lambda: crossover(self.long_ma, self.short_ma)
-            or (self.para_rsi_window == 0 and (self.rsi[-1] < self.para_rsi_threshold)),
-        )
+        buy_signal = crossover(self.short_ma, self.long_ma)
+        sell_signal = crossover(self.long_ma, self.short_ma)
+        if self.para_rsi_window == 0:
+            sell_signal |= gt(self.para_rsi_threshold, self.rsi)
+        else:
+            buy_signal &= gt(self.rsi, self.para_rsi_threshold)
+        super().setup(buy_signal=buy_signal, sell_signal=sell_signal)
 
     @staticmethod
     def get_optimizer_parameters() -> dict:
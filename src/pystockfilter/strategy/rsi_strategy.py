@@ -7,12 +7,13 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
+import numpy as np
 import pandas as pd
 
+from pystockfilter.indicators import RSI
+from pystockfilter.indicators.graph import Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-
-from pystockfilter.backtesting.lib import crossover
+from pystockfilter.strategy.signals import crossover
 
 
 class RSIStrategy(BaseStrategy):
@@ -21,15 +22,19 @@ class RSIStrategy(BaseStrategy):
     para_rsi_exit = 55
     caching = True
 
+    @staticmethod
+    def _indicator(para_rsi_window: int):
+        return RSI(para_rsi_window)
+
     @staticmethod
     def _algo(data: pd.Series, para_rsi_window: int):
-        rsi = ta.rsi(data, para_rsi_window)
+        rsi = RSIStrategy._indicator(para_rsi_window).compute(data)
         return rsi
 
     def init(self):
         plot = not RSIStrategy.caching
         # create thresholds for buy and sell signals
-        self.close = self.I(lambda x: x.Close, self.data, plot=plot)
+        self.close = self.indicator(Column("Close"), plot=plot)
         self.rsi_enter = self.I(
             RSIStrategy.algo_threshold,
             self.para_rsi_enter,
@@ -55,8 +60,17 @@ class RSIStrategy(BaseStrategy):
             plot=plot,
         )
         self.setup(
-            sell_signal=lambda: crossover(self.rsi, self.rsi_exit),
-            buy_signal=lambda: crossover(self.rsi_enter, self.rsi),
+            sell_signal=crossover(self.rsi, self.rsi_exit),
+            buy_signal=crossover(self.rsi_enter, self.rsi),
+        )
+
+    @classmethod
+    def _prepare(cls, data, **grid) -> int:
+        lengths = cls._grid_values(grid, "para_rsi_window")
+        close = pd.Series(np.asarray(data.Close))
+        # no bank for the recursive RSI: one computation per length
+        return RSIStrategy.seed_cache(
+            close, {(length,): RSIStrategy._algo(close, length) for length in lengths}
         )
 
     @staticmethod
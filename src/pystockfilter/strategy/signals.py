@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+
+  Vectorized counterparts of `crossover`, `cross` and `gt` from
+  `pystockfilter.backtesting.lib`. They take whole indicator arrays (or
+  numbers) and return boolean arrays with the value of every bar, so a
+  signal like
+
+      crossover(self.close, self.bb_lower) & (self.volume > self.volume_ma * 1.2)
+
+  is computed once in `init` and `BaseStrategy.setup` only looks up the
+  current bar in `next`.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _values(series) -> np.ndarray:
+    if isinstance(series, pd.Series):
+        series = series.values
+    return np.asarray(series, dtype=float)
+
+
+def crossover(series1, series2) -> np.ndarray:
+    """`True` at bars where `series1` just crossed over (above) `series2`."""
+    series1, series2 = np.broadcast_arrays(_values(series1), _values(series2))
+    result = np.zeros(series1.shape, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        result[1:] = (series1[:-1] < series2[:-1]) & (series1[1:] > series2[1:])
+    return result
+
+
+def cross(series1, series2) -> np.ndarray:
+    """`True` at bars where `series1` and `series2` just crossed each other."""
+    return crossover(series1, series2) | crossover(series2, series1)
+
+
+def gt(series1, series2) -> np.ndarray:
+    """`True` at bars where `series1` is greater than `series2`."""
+    with np.errstate(invalid="ignore"):
+        return np.asarray(_values(series1) > _values(series2))
+
+
+class PrecomputedSignal:
+    """
+    Callable returning the value of a precomputed signal array at the
+    current bar of `data`.
+    """
+
+    __slots__ = ("values", "data")
+
+    def __init__(self, values, data):
+        values = np.asarray(values, dtype=bool)
+        if values.ndim != 1 or len(values) != len(data):
+            raise ValueError(
+                f"Signal of shape {values.shape} does not match {len(data)} bars"
+            )
+        self.values = values
+        self.data = data
+
+    def __call__(self) -> bool:
+        return self.values[len(self.data) - 1]
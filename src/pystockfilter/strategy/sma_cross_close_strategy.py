@@ -7,35 +7,46 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
+import numpy as np
 import pandas as pd
 
+from pystockfilter.indicators import sma, sma_bank, to_series
+from pystockfilter.indicators.graph import Call, Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-
-from pystockfilter.backtesting.lib import crossover, cross
+from pystockfilter.strategy.signals import crossover, cross
 
 
 class SmaCrossCloseStrategy(BaseStrategy):
     para_sma_short = 14
 
     def init(self):
-        self.sma_short = self.I(
-            SmaCrossCloseStrategy.algo,
-            self.data.Close,
-            self.para_sma_short,
+        self.sma_short = self.indicator(
+            Call(SmaCrossCloseStrategy.algo, Column("Close"), self.para_sma_short),
             overlay=True,
             name=f"SMA({self.para_sma_short})",
         )
-        self.close = self.I(lambda x: x.Close, self.data)
+        self.close = self.indicator(Column("Close"))
         self.setup(
-            buy_signal=lambda: crossover(self.close, self.sma_short),
-            sell_signal=lambda: cross(self.close, self.sma_short),
+            buy_signal=crossover(self.close, self.sma_short),
+            sell_signal=cross(self.close, self.sma_short),
         )
 
     @staticmethod
     def _algo(data: pd.Series, para_sma_short: int):
-        sma = ta.sma(pd.Series(data), para_sma_short)
-        return sma
+        return to_series(sma(data, para_sma_short), data, f"SMA_{para_sma_short}")
+
+    @classmethod
+    def _prepare(cls, data, **grid) -> int:
+        lengths = cls._grid_values(grid, "para_sma_short", "para_sma_long")
+        close = np.asarray(data.Close)
+        bank = sma_bank(close, lengths)
+        return SmaCrossCloseStrategy.seed_cache(
+            close,
+            {
+                (length,): to_series(row, close, f"SMA_{length}")
+                for length, row in zip(lengths, bank)
+            },
+        )
 
     @staticmethod
     def get_optimizer_parameters() -> dict:
@@ -6,9 +6,9 @@
   Use of this source code is governed by an MIT-style license that
   can be found in the LICENSE file.
 """
+from pystockfilter.indicators.graph import Call, Column
 from pystockfilter.strategy.sma_cross_close_strategy import SmaCrossCloseStrategy
-
-from pystockfilter.backtesting.lib import crossover, cross
+from pystockfilter.strategy.signals import crossover, cross
 
 
 class SmaCrossSmaStrategy(SmaCrossCloseStrategy):
@@ -16,16 +16,14 @@ class SmaCrossSmaStrategy(SmaCrossCloseStrategy):
 
     def init(self):
         super().init()
-        self.sma_long = self.I(
-            SmaCrossSmaStrategy.algo,
-            self.data.Close,
-            self.para_sma_long,
+        self.sma_long = self.indicator(
+            Call(SmaCrossSmaStrategy.algo, Column("Close"), self.para_sma_long),
             overlay=True,
             name=f"SMA({self.para_sma_long})",
         )
         self.setup(
-            buy_signal=lambda: crossover(self.sma_long, self.sma_short),
-            sell_signal=lambda: cross(self.sma_short, self.sma_long),
+            buy_signal=crossover(self.sma_long, self.sma_short),
+            sell_signal=cross(self.sma_short, self.sma_long),
         )
 
     @staticmethod
@@ -8,10 +8,10 @@
 """
 
 
+from pystockfilter.indicators.graph import Call, Column
 from pystockfilter.strategy.ema_cross_close_strategy import EmaCrossCloseStrategy
 from pystockfilter.strategy.uo_strategy import UltimateStrategy
-
-from pystockfilter.backtesting.lib import crossover, cross
+from pystockfilter.strategy.signals import crossover, cross, gt
 
 
 class UltimateEmaCrossCloseStrategy(UltimateStrategy):
@@ -21,22 +21,16 @@ class UltimateEmaCrossCloseStrategy(UltimateStrategy):
         super().init()
         self.ema_short = None
         if self.para_ema_short > 0:
-            self.ema_short = self.I(
-                EmaCrossCloseStrategy.algo,
-                self.data.Close,
-                self.para_ema_short,
+            self.ema_short = self.indicator(
+                Call(EmaCrossCloseStrategy.algo, Column("Close"), self.para_ema_short),
                 overlay=True,
                 name=f"EMA({self.para_ema_short})",
             )
-        self.close = self.I(lambda x: x.Close, self.data)
-
-        self.setup(
-            buy_signal=lambda: (
-                self.ema_short is None or crossover(self.close, self.ema_short)
-            )
-            and self.uo > self.uo_upper,
-            sell_signal=lambda: (
-                self.ema_short is None or cross(self.close, self.ema_short)
-            )
-            and self.uo_lower > self.uo,
-        )
+        self.close = self.indicator(Column("Close"))
+
+        buy_signal = gt(self.uo, self.uo_upper)
+        sell_signal = gt(self.uo_lower, self.uo)
+        if self.ema_short is not None:
+            buy_signal &= crossover(self.close, self.ema_short)
+            sell_signal &= cross(self.close, self.ema_short)
+        self.setup(buy_signal=buy_signal, sell_signal=sell_signal)
@@ -7,12 +7,10 @@
   can be found in the LICENSE file.
 """
 
-import pandas_ta as ta
-import pandas as pd
-
+from pystockfilter.indicators import UO
+from pystockfilter.indicators.graph import Column
 from pystockfilter.strategy.base_strategy import BaseStrategy
-
-from pystockfilter.backtesting.lib import crossover
+from pystockfilter.strategy.signals import crossover
 
 
 class UltimateStrategy(BaseStrategy):
@@ -23,21 +21,23 @@ class UltimateStrategy(BaseStrategy):
     para_uo_lower = 30
 
     @staticmethod
-    def _algo(data, para_uo_short: int, para_uo_medium: int, para_uo_long: int):
-        close = pd.Series(data.Close)
-        high = pd.Series(data.High)
-        low = pd.Series(data.Low)
-        ultimate = ta.uo(
-            close,
-            high,
-            low,
+    def _indicator(para_uo_short: int, para_uo_medium: int, para_uo_long: int):
+        # same column order and weights as the former ta.uo(close, high, low, ...)
+        return UO(
             para_uo_short,
             para_uo_medium,
             para_uo_long,
             para_uo_short,
             para_uo_medium,
             para_uo_long,
+            columns=("Close", "High", "Low"),
         )
+
+    @staticmethod
+    def _algo(data, para_uo_short: int, para_uo_medium: int, para_uo_long: int):
+        ultimate = UltimateStrategy._indicator(
+            para_uo_short, para_uo_medium, para_uo_long
+        ).compute(data)
         return ultimate
 
     def init(self):
@@ -50,7 +50,7 @@ class UltimateStrategy(BaseStrategy):
             name=f"UO({self.para_uo_short}, {self.para_uo_medium}, {self.para_uo_long})",
             overlay=True,
         )
-        self.close = self.I(lambda x: x.Close, self.data)
+        self.close = self.indicator(Column("Close"))
         # create thresholds for buy and sell signals
         self.uo_upper = self.I(
             UltimateStrategy.algo_threshold,
@@ -67,8 +67,8 @@ class UltimateStrategy(BaseStrategy):
             overlay=True,
         )
         self.setup(
-            sell_signal=lambda: crossover(self.uo, self.uo_upper),
-            buy_signal=lambda: crossover(self.uo_lower, self.uo),
+            sell_signal=crossover(self.uo, self.uo_upper),
+            buy_signal=crossover(self.uo_lower, self.uo),
         )
 
     @staticmethod
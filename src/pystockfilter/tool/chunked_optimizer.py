@@ -7,7 +7,7 @@
   can be found in the LICENSE file.
 """
 from datetime import datetime
-from pystockfilter.backtesting import Backtest
+from pystockfilter.backtesting import Backtest, PreparedData
 
 from pystockfilter.strategy.base_strategy import BaseStrategy
 from pystockfilter.tool.start_base import StartBase
@@ -95,10 +95,12 @@ class ChunkedOptimizer:
 
         # The rest of the method remains the same
         best_result = None
+        # validated and converted once for all validation backtests
+        data = PreparedData(self.data) if results else None
         for best_param in results:
             self.strategy.set_parameters(self.strategy, best_param)
             bt = Backtest(
-                self.data,
+                data,
                 self.strategy,
                 cash=self.cash,
                 commission=self.commission,
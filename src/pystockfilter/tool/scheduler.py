@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+""" pystockfilter
+
+  Copyright 2024 Slash Gordon
+
+  Use of this source code is governed by an MIT-style license that
+  can be found in the LICENSE file.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.strategy.base_strategy import BaseStrategy
+from pystockfilter import logger
+
+
+@dataclass
+class OptimizationJob:
+    """A single (strategy, symbol) unit of work of a `StartBase` run."""
+
+    strategy: BaseStrategy
+    symbol: str
+    parameter: Union[dict, list[dict]]
+    data: pd.DataFrame
+
+    @property
+    def grid_size(self) -> int:
+        return JobScheduler.grid_size(self.parameter)
+
+    @property
+    def bars(self) -> int:
+        return len(self.data)
+
+    @property
+    def cost(self) -> int:
+        return self.grid_size * self.bars
+
+
+class JobScheduler:
+    """
+    Orders and budgets the jobs of a `StartBase` run.
+
+    The cost of a job is estimated as grid size × bar count. Jobs are
+    executed longest-first (LPT), which keeps the huge jobs from ending
+    up at the tail of the run. The seconds per cost unit are measured
+    from finished jobs and used to shrink the search of any job that
+    would exceed its budget: moderately oversized grids are sampled
+    randomly, heavily oversized grids are switched to skopt.
+
+    Args:
+        job_budget (float): Maximum seconds per job, or None.
+        total_budget (float): Maximum seconds for the whole run, or None.
+        seconds_per_unit (float): Initial estimate of seconds per
+            (parameter combination × bar). Refined after every job.
+        min_tries (int): Lower bound of evaluations for a shrunk search.
+        skopt_threshold (float): Use skopt instead of a sampled grid when
+            less than this fraction of the grid fits into the budget.
+    """
+
+    def __init__(
+        self,
+        job_budget: float = None,
+        total_budget: float = None,
+        seconds_per_unit: float = None,
+        min_tries: int = 10,
+        skopt_threshold: float = 0.1,
+    ):
+        self.job_budget = job_budget
+        self.total_budget = total_budget
+        self.seconds_per_unit = seconds_per_unit
+        self.min_tries = min_tries
+        self.skopt_threshold = skopt_threshold
+        self._measured_seconds = 0.0
+        self._measured_units = 0
+        self._start_time: Optional[datetime] = None
+
+    @staticmethod
+    def grid_size(parameter: Union[dict, list[dict]]) -> int:
+        """
+        Returns the number of parameter combinations of an optimizer argument.
+        Sequential optimizer arguments (lists of dicts) add up their stages.
+        Plain backtest parameters count as a single combination.
+        """
+        if isinstance(parameter, list):
+            return sum(JobScheduler.grid_size(stage) for stage in parameter)
+        size = int(
+            np.prod(
+                [
+                    len(value) if isinstance(value, (list, tuple, range)) else 1
+                    for key, value in parameter.items()
+                    if key.startswith("para_")
+                ]
+            )
+        )
+        max_tries = parameter.get("max_tries")
+        if max_tries is not None:
+            size = (
+                max(1, int(size * max_tries))
+                if 0 < max_tries <= 1
+                else min(size, int(max_tries))
+            )
+        return size
+
+    def plan(self, jobs: list[OptimizationJob]) -> list[OptimizationJob]:
+        """Returns the jobs ordered longest-first."""
+        return sorted(jobs, key=lambda job: job.cost, reverse=True)
+
+    def start(self):
+        self._start_time = datetime.now()
+
+    @property
+    def elapsed(self) -> float:
+        if self._start_time is None:
+            return 0.0
+        return (datetime.now() - self._start_time).total_seconds()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.total_budget is not None and self.elapsed >= self.total_budget
+
+    @property
+    def estimated_seconds_per_unit(self) -> Optional[float]:
+        if self._measured_units:
+            return self._measured_seconds / self._measured_units
+        return self.seconds_per_unit
+
+    def budget_for(self, job: OptimizationJob, remaining_cost: int) -> Optional[float]:
+        """
+        Returns the time budget of a job in seconds. Under a global budget,
+        the remaining time is shared by the remaining jobs in proportion to
+        their cost, so the tail of the run gets its fair share.
+        """
+        budgets = []
+        if self.job_budget is not None:
+            budgets.append(self.job_budget)
+        if self.total_budget is not None:
+            remaining_time = max(0.0, self.total_budget - self.elapsed)
+            budgets.append(remaining_time * job.cost / max(1, remaining_cost))
+        return min(budgets) if budgets else None
+
+    def fit(self, job: OptimizationJob, budget: Optional[float]):
+        """Returns the job's parameter, shrunk to fit into `budget` seconds."""
+        if isinstance(job.parameter, list):
+            total = max(1, job.grid_size)
+            return [
+                self._fit_stage(
+                    stage,
+                    job.bars,
+                    None if budget is None else budget * self.grid_size(stage) / total,
+                )
+                for stage in job.parameter
+            ]
+        return self._fit_stage(job.parameter, job.bars, budget)
+
+    def _fit_stage(self, parameter: dict, bars: int, budget: Optional[float]) -> dict:
+        seconds_per_unit = self.estimated_seconds_per_unit
+        size = self.grid_size(parameter)
+        if budget is None or not seconds_per_unit or size <= 1:
+            return parameter
+        if size * bars * seconds_per_unit <= budget:
+            return parameter
+        tries = max(self.min_tries, int(budget / (bars * seconds_per_unit)))
+        if tries >= size:
+            return parameter
+        method = "skopt" if tries / size < self.skopt_threshold else "grid"
+        logger.info(
+            f"Shrinking search from {size} to {tries} evaluations ({method}) "
+            f"to fit into {budget:.1f}s"
+        )
+        return {**parameter, "method": method, "max_tries": tries}
+
+    def record(self, job: OptimizationJob, parameter, seconds: float):
+        """Feeds the measured run time of a job back into the estimate."""
+        units = self.grid_size(parameter) * job.bars
+        if units > 0:
+            self._measured_seconds += seconds
+            self._measured_units += units
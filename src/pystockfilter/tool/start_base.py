@@ -6,15 +6,21 @@
   Use of this source code is governed by an MIT-style license that
   can be found in the LICENSE file.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 from pystockfilter.backtesting import Backtest
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 from pystockfilter.data import StockDataSource
+from pystockfilter.data.async_source import AsyncDataSource
 from pystockfilter.strategy.base_strategy import BaseStrategy
 from pystockfilter.tool.helper import my_now
 from pystockfilter import logger
 from pystockfilter.tool.result import BacktestResult, BacktestResultList
+from pystockfilter.tool.scheduler import JobScheduler, OptimizationJob
 
 
 class StartBase:
@@ -29,46 +35,199 @@ class StartBase:
         self.parameters: list[dict] = parameters
         self.ticker_symbols: list[str] = ticker_symbols
         self.data_source = data_source
+        # (history_months, symbol -> data) loaded by `load_universe`
+        self._universe = None
+
+    def load_universe(self, history_months: int) -> dict[str, pd.DataFrame]:
+        """
+        Loads the data of all ticker symbols in one step (see
+        `StockDataSource.get_many`). `get_data` serves them until
+        `release_universe` is called.
+        """
+        now = my_now()
+        before = now + relativedelta(months=-history_months)
+        frames = self.data_source.get_many(self.ticker_symbols, before, now)
+        self._universe = (history_months, frames)
+        return frames
+
+    def release_universe(self):
+        """Drops the data loaded by `load_universe`."""
+        self._universe = None
+
+    @contextmanager
+    def universe(self, history_months: int):
+        """Loads the universe (see `load_universe`) for the duration of a run."""
+        try:
+            yield self.load_universe(history_months)
+        finally:
+            self.release_universe()
 
     def get_data(self, symbol: str, history_months: int) -> pd.DataFrame:
+        if self._universe is not None and self._universe[0] == history_months:
+            df = self._universe[1].get(symbol)
+            if df is not None:
+                return df
         now = my_now()
         before = now + relativedelta(months=-history_months)
         df = self.data_source.get_stock_data(symbol, before, now)
         return df
 
     def run(
-        self, commission=0.002, cash=10000.0, history_months=6
+        self,
+        commission=0.002,
+        cash=10000.0,
+        history_months=6,
+        scheduler: JobScheduler = None,
+        prefetch: int = 0,
     ) -> BacktestResultList:
+        """
+        Runs all strategies on all ticker symbols. The data of all symbols
+        is loaded in one step, or, if `prefetch` > 0, fetched ahead of the
+        backtests by a pipeline (see `run_pipelined`).
+        """
         if self.parameters and len(self.strategies) != len(self.parameters):
             raise RuntimeError()
+        if scheduler is not None:
+            return self.run_scheduled(scheduler, commission, cash, history_months)
+        if prefetch > 0:
+            return self.run_pipelined(commission, cash, history_months, prefetch)
         backtest_results = BacktestResultList()
-        for idx, strategy in enumerate(self.strategies):
-            for symbol in self.ticker_symbols:
+        with self.universe(history_months):
+            for idx, strategy in enumerate(self.strategies):
+                for symbol in self.ticker_symbols:
+                    logger.debug(f"Processing {symbol}")
+                    df = self.get_data(symbol, history_months)
+                    # check if the dataframe is empty
+                    if df.empty:
+                        logger.warning(f"Empty dataframe for {symbol}")
+                        continue
+                    backtest_results.extend(
+                        self.run_job(strategy, symbol, df, commission, cash, idx)
+                    )
+        return backtest_results
+
+    def run_job(
+        self,
+        strategy: BaseStrategy,
+        symbol: str,
+        df: pd.DataFrame,
+        commission: float,
+        cash: float,
+        idx: int,
+    ) -> list[BacktestResult]:
+        """Runs `strategy` (the `idx`th) on `symbol` and returns its results."""
+        parameter = self.parameters[idx]
+        # add time measurement
+        start_time = datetime.now()
+        result = self.run_implementation(
+            strategy, symbol, df, commission, cash, parameter
+        )
+        elapsed_time = datetime.now() - start_time
+        if result is None:
+            logger.warning(f"Empty result for {symbol}")
+            return []
+        elif isinstance(
+            result, tuple
+        ):  # if the result is a tuple, we have an overall result and a last result
+            last_result, overall_result = result
+            return [last_result, overall_result]
+        result.time_taken = elapsed_time.total_seconds()
+        return [result]
+
+    def run_pipelined(
+        self,
+        commission=0.002,
+        cash=10000.0,
+        history_months=6,
+        prefetch=4,
+    ) -> BacktestResultList:
+        """
+        Like `run`, but symbol by symbol: all strategies run on a symbol while
+        the data of the next `prefetch` symbols is fetched (see
+        `AsyncDataSource.prefetch`). Results are returned in the order of
+        `run`. Called from a running event loop (e.g. in Jupyter), the
+        pipeline runs on its own event loop in a separate thread.
+        """
+        now = my_now()
+        before = now + relativedelta(months=-history_months)
+        results = {}
+
+        async def pipeline(data_source: AsyncDataSource):
+            symbols = data_source.prefetch(self.ticker_symbols, before, now, prefetch)
+            async for symbol, df in symbols:
                 logger.debug(f"Processing {symbol}")
-                parameter = self.parameters[idx]
+                if df.empty:
+                    logger.warning(f"Empty dataframe for {symbol}")
+                    continue
+                for idx, strategy in enumerate(self.strategies):
+                    results[idx, symbol] = self.run_job(
+                        strategy, symbol, df, commission, cash, idx
+                    )
+
+        with AsyncDataSource(self.data_source, max_workers=prefetch) as data_source:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(pipeline(data_source))
+            else:
+                # asyncio.run refuses to nest in a running loop
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    executor.submit(asyncio.run, pipeline(data_source)).result()
+        backtest_results = BacktestResultList()
+        for idx in range(len(self.strategies)):
+            for symbol in self.ticker_symbols:
+                backtest_results.extend(results.pop((idx, symbol), []))
+        return backtest_results
+
+    def run_scheduled(
+        self,
+        scheduler: JobScheduler,
+        commission=0.002,
+        cash=10000.0,
+        history_months=6,
+    ) -> BacktestResultList:
+        """
+        Runs all (strategy, symbol) jobs in the order and within the budgets
+        given by `scheduler`. Results are returned in execution order.
+        """
+        jobs = []
+        with self.universe(history_months):
+            for symbol in self.ticker_symbols:
                 df = self.get_data(symbol, history_months)
-                # check if the dataframe is empty
                 if df.empty:
                     logger.warning(f"Empty dataframe for {symbol}")
                     continue
-                # add time measurement
-                start_time = datetime.now()
-                result = self.run_implementation(
-                    strategy, symbol, df, commission, cash, parameter
+                for idx, strategy in enumerate(self.strategies):
+                    jobs.append(
+                        OptimizationJob(strategy, symbol, self.parameters[idx], df)
+                    )
+        backtest_results = BacktestResultList()
+        remaining_cost = sum(job.cost for job in jobs)
+        scheduler.start()
+        for job in scheduler.plan(jobs):
+            if scheduler.exhausted:
+                logger.warning(
+                    f"Time budget exhausted. Skipping {job.strategy.__name__} for {job.symbol}"
                 )
-                elapsed_time = datetime.now() - start_time
-                if result is None:
-                    logger.warning(f"Empty result for {symbol}")
-                    continue
-                elif isinstance(
-                    result, tuple
-                ):  # if the result is a tuple, we have an overall result and a last result
-                    last_result, overall_result = result
-                    backtest_results.append(last_result)
-                    backtest_results.append(overall_result)
-                else:
-                    result.time_taken = elapsed_time.total_seconds()
-                    backtest_results.append(result)
+                continue
+            parameter = scheduler.fit(
+                job, scheduler.budget_for(job, remaining_cost)
+            )
+            remaining_cost -= job.cost
+            start_time = datetime.now()
+            result = self.run_implementation(
+                job.strategy, job.symbol, job.data, commission, cash, parameter
+            )
+            elapsed_time = (datetime.now() - start_time).total_seconds()
+            scheduler.record(job, parameter, elapsed_time)
+            if result is None:
+                logger.warning(f"Empty result for {job.symbol}")
+                continue
+            elif isinstance(result, tuple):
+                backtest_results.extend(result)
+            else:
+                result.time_taken = elapsed_time
+                backtest_results.append(result)
         return backtest_results
 
     def run_implementation(
@@ -176,17 +176,17 @@ class StartBatchOptimizer(StartBase):
             raise RuntimeError("Mismatch between strategies and parameters.")
 
         backtest_results = BacktestResultList()
+        with self.universe(history_months):
+            for idx, strategy in enumerate(self.strategies):
+                logger.info(f"Starting optimization for strategy {strategy.__name__}")
 
-        for idx, strategy in enumerate(self.strategies):
-            logger.info(f"Starting optimization for strategy {strategy.__name__}")
+                # Run optimization for each strategy
+                result = self.run_strategy(idx, strategy, commission, cash, history_months)
 
-            # Run optimization for each strategy
-            result = self.run_strategy(idx, strategy, commission, cash, history_months)
-
-            # Collect and log the optimized result
-            backtest_results.append(result)
-            logger.info(
-                f"Optimization completed for strategy {strategy.__name__} with SQN: {result.sqn}"
-            )
+                # Collect and log the optimized result
+                backtest_results.append(result)
+                logger.info(
+                    f"Optimization completed for strategy {strategy.__name__} with SQN: {result.sqn}"
+                )
 
         return backtest_results
@@ -6,6 +6,7 @@
   Use of this source code is governed by an MIT-style license that
   can be found in the LICENSE file.
 """
+from contextlib import nullcontext
 from datetime import datetime
 from pystockfilter.backtesting import Backtest
 import pandas as pd
@@ -23,9 +24,12 @@ class StartOptimizer(StartBase):
         strategies: list[BaseStrategy],
         optimizer_parameters: list[dict],
         data_source: StockDataSource,
+        shared_cache: bool = False,
     ):
 
         super().__init__(ticker_symbols, strategies, optimizer_parameters, data_source)
+        # share indicators between the optimizer workers
+        self.shared_cache = shared_cache
 
     def run_implementation(
         self,
@@ -47,6 +51,7 @@ class StartOptimizer(StartBase):
             exclusive_orders=True,
         )
         start_time = datetime.now()
-        result = bt.optimize(**parameter)
+        with strategy.shared_cache() if self.shared_cache else nullcontext():
+            result = bt.optimize(**parameter)
         time_taken = (datetime.now() - start_time).total_seconds()
         return BacktestResult.from_stats_pd(symbol, result, bt, time_taken)
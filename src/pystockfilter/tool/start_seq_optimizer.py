@@ -7,7 +7,7 @@
   can be found in the LICENSE file.
 """
 from datetime import datetime
-from pystockfilter.backtesting import Backtest
+from pystockfilter.backtesting import Backtest, PreparedData
 import pandas as pd
 from pystockfilter.data import StockDataSource
 from pystockfilter.strategy.base_strategy import BaseStrategy
@@ -43,13 +43,15 @@ class StartSequentialOptimizer(StartBase):
         previous_result: BacktestResult = None
         best_parameters: dict = {}
         start_time = datetime.now()
+        # validated and converted once for all stages
+        data = PreparedData(df)
         for parameter in parameters:
             if len(best_parameters) > 0:
                 # Use parameters from the previous optimization result
                 strategy.set_parameters(strategy, best_parameters)
             # Initialize and run backtest
             bt = Backtest(
-                df,
+                data,
                 strategy,
                 commission=commission,
                 cash=cash,
@@ -34,6 +34,12 @@ def apple_data():
     return data
 
 
+@pytest.fixture
+def dated_data(apple_data):
+    data = apple_data.set_index(pd.to_datetime(apple_data.Date, utc=True))
+    return data.drop(columns="Date")
+
+
 @pytest.fixture
 def microsoft_data():
     test_dir = os.path.dirname(os.path.abspath(__file__))
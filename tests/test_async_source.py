@@ -0,0 +1,93 @@
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+
+from pystockfilter.data.async_source import AsyncDataSource
+from pystockfilter.data.stock_data_source import DataSourceModule as Data
+from pystockfilter.strategy import StrategyName, strategy_from_name
+from pystockfilter.tool.start_backtest import StartBacktest
+
+SYMBOLS = ["AAPL", "MSFT", "GOOG", "AMZN"]
+
+
+class SlowSource:
+    """Sync source with a fixed latency, recording the fetch order and starts."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.fetched = []
+        self.started = {}
+
+    def get_stock_data(self, symbol, start, end):
+        self.started[symbol] = time.perf_counter()
+        time.sleep(self.latency)
+        self.fetched.append(symbol)
+        return pd.DataFrame({"Close": [1.0]}, index=[symbol])
+
+
+class AsyncSource:
+    async def get_stock_data(self, symbol, start, end):
+        await asyncio.sleep(0.01)
+        return pd.DataFrame({"Close": [1.0]}, index=[symbol])
+
+
+def consume(data_source, depth, work=0.0, finished=None):
+    async def run():
+        symbols = []
+        async for symbol, df in data_source.prefetch(SYMBOLS, None, None, depth):
+            assert list(df.index) == [symbol]
+            symbols.append(symbol)
+            time.sleep(work)  # compute blocks the event loop
+            if finished is not None:
+                finished[symbol] = time.perf_counter()
+        return symbols
+
+    return asyncio.run(run())
+
+
+def test_prefetch_overlaps_fetching_with_compute():
+    source = SlowSource(0.05)
+    finished = {}
+    with AsyncDataSource(source, max_workers=1) as data_source:
+        assert consume(data_source, depth=1, work=0.05, finished=finished) == SYMBOLS
+    # the next symbol is fetched while the consumer works on the current one
+    for current, following in zip(SYMBOLS, SYMBOLS[1:]):
+        assert source.started[following] < finished[current]
+
+
+def test_pipelined_run_inside_event_loop():
+    data = Data(source=Data.LOCAL, options={"STOCK_DATA_PATH": "tests/test_data"})
+    bt = StartBacktest(SYMBOLS, [strategy_from_name(StrategyName.RSIS)], [{}], data)
+
+    async def notebook_cell():
+        return bt.run(prefetch=2, history_months=120)
+
+    with patch(
+        "pystockfilter.tool.start_base.my_now", return_value=datetime(2019, 7, 30)
+    ):
+        assert len(asyncio.run(notebook_cell())) == len(SYMBOLS)
+
+
+def test_prefetch_keeps_order_and_supports_coroutines():
+    with AsyncDataSource(SlowSource(0.0), max_workers=4) as data_source:
+        assert consume(data_source, depth=3) == SYMBOLS
+    with AsyncDataSource(AsyncSource()) as data_source:
+        assert consume(data_source, depth=2) == SYMBOLS
+
+
+@patch("pystockfilter.tool.start_base.my_now", return_value=datetime(2019, 7, 30))
+def test_pipelined_run_matches_run(my_now):
+    strategies = [
+        strategy_from_name(StrategyName.ECCS),
+        strategy_from_name(StrategyName.RSIS),
+    ]
+    data = Data(source=Data.LOCAL, options={"STOCK_DATA_PATH": "tests/test_data"})
+    bt = StartBacktest(SYMBOLS, strategies, [{}, {}], data)
+    expected = bt.run()
+    result = StartBacktest(SYMBOLS, strategies, [{}, {}], data).run(prefetch=2)
+    assert [(r.symbol, r.strategy, r.earnings) for r in result] == [
+        (r.symbol, r.strategy, r.earnings) for r in expected
+    ]
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from pystockfilter.data.columnar_source import (
+    ColumnarDataSource,
+    ColumnarStore,
+    convert_csv_directory,
+)
+from pystockfilter.data.local_source import LocalDataSource
+from pystockfilter.data.stock_data_source import DataSourceModule
+
+
+@pytest.fixture
+def test_data_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+
+
+@pytest.fixture
+def store_path(test_data_path, tmp_path):
+    assert convert_csv_directory(test_data_path, str(tmp_path)) == 4
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "symbol, start, end",
+    [
+        ("AAPL", "2020-01-01", "2020-01-03"),
+        ("MSFT", "2000-01-01", "2010-12-31"),
+        ("GOOG", "1990-01-01", "2030-01-01"),
+        ("AMZN", "2030-01-01", "2031-01-01"),
+    ],
+)
+def test_matches_local_data_source(test_data_path, store_path, symbol, start, end):
+    LocalDataSource.STOCK_DATA_PATH = test_data_path
+    expected = LocalDataSource.get_stock_data(symbol, start, end)
+    source = DataSourceModule(
+        DataSourceModule.COLUMNAR, options={"STORE_PATH": store_path}
+    )
+    assert_frame_equal(source.get_stock_data(symbol, start, end), expected)
+
+
+def test_read_columns_and_bounds(store_path):
+    store = ColumnarStore(store_path)
+    assert store.symbols() == ["AAPL", "AMZN", "GOOG", "MSFT"]
+    data = store.read("AAPL", "2020-01-01", "2020-01-31", columns=["Close"])
+    assert list(data.columns) == ["Close"]
+    assert len(data) == 20
+    lo, hi = store.bounds("AAPL", "2020-01-01", "2020-01-31")
+    assert hi - lo == 20
+    assert np.all(np.diff(store.dates("AAPL")) > 0)
+    with pytest.raises(KeyError):
+        store.read("AAPL", columns=["Adj Close"])
+
+
+def test_missing_symbol(store_path, monkeypatch):
+    monkeypatch.setattr(ColumnarDataSource, "STORE_PATH", store_path)
+    with pytest.raises(FileNotFoundError):
+        ColumnarDataSource.get_stock_data("XYZ", "2020-01-01", "2020-01-03")
+
+
+def test_iter_blocks(store_path):
+    source = DataSourceModule(
+        DataSourceModule.COLUMNAR, options={"STORE_PATH": store_path}
+    )
+    expected = source.get_stock_data("MSFT", "2000-01-01", "2010-12-31")
+    blocks = list(source.iter_blocks("MSFT", "2000-01-01", "2010-12-31", 1000))
+    assert [len(block) for block in blocks[:-1]] == [1000] * (len(blocks) - 1)
+    assert_frame_equal(pd.concat(blocks), expected)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from pystockfilter.backtesting import Backtest, lib
+from pystockfilter.strategy.ema_cross_close_strategy import EmaCrossCloseStrategy
+from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
+from pystockfilter.strategy.ensemble_strategy import EnsembleStrategy, Rule
+from pystockfilter.strategy.moving_average_rsi_strategy import (
+    MovingAverageRSIStrategy,
+)
+from pystockfilter.strategy.rsi_strategy import RSIStrategy
+from pystockfilter.strategy.uo_ema_cross_ema_strategy import (
+    UltimateEmaCrossEmaStrategy,
+)
+
+MEMBERS = (EmaCrossEmaStrategy, UltimateEmaCrossEmaStrategy, RSIStrategy)
+
+
+def member_signals(data):
+    signals = []
+    for member in MEMBERS:
+        strategy = member(None, data, {})
+        strategy.init()
+        signals.append((strategy.buy_signal.values, strategy.sell_signal.values))
+    return np.array(signals)
+
+
+@pytest.mark.parametrize("rule", list(Rule))
+def test_ensemble_combines_member_signals(apple_data, rule):
+    signals = member_signals(apple_data)
+    expected = {
+        Rule.AND: signals.all(axis=0),
+        Rule.OR: signals.any(axis=0),
+        Rule.MAJORITY: signals.sum(axis=0) >= 2,
+    }[rule]
+    ensemble = EnsembleStrategy.of(*MEMBERS, rule=rule)(None, apple_data, {})
+    ensemble.init()
+    np.testing.assert_array_equal(ensemble.buy_signal.values, expected[0])
+    np.testing.assert_array_equal(ensemble.sell_signal.values, expected[1])
+
+
+def test_ensemble_parameters():
+    ensemble = EnsembleStrategy.of(*MEMBERS, rule="or")
+    assert ensemble.__name__ == (
+        "EmaCrossEmaStrategyUltimateEmaCrossEmaStrategyRSIStrategyEnsemble"
+    )
+    assert ensemble.rule is Rule.OR
+    assert ensemble.para_ema_long == EmaCrossEmaStrategy.para_ema_long
+    assert ensemble.para_uo_upper == UltimateEmaCrossEmaStrategy.para_uo_upper
+
+
+def test_ensemble_shares_indicators(apple_data):
+    bt = Backtest(
+        apple_data,
+        EnsembleStrategy.of(EmaCrossEmaStrategy, UltimateEmaCrossEmaStrategy),
+        cash=10000,
+    )
+    EmaCrossCloseStrategy._cache.clear()
+    EmaCrossCloseStrategy._cache.reset_stats()
+    result = bt.run(para_ema_short=10, para_ema_long=30)
+    stats = EmaCrossCloseStrategy.cache_stats()
+    # two EMAs for both members, computed once through the shared graph
+    assert (stats.misses, stats.hits) == (2, 0)
+    names = [repr(indicator.name) for indicator in result._strategy._indicators]
+    assert len(names) == len(set(names))
+
+    bt = Backtest(
+        apple_data,
+        EnsembleStrategy.of(RSIStrategy, MovingAverageRSIStrategy),
+        cash=10000,
+    )
+    RSIStrategy._cache.reset_stats()
+    bt.run(para_rsi_window=14)
+    assert RSIStrategy.cache_stats().hits >= 1
+
+
+def test_ensemble_shares_indicators_without_caching(apple_data, mocker):
+    ensemble = EnsembleStrategy.of(EmaCrossEmaStrategy, UltimateEmaCrossEmaStrategy)
+    algo = mocker.spy(EmaCrossCloseStrategy, "_algo")
+    EmaCrossCloseStrategy.caching = False
+    try:
+        Backtest(apple_data, ensemble, cash=10000).run(
+            para_ema_short=10, para_ema_long=30
+        )
+    finally:
+        EmaCrossCloseStrategy.caching = True
+    assert algo.call_count == 2
+
+
+class LambdaRSI(RSIStrategy):
+    def init(self):
+        super().init()
+        self.setup(
+            sell_signal=lambda: lib.crossover(self.rsi, self.rsi_exit),
+            buy_signal=lambda: lib.crossover(self.rsi_enter, self.rsi),
+        )
+
+
+def test_ensemble_with_per_bar_members(apple_data):
+    parameters = {"para_rsi_enter": 30, "para_rsi_exit": 60}
+    vectorized = EnsembleStrategy.of(EmaCrossEmaStrategy, RSIStrategy, rule="or")
+    per_bar = EnsembleStrategy.of(EmaCrossEmaStrategy, LambdaRSI, rule="or")
+    expected = Backtest(apple_data, vectorized, cash=10000).run(**parameters)
+    result = Backtest(apple_data, per_bar, cash=10000).run(**parameters)
+    assert result["# Trades"] == expected["# Trades"] > 0
+    assert result["Return [%]"] == expected["Return [%]"]
+
+
+def test_ensemble_binds_member_indicators_once_per_bar(apple_data, mocker):
+    per_bar = EnsembleStrategy.of(EmaCrossEmaStrategy, LambdaRSI, rule="or")
+    bind = mocker.spy(per_bar, "_bind_members")
+    step = mocker.spy(per_bar, "next")
+    result = Backtest(apple_data, per_bar, cash=10000).run(
+        para_rsi_enter=30, para_rsi_exit=60
+    )
+    assert bind.call_count == step.call_count > 0
+    strategy = result._strategy
+    assert strategy._member_bindings
+    for member, attr, _ in strategy._member_bindings:
+        assert getattr(member, attr).shape[-1] == len(apple_data)
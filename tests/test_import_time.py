@@ -0,0 +1,59 @@
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from pystockfilter import setup_module_logger
+from pystockfilter.strategy import StrategyName, strategy_from_name
+
+
+def loaded_modules(statement: str) -> set:
+    output = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(*sys.modules)"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(output.split())
+
+
+def test_strategy_package_imports_lazily():
+    modules = loaded_modules("import pystockfilter.strategy")
+    assert not {"pandas", "bokeh", "pandas_ta"} & modules
+    assert not any(m.endswith("_strategy") for m in modules)
+    modules = loaded_modules(
+        "from pystockfilter.strategy import RSIStrategy; "
+        "from pystockfilter.backtesting import Backtest"
+    )
+    assert "pystockfilter.strategy.rsi_strategy" in modules
+    assert "pystockfilter.strategy.macd_strategy" not in modules
+    assert "bokeh" not in modules
+
+
+def test_package_logger_is_silent():
+    statement = (
+        "import logging, pystockfilter; "
+        "print(*(type(h).__name__ for h in logging.getLogger('pystockfilter').handlers))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", statement], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.split() == ["NullHandler"]
+    logger = setup_module_logger("pystockfilter")
+    assert any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
+    for handler in logger.handlers:
+        if not isinstance(handler, logging.NullHandler):
+            logger.removeHandler(handler)
+
+
+@pytest.mark.parametrize("name", list(StrategyName))
+def test_strategy_from_name(name):
+    strategy = strategy_from_name(name)
+    assert strategy.__module__.startswith("pystockfilter.strategy.")
+
+
+def test_import_time(benchmark):
+    benchmark.pedantic(
+        loaded_modules, args=("import pystockfilter.strategy",), rounds=3
+    )
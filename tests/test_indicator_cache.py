@@ -0,0 +1,365 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from pystockfilter.backtesting import Backtest
+from pystockfilter.backtesting._util import _Array, _Data
+from pystockfilter.backtesting.lib import crossover
+from pystockfilter.cache import (
+    MISSING,
+    DiskArrayStore,
+    IndicatorCache,
+    SharedArrayStore,
+    TieredStore,
+    fingerprint,
+)
+from pystockfilter.cache.disk_store import kernels_digest
+from pystockfilter.strategy.base_strategy import BaseStrategy
+
+
+def test_fingerprint_covers_full_content():
+    a = pd.Series([1.0, 2.0, 3.0, 4.0, 5.0])
+    b = pd.Series([1.0, 2.0, 9.0, 4.0, 5.0])
+    assert fingerprint(a) != fingerprint(b)
+    assert fingerprint(a) == fingerprint(a.copy())
+
+
+def test_fingerprint_arrays_and_frames():
+    values = np.arange(10, dtype=float)
+    array = _Array(values, name="Close")
+    assert fingerprint(array) == fingerprint(values)
+    assert fingerprint(values[:5]) != fingerprint(values)
+    assert fingerprint(values.astype(np.float32)) != fingerprint(values)
+    df = pd.DataFrame({"Close": values, "Open": values})
+    assert fingerprint(df) != fingerprint(df.rename(columns={"Open": "High"}))
+    assert fingerprint(df.set_index(df.index + 1)) != fingerprint(df)
+    assert fingerprint(_Data(df)) == fingerprint(df)
+    assert fingerprint(pd.Series(pd.date_range("2020", periods=3))) is not None
+    assert fingerprint(3) is None
+
+
+def test_cache_hits_for_arrays():
+    cache = IndicatorCache()
+    calls = []
+
+    def algo(data, length):
+        calls.append(length)
+        return pd.Series(data).rolling(length).mean()
+
+    cached = cache.cached("test", algo)
+    data = _Data(pd.DataFrame({"Close": np.arange(100, dtype=float)}))
+    first = cached(data.Close, 10)
+    assert cached(data.Close, 10) is first
+    assert cached(data.Close, np.int64(10)) is first
+    cached(data.Close, 20)
+    assert calls == [10, 20]
+
+
+def test_cache_misses_after_in_place_edit(dated_data):
+    cache = IndicatorCache()
+    cached = cache.cached("test", lambda data, n: pd.Series(data).rolling(n).mean())
+    close = dated_data.Close
+    first = cached(close, 10)
+    close.iloc[-1] += 1.0
+    second = cached(close, 10)
+    assert cache.stats("test").misses == 2
+    assert second.iloc[-1] != first.iloc[-1]
+    # the prepared data of a backtest does not change with the caller's frame
+    backtest = Backtest(dated_data, BaseStrategy, cash=10000)
+    digest = backtest._prepared.fingerprint
+    dated_data.Close *= 2.0
+    assert fingerprint(backtest._prepared.df) == digest
+
+
+def test_cache_namespaces():
+    cache = IndicatorCache(max_size=2)
+    square = cache.cached("a", lambda x: x * x)
+    for x in range(5):
+        square(x)
+    cache.cached("b", lambda x: x + 1)(1)
+    assert len(cache) == 3
+    assert sorted(cache.namespaces()) == ["a", "b"]
+    cache.clear("a")
+    assert cache.namespaces() == ["b"]
+
+
+def test_cache_passes_uncacheable_arguments():
+    cache = IndicatorCache()
+    cached = cache.cached("test", lambda x: len(x))
+    assert cached({1: 2}) == 1
+    assert len(cache) == 0
+
+
+def test_cache_thread_safety():
+    cache = IndicatorCache(max_size=10)
+    cached = cache.cached("test", lambda x: x * 2)
+    errors = []
+
+    def work(offset):
+        try:
+            for x in range(500):
+                assert cached((x + offset) % 50) == ((x + offset) % 50) * 2
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(cache) == 10
+
+
+def test_shared_store_roundtrip(tmp_path):
+    store = SharedArrayStore(str(tmp_path))
+    index = pd.date_range("2020-01-01", periods=5, tz="US/Eastern")
+    series = pd.Series(np.arange(5.0), index=index, name="RSI_14")
+    frame = pd.DataFrame({"a": np.arange(5.0), "b": np.ones(5)})
+    assert store.put("series", series)
+    assert store.put("tuple", (frame, np.arange(3)))
+    assert not store.put("object", pd.Series(["a", "b"]))
+    pd.testing.assert_series_equal(store.get("series"), series, check_freq=False)
+    loaded_frame, loaded_array = store.get("tuple")
+    pd.testing.assert_frame_equal(loaded_frame, frame)
+    assert isinstance(loaded_array, np.memmap)
+    assert store.get("unknown") is MISSING
+
+
+def test_shared_store_eviction(tmp_path):
+    store = SharedArrayStore(str(tmp_path), max_bytes=3 * 8000 + 1000)
+    for i in range(5):
+        store.put(i, np.zeros(1000))
+    assert len(store) == 3
+    assert store.get(0) is MISSING
+    assert store.get(4) is not MISSING
+
+
+def _publish(directory):
+    SharedArrayStore(directory).put("key", pd.Series(np.arange(10.0)))
+
+
+def test_shared_store_across_processes(tmp_path):
+    process = multiprocessing.get_context("spawn").Process(
+        target=_publish, args=(str(tmp_path),)
+    )
+    process.start()
+    process.join()
+    store = SharedArrayStore(str(tmp_path))
+    pd.testing.assert_series_equal(store.get("key"), pd.Series(np.arange(10.0)))
+
+
+def test_cache_second_tier(tmp_path):
+    calls = []
+
+    def algo(data, length):
+        calls.append(length)
+        return pd.Series(data).rolling(length).mean()
+
+    data = np.arange(100, dtype=float)
+    first = IndicatorCache(store=SharedArrayStore(str(tmp_path)))
+    second = IndicatorCache(store=SharedArrayStore(str(tmp_path)))
+    expected = first.cached("test", algo)(data, 10)
+    pd.testing.assert_series_equal(second.cached("test", algo)(data, 10), expected)
+    assert calls == [10]
+
+
+class SmaCloseStrategy(BaseStrategy):
+    para_sma = 10
+
+    @staticmethod
+    def _algo(data, length):
+        return pd.Series(data).rolling(length).mean()
+
+    def init(self):
+        self.close = self.I(lambda x: x.Close, self.data)
+        self.sma = self.I(SmaCloseStrategy.algo, self.data.Close, self.para_sma)
+        self.setup(
+            buy_signal=lambda: crossover(self.close, self.sma),
+            sell_signal=lambda: crossover(self.sma, self.close),
+        )
+
+
+def test_shared_cache_optimize(apple_data):
+    bt = Backtest(apple_data, SmaCloseStrategy, cash=10000, trade_on_close=True)
+    SmaCloseStrategy._cache.clear()
+    expected = bt.optimize(para_sma=range(5, 30, 5))
+    SmaCloseStrategy._cache.clear()
+    with SmaCloseStrategy.shared_cache() as store:
+        result = bt.optimize(para_sma=range(5, 30, 5))
+        assert len(store) == 5
+    assert result["Return [%]"] == expected["Return [%]"]
+    assert result._strategy.para_sma == expected._strategy.para_sma
+
+
+def test_cache_byte_budget():
+    cache = IndicatorCache(max_bytes=3 * 8000)
+    zeros = cache.cached("a", lambda n: np.zeros(n))
+    for n in range(1000, 1005):
+        zeros(n)
+    stats = cache.stats("a")
+    assert stats.bytes <= 3 * 8000
+    assert stats.bytes == cache.nbytes
+    assert stats.misses == 5 and stats.evictions == 3
+    zeros(1004)
+    assert cache.stats().hits == 1
+    zeros(10**6)  # larger than the budget, not cached
+    assert len(cache) == 2
+
+
+def test_cache_evicts_across_namespaces():
+    cache = IndicatorCache(max_bytes=4 * 8100)
+    unused = cache.cached("a", lambda n: np.zeros(n))
+    unused(1000)
+    unused(1001)
+    other = cache.cached("b", lambda n: np.zeros(n))
+    for n in range(1000, 1010):
+        other(n)
+    # the least recently used entries go first, whatever their namespace
+    assert cache.stats("a").entries == 0 and cache.stats("a").evictions == 2
+    assert cache.stats("b").entries == 4
+    assert cache.nbytes <= 4 * 8100
+
+
+def test_cache_lfu_policy():
+    cache = IndicatorCache(max_size=2, policy="lfu")
+    square = cache.cached("a", lambda x: x * x)
+    square(1)
+    square(1)
+    square(2)
+    square(3)  # evicts 2, the least frequently used
+    square(1)
+    assert cache.stats("a").hits == 2
+    square(2)
+    assert cache.stats("a").misses == 4
+
+
+def test_cache_lfu_keeps_new_entries():
+    cache = IndicatorCache(max_bytes=3 * 8100, policy="lfu")
+    zeros = cache.cached("a", lambda n: np.zeros(n))
+    for n in range(1000, 1003):
+        zeros(n)
+        zeros(n)
+    for n in range(1003, 1006):
+        zeros(n)
+        assert zeros(n) is zeros(n)
+    assert len(cache) == 3
+    assert cache.stats("a").misses == 6
+
+
+def test_strategy_cache_stats(apple_data):
+    SmaCloseStrategy._cache.clear()
+    SmaCloseStrategy._cache.reset_stats()
+    bt = Backtest(apple_data, SmaCloseStrategy, cash=10000, trade_on_close=True)
+    bt.run()
+    bt.run()
+    stats = SmaCloseStrategy.cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_disk_store_persists(tmp_path):
+    calls = []
+
+    def algo(data, length):
+        calls.append(length)
+        return pd.Series(data).rolling(length).mean()
+
+    data = np.arange(100, dtype=float)
+    expected = IndicatorCache(store=DiskArrayStore(str(tmp_path))).cached(
+        "test", algo
+    )(data.copy(), 10)
+    # a new process: new cache and a new copy of the same data
+    store = DiskArrayStore(str(tmp_path))
+    result = IndicatorCache(store=store).cached("test", algo)(data.copy(), 10)
+    pd.testing.assert_series_equal(result, expected)
+    assert calls == [10]
+    assert len(store) == 1 and os.path.isdir(store.directory)
+
+
+def test_disk_store_cleanup(tmp_path):
+    store = DiskArrayStore(str(tmp_path), max_bytes=10**6)
+    store.put("old", np.zeros(10))
+    store.put("new", np.zeros(10))
+    old = os.path.join(store.directory, store.digest("old"))
+    os.utime(old, (0, 0))
+    os.makedirs(os.path.join(store.directory, ".tmp-1-abandoned"))
+    os.utime(os.path.join(store.directory, ".tmp-1-abandoned"), (0, 0))
+    store.cleanup(max_age=timedelta(days=1))
+    assert store.get("old") is MISSING
+    assert store.get("new") is not MISSING
+    assert os.listdir(store.directory) == [store.digest("new")]
+
+
+def test_tiered_store_promotes(tmp_path):
+    disk = DiskArrayStore(str(tmp_path / "disk"))
+    shared = SharedArrayStore(str(tmp_path / "shared"))
+    disk.put("key", np.arange(3.0))
+    tiered = TieredStore(shared, disk)
+    np.testing.assert_array_equal(tiered.get("key"), np.arange(3.0))
+    np.testing.assert_array_equal(shared.get("key"), np.arange(3.0))
+
+
+def test_disk_store_keyed_by_code(tmp_path):
+    data = np.arange(100, dtype=float)
+
+    def algo(data, length):
+        return pd.Series(data).rolling(length).mean()
+
+    first = algo
+    IndicatorCache(store=DiskArrayStore(str(tmp_path))).cached("test", first)(data, 10)
+
+    def algo(data, length):  # noqa: F811, edited without a version bump
+        return pd.Series(data).rolling(length).sum()
+
+    store = DiskArrayStore(str(tmp_path))
+    result = IndicatorCache(store=store).cached("test", algo)(data.copy(), 10)
+    pd.testing.assert_series_equal(result, pd.Series(data).rolling(10).sum())
+    assert first.__qualname__ == algo.__qualname__ and len(store) == 2
+
+
+def test_code_key_independent_of_hash_seed():
+    script = (
+        "from pystockfilter.cache.fingerprint import code_fingerprint\n"
+        "def algo(data, kind):\n"
+        "    return data if kind in {'ema', 'sma', 'rma', 'wma'} else None\n"
+        "print(code_fingerprint(algo))"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(digests) == 1
+
+
+def test_disk_store_salted_with_kernels(tmp_path):
+    store = DiskArrayStore(str(tmp_path))
+    assert kernels_digest() in store.salt
+
+
+def test_disk_cache_stacks_with_shared_cache(tmp_path):
+    class OtherStrategy(BaseStrategy):
+        pass
+
+    assert BaseStrategy._cache.store is None
+    with SmaCloseStrategy.shared_cache(str(tmp_path / "shared")) as shared:
+        disk = BaseStrategy.enable_disk_cache(str(tmp_path / "disk"))
+        try:
+            store = OtherStrategy._cache.store
+            assert isinstance(store, TieredStore)
+            assert store.stores == [shared, disk]
+        finally:
+            BaseStrategy.disable_disk_cache()
+        assert SmaCloseStrategy._cache.store is shared
@@ -0,0 +1,65 @@
+import numpy as np
+
+from pystockfilter.backtesting._util import _Data
+from pystockfilter.indicators.graph import Call, Column, IndicatorGraph
+from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
+from pystockfilter.strategy.uo_ema_cross_close_strategy import (
+    UltimateEmaCrossCloseStrategy,
+)
+
+
+def test_graph_eliminates_common_subexpressions(apple_data):
+    calls = []
+
+    def mean(values, length):
+        calls.append(length)
+        return np.convolve(values, np.ones(length) / length, "same")
+
+    graph = IndicatorGraph(_Data(apple_data))
+    close = Column("Close")
+    first = graph.value(Call(mean, Call(np.log, close), 5))
+    second = graph.value(Call(mean, Call(np.log, Column("Close")), 5))
+    graph.value(Call(mean, close, 5))
+    assert first is second
+    assert calls == [5, 5]
+    # close, log(close), mean(log(close)) and mean(close)
+    assert len(graph) == 4
+    assert Call(np.log, close) in graph
+
+
+def test_graph_evaluates_inputs_first(apple_data):
+    order = []
+
+    def record(name, *inputs):
+        order.append(name)
+        return name
+
+    graph = IndicatorGraph(apple_data)
+    a = Call(record, "a")
+    b = Call(record, "b", a)
+    c = Call(record, "c", a, b)
+    graph.add(c)
+    assert graph.evaluate() is None
+    assert order == ["a", "b", "c"]
+    assert graph.value(b) == "b" and order == ["a", "b", "c"]
+
+
+def test_columns_share_data_buffers(apple_data):
+    data = _Data(apple_data)
+    graph = IndicatorGraph(data)
+    assert np.shares_memory(graph.value(Column("Close")), data.Close)
+
+
+def test_strategy_declares_identical_indicators_once(apple_data):
+    strategy = UltimateEmaCrossCloseStrategy(None, _Data(apple_data), {})
+    strategy.init()
+    closes = [i for i in strategy._indicators if i.name == "Close"]
+    assert len(closes) == 1
+    assert np.shares_memory(strategy.close, strategy.data.Close)
+
+    strategy = EmaCrossEmaStrategy(
+        None, _Data(apple_data), {"para_ema_short": 20, "para_ema_long": 20}
+    )
+    strategy.init()
+    assert strategy.ema_short is strategy.ema_long
+    assert len(strategy._indicators) == 2
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from pystockfilter import indicators
+
+ta = pytest.importorskip("pandas_ta")
+
+
+def assert_parity(actual, expected, tolerance=1e-9):
+    np.testing.assert_allclose(
+        np.asarray(actual, dtype=float),
+        np.asarray(expected, dtype=float),
+        rtol=tolerance,
+        atol=tolerance,
+    )
+
+
+@pytest.mark.parametrize("length", [2, 14, 50])
+def test_moving_averages(apple_data, length):
+    close = apple_data.Close
+    assert_parity(indicators.sma(close, length), ta.sma(close, length))
+    assert_parity(indicators.ema(close, length), ta.ema(close, length))
+    assert_parity(indicators.rma(close, length), ta.rma(close, length))
+    assert_parity(indicators.rsi(close, length), ta.rsi(close, length))
+
+
+@pytest.mark.parametrize("fast, slow, signal", [(12, 26, 9), (26, 12, 9), (5, 35, 5)])
+def test_macd(apple_data, fast, slow, signal):
+    expected = ta.macd(apple_data.Close, fast, slow, signal)
+    for actual, column in zip(
+        indicators.macd(apple_data.Close, fast, slow, signal), expected.columns
+    ):
+        assert_parity(actual, expected[column])
+
+
+@pytest.mark.parametrize("length, std", [(20, 2.0), (10, 1.5)])
+def test_bbands(apple_data, length, std):
+    expected = ta.bbands(apple_data.Close, length=length, std=std)
+    for actual, column in zip(
+        indicators.bbands(apple_data.Close, length, std), expected.columns
+    ):
+        # rolling sums instead of pandas' online variance
+        assert_parity(actual, expected[column], 1e-7)
+    assert_parity(
+        indicators.stdev(apple_data.Close, length),
+        ta.stdev(apple_data.Close, length),
+        1e-7,
+    )
+
+
+def test_ohlc_indicators(apple_data):
+    o, h, l, c = (apple_data[col] for col in ("Open", "High", "Low", "Close"))
+    assert_parity(indicators.true_range(h, l, c), ta.true_range(h, l, c))
+    assert_parity(indicators.atr(h, l, c, 14), ta.atr(h, l, c, 14))
+    assert_parity(indicators.uo(h, l, c), ta.uo(h, l, c))
+    assert_parity(
+        indicators.uo(c, h, l, 7, 14, 28, 7, 14, 28), ta.uo(c, h, l, 7, 14, 28, 7, 14, 28)
+    )
+    assert_parity(indicators.cdl_doji(o, h, l, c), ta.cdl_doji(o, h, l, c))
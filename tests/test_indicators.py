@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pystockfilter import indicators
+from pystockfilter.backtesting import Backtest
+from pystockfilter.cache import DiskArrayStore, IndicatorCache
+from pystockfilter.indicators import ATR, EMA, MACD, RSI, UO, RollingSum
+from pystockfilter.strategy.atr_strategy import ATRStrategy
+from pystockfilter.strategy.bollinger_volume_strategy import BollingerVolumeStrategy
+from pystockfilter.strategy.ema_cross_close_strategy import EmaCrossCloseStrategy
+from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
+from pystockfilter.strategy.rsi_strategy import RSIStrategy
+
+
+INDICATORS = [
+    EMA(14),
+    RSI(14),
+    MACD(12, 26, 9),
+    MACD(26, 12, 9),
+    ATR(14),
+    UO(7, 14, 28),
+    RollingSum(5),
+]
+
+
+@pytest.mark.parametrize("indicator", INDICATORS, ids=lambda i: i.name)
+def test_extension_matches_full_computation(indicator, apple_data):
+    columns = indicator.inputs(apple_data)
+    expected = indicator.copy().update(*columns)
+    state = indicator.copy()
+    parts = []
+    for start in range(0, len(apple_data), 50):
+        parts.append(state.update(*(column[start : start + 50] for column in columns)))
+        # continue from an exported state
+        restored = indicator.copy()
+        restored.load_state(state.state())
+        state = restored
+    np.testing.assert_allclose(np.concatenate(parts), expected, rtol=1e-10)
+
+
+def test_indicator_reference_values(apple_data):
+    close = apple_data.Close
+    ema = EMA(10).compute(close)
+    assert ema.name == "EMA_10"
+    assert ema.iloc[:9].isna().all()
+    assert ema.iloc[9] == pytest.approx(close.iloc[:10].mean())
+    expected = close.copy()
+    expected.iloc[:9] = np.nan
+    expected.iloc[9] = close.iloc[:10].mean()
+    pd.testing.assert_series_equal(
+        ema, expected.ewm(span=10, adjust=False).mean(), check_names=False
+    )
+    rsi = RSI(14).compute(close)
+    diff = close.diff()
+    up = diff.clip(lower=0).ewm(alpha=1 / 14, min_periods=14).mean()
+    down = diff.clip(upper=0).abs().ewm(alpha=1 / 14, min_periods=14).mean()
+    pd.testing.assert_series_equal(rsi, 100 * up / (up + down), check_names=False)
+    macd = MACD(12, 26, 9).compute(close)
+    assert list(macd.columns) == ["MACD_12_26_9", "MACDh_12_26_9", "MACDs_12_26_9"]
+
+
+def extend_twice(cache, calls, data):
+    def indicator(length):
+        rsi = RSI(length)
+        update = rsi.update
+
+        def counted(close):
+            calls.append(len(close))
+            return update(close)
+
+        rsi.update = counted
+        return rsi
+
+    algo = cache.cached("test", lambda d, n: RSI(n).compute(d), indicator=indicator)
+    first = algo(data.iloc[:-1], 14)
+    second = algo(data, 14)
+    return first, second
+
+
+def test_cache_extends_grown_data(apple_data):
+    cache = IndicatorCache()
+    calls = []
+    first, second = extend_twice(cache, calls, apple_data.Close)
+    assert calls == [len(apple_data) - 1, 1]
+    assert cache.stats("test").extensions == 1
+    pd.testing.assert_series_equal(second, RSI(14).compute(apple_data.Close))
+    pd.testing.assert_series_equal(second.iloc[:-1], first)
+
+
+def test_cache_recomputes_changed_history(apple_data):
+    cache = IndicatorCache()
+    close = apple_data.Close
+    algo = cache.cached("test", lambda d, n: RSI(n).compute(d), indicator=RSI)
+    algo(close.iloc[:-1], 14)
+    changed = close.copy()
+    changed.iloc[10] += 1.0
+    pd.testing.assert_series_equal(algo(changed, 14), RSI(14).compute(changed))
+    assert cache.stats("test").extensions == 0
+
+
+def test_cache_keeps_state_per_dataset(apple_data, tmp_path):
+    apple = apple_data.Close
+    other = apple_data.Close.iloc[::-1].reset_index(drop=True)
+    cache = IndicatorCache(store=DiskArrayStore(str(tmp_path)))
+    algo = cache.cached("test", lambda d, n: RSI(n).compute(d), indicator=RSI)
+    algo(apple.iloc[:-1].copy(), 14)
+    algo(other.iloc[:-1].copy(), 14)
+    pd.testing.assert_series_equal(algo(apple.copy(), 14), RSI(14).compute(apple))
+    pd.testing.assert_series_equal(algo(other.copy(), 14), RSI(14).compute(other))
+    assert cache.stats("test").extensions == 2
+
+
+def test_cache_extends_from_disk(apple_data, tmp_path):
+    close = apple_data.Close
+    calls = []
+    algo = IndicatorCache(store=DiskArrayStore(str(tmp_path))).cached(
+        "test", lambda d, n: RSI(n).compute(d), indicator=RSI
+    )
+    algo(close.iloc[:-1].copy(), 14)
+    # the next day, in a new process
+    cache = IndicatorCache(store=DiskArrayStore(str(tmp_path)))
+    first, second = extend_twice(cache, calls, close.copy())
+    assert calls[-1] == 1
+    pd.testing.assert_series_equal(second, RSI(14).compute(close))
+
+
+def test_banks_match_kernels(apple_data):
+    c = apple_data.Close
+    lengths = [1, 2, 14, 50, len(c) + 1]
+    bank = indicators.sma_bank(c, lengths)
+    assert bank.shape == (len(lengths), len(c))
+    for length, row in zip(lengths, bank):
+        np.testing.assert_array_equal(row, indicators.sma(c, length))
+    for ddof in (0, 1):
+        bank = indicators.stdev_bank(c, lengths, ddof)
+        for length, row in zip(lengths, bank):
+            np.testing.assert_array_equal(row, indicators.stdev(c, length, ddof))
+    with_gap = c.copy()
+    with_gap.iloc[30] = np.nan
+    np.testing.assert_array_equal(
+        indicators.sma_bank(with_gap, [5])[0], indicators.sma(with_gap, 5)
+    )
+    np.testing.assert_allclose(
+        indicators.stdev_bank(c, [20], 0)[0],
+        c.rolling(20).std(ddof=0),
+        rtol=1e-7,
+    )
+
+
+# thresholds are cached in the same namespace, hence the `thresholds` misses
+@pytest.mark.parametrize(
+    "strategy, cached, grid, seeded, thresholds",
+    [
+        (
+            EmaCrossEmaStrategy,
+            EmaCrossCloseStrategy,
+            {"para_ema_short": [5, 10], "para_ema_long": [20, 30]},
+            4,
+            0,
+        ),
+        (RSIStrategy, RSIStrategy, {"para_rsi_window": [14, 20]}, 2, 2),
+        (ATRStrategy, ATRStrategy, {"para_atr_window": [10, 14]}, 2, 2),
+        (
+            BollingerVolumeStrategy,
+            BollingerVolumeStrategy,
+            {"para_bb_window": [20, 30], "para_bb_std_dev": [1.5, 2.0]},
+            3,  # two band windows and the default volume window
+            0,
+        ),
+    ],
+    ids=["ema", "rsi", "atr", "bvs"],
+)
+def test_prepare_seeds_optimizer_grid(
+    apple_data, strategy, cached, grid, seeded, thresholds, mocker
+):
+    bt = Backtest(apple_data, strategy, cash=10000, trade_on_close=True)
+    strategy.caching = cached.caching = False
+    try:
+        expected = [
+            bt.run(**dict(zip(grid, p)))["Return [%]"] for p in zip(*grid.values())
+        ]
+    finally:
+        strategy.caching = cached.caching = True
+    cached._cache.clear()
+    cached._cache.reset_stats()
+    assert strategy.prepare(bt._data, **grid) == seeded
+    result = [bt.run(**dict(zip(grid, p)))["Return [%]"] for p in zip(*grid.values())]
+    assert result == expected
+    assert cached.cache_stats().misses == thresholds
+    # nothing is computed without caching
+    spy = mocker.spy(strategy, "_prepare")
+    strategy.caching = False
+    try:
+        assert strategy.prepare(bt._data, **grid) == 0
+    finally:
+        strategy.caching = True
+    assert not spy.called
@@ -1,5 +1,8 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pystockfilter.data import local_source
 from pystockfilter.data.local_source import LocalDataSource
+from pystockfilter.data.stock_data_source import DataSourceModule
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import os
@@ -26,4 +29,74 @@ def test_get_stock_data(local_data_source, test_data_path):
 
 def test_get_stock_data_file_not_exist(local_data_source):
     with pytest.raises(FileNotFoundError):
-        local_data_source.get_stock_data('XYZ', '2020-01-01', '2020-01-03')
\ No newline at end of file
+        local_data_source.get_stock_data('XYZ', '2020-01-01', '2020-01-03')
+
+def test_get_stock_data_float32(local_data_source, monkeypatch):
+    monkeypatch.setattr(LocalDataSource, "PRECISION", "float32")
+    result = local_data_source.get_stock_data('AAPL', '2020-01-01', '2020-01-03')
+    assert (result[["Open", "High", "Low", "Close"]].dtypes == "float32").all()
+
+
+def test_get_stock_data_cached(local_data_source, mocker):
+    LocalDataSource.cache.clear()
+    read_csv = mocker.spy(local_source, "read_csv")
+    first = local_data_source.get_stock_data('MSFT', '2020-01-01', '2020-01-31')
+    second = local_data_source.get_stock_data('MSFT', '2019-01-01', '2019-12-31')
+    first["Close"] = 0.0
+    third = local_data_source.get_stock_data('MSFT', '2020-01-01', '2020-01-31')
+    assert read_csv.call_count == 1
+    assert len(second) == 251 and (third.Close > 0).all()
+
+
+def test_get_stock_data_invalidated(tmp_path, test_data_path, monkeypatch):
+    monkeypatch.setattr(LocalDataSource, "STOCK_DATA_PATH", str(tmp_path))
+    monkeypatch.setattr(LocalDataSource, "cache", local_source.FrameCache())
+    source = os.path.join(test_data_path, 'AAPL.csv')
+    target = tmp_path / 'AAPL.csv'
+    lines = open(source).readlines()
+    target.write_text("".join(lines[:-10]))
+    before = LocalDataSource.get_stock_data('AAPL', '1980-01-01', '2030-01-01')
+    target.write_text("".join(lines))
+    after = LocalDataSource.get_stock_data('AAPL', '1980-01-01', '2030-01-01')
+    assert len(after) == len(before) + 10
+    assert len(LocalDataSource.cache) == 1
+
+
+def test_frame_cache_bounded(test_data_path):
+    cache = local_source.FrameCache(max_bytes=800_000)
+    for symbol in ('AAPL', 'MSFT', 'GOOG'):
+        cache.get(os.path.join(test_data_path, f'{symbol}.csv'))
+    assert cache.nbytes <= cache.max_bytes
+    assert len(cache) == 1
+
+
+def test_frame_cache_threads(test_data_path):
+    cache = local_source.FrameCache()
+    data_path = os.path.join(test_data_path, 'GOOG.csv')
+    with ThreadPoolExecutor(8) as pool:
+        frames = list(pool.map(lambda _: cache.get(data_path), range(32)))
+    assert len(cache) == 1
+    assert all(frame.equals(frames[0]) for frame in frames)
+
+
+def test_get_many(test_data_path):
+    source = DataSourceModule(
+        DataSourceModule.LOCAL, options={"STOCK_DATA_PATH": test_data_path}
+    )
+    symbols = ['AAPL', 'MSFT', 'GOOG', 'AAPL']
+    frames = source.get_many(symbols, '2020-01-01', '2020-03-31')
+    assert list(frames) == ['AAPL', 'MSFT', 'GOOG']
+    for symbol, frame in frames.items():
+        assert_frame_equal(
+            frame, source.get_stock_data(symbol, '2020-01-01', '2020-03-31')
+        )
+    with pytest.raises(FileNotFoundError):
+        source.get_many(['AAPL', 'XYZ'], '2020-01-01', '2020-01-03')
+
+
+def test_iter_blocks(local_data_source, monkeypatch):
+    monkeypatch.setattr(LocalDataSource, "BLOCK_SIZE", 20)
+    expected = local_data_source.get_stock_data('AAPL', '2020-01-01', '2020-03-31')
+    blocks = list(local_data_source.iter_blocks('AAPL', '2020-01-01', '2020-03-31'))
+    assert [len(block) for block in blocks] == [20, 20, 20, 1]
+    assert_frame_equal(pd.concat(blocks), expected)
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from pystockfilter.data.local_source import LocalDataSource
+from pystockfilter.data.panel_source import (
+    FIELDS,
+    PanelDataSource,
+    PanelStore,
+    build_panel,
+)
+from pystockfilter.data.stock_data_source import DataSourceModule
+
+
+@pytest.fixture
+def test_data_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+
+
+@pytest.fixture
+def panel_path(test_data_path, tmp_path):
+    path = str(tmp_path / "panel")
+    assert build_panel(test_data_path, path) == 4
+    return path
+
+
+@pytest.mark.parametrize(
+    "symbol, start, end",
+    [
+        ("AAPL", "2020-01-01", "2020-01-03"),
+        ("MSFT", "2000-01-01", "2010-12-31"),
+        ("GOOG", "1990-01-01", "2030-01-01"),
+        ("AMZN", "2030-01-01", "2031-01-01"),
+    ],
+)
+def test_matches_local_data_source(
+    test_data_path, panel_path, symbol, start, end, monkeypatch
+):
+    monkeypatch.setattr(LocalDataSource, "STOCK_DATA_PATH", test_data_path)
+    expected = LocalDataSource.get_stock_data(symbol, start, end)[list(FIELDS)]
+    source = DataSourceModule(DataSourceModule.PANEL, options={"STORE_PATH": panel_path})
+    assert_frame_equal(source.get_stock_data(symbol, start, end), expected)
+
+
+def test_frames_are_views_of_the_panel(panel_path):
+    store = PanelStore(panel_path)
+    assert store.symbols() == ["AAPL", "AMZN", "GOOG", "MSFT"]
+    first = store.read("MSFT", "2010-01-01", "2010-12-31")
+    second = store.read("MSFT", "2010-06-01")
+    for field in FIELDS:
+        assert np.shares_memory(first[field].to_numpy(), store._map(field))
+    assert np.shares_memory(first.Close.to_numpy(), second.Close.to_numpy())
+    with pytest.raises(ValueError):
+        first.Close.to_numpy()[0] = 0
+    offset, length = store.index["symbols"]["MSFT"]
+    assert store.bounds("MSFT") == (offset, offset + length)
+    with pytest.raises(FileNotFoundError):
+        store.read("XYZ")
+
+
+def test_iter_blocks(panel_path):
+    source = DataSourceModule(DataSourceModule.PANEL, options={"STORE_PATH": panel_path})
+    expected = source.get_stock_data("MSFT", "2000-01-01", "2010-12-31")
+    blocks = list(source.iter_blocks("MSFT", "2000-01-01", "2010-12-31", 1000))
+    assert [len(block) for block in blocks[:-1]] == [1000] * (len(blocks) - 1)
+    assert np.shares_memory(
+        blocks[0].Close.to_numpy(), PanelDataSource.store()._map("Close")
+    )
+    assert_frame_equal(pd.concat(blocks), expected)
+    with pytest.raises(FileNotFoundError):
+        next(source.iter_blocks("XYZ", "2000-01-01", "2010-12-31"))
+
+
+def test_store_remapped_after_rebuild(test_data_path, panel_path, monkeypatch):
+    monkeypatch.setattr(PanelDataSource, "STORE_PATH", panel_path)
+    store = PanelDataSource.store()
+    assert PanelDataSource.store() is store
+    assert build_panel(test_data_path, panel_path, ["AAPL", "MSFT"]) == 2
+    assert PanelDataSource.store() is not store
+    assert PanelDataSource.store().symbols() == ["AAPL", "MSFT"]
+    with pytest.raises(FileNotFoundError):
+        PanelDataSource.get_stock_data("GOOG", "1990-01-01", "2030-01-01")
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from pystockfilter.backtesting import Backtest
+from pystockfilter.data import with_precision
+from pystockfilter.strategy import StrategyName, strategy_from_name
+
+# float32 has a relative precision of ~6e-8; after the float64 accumulation
+# of the indicators the relative error stays well below this tolerance
+INDICATOR_RTOL = 1e-5
+# The legacy column order of UltimateStrategy ("Close", "High", "Low") makes
+# its true range almost zero on some bars, which amplifies the float32
+# rounding of the prices; only the backtest results are compared for them.
+ILL_CONDITIONED = {StrategyName.UO, StrategyName.UECCS, StrategyName.UECES}
+
+
+def test_with_precision(apple_data):
+    data = with_precision(apple_data, "float32")
+    assert (data[["Open", "High", "Low", "Close"]].dtypes == np.float32).all()
+    assert data.Volume.dtype == apple_data.Volume.dtype
+    assert apple_data.Close.dtype == np.float64
+    assert with_precision(apple_data) is apple_data
+    with pytest.raises(ValueError):
+        with_precision(apple_data, "float16")
+
+
+@pytest.mark.parametrize("name", list(StrategyName))
+def test_float32_matches_float64(apple_data, name):
+    strategy = strategy_from_name(name)
+    results = {}
+    for precision in ("float64", "float32"):
+        bt = Backtest(apple_data, strategy, cash=10000, precision=precision)
+        stats = bt.run()
+        results[precision] = stats
+        indicators = stats._strategy._indicators
+        assert all(
+            indicator.dtype == precision
+            for indicator in indicators
+            if np.issubdtype(indicator.dtype, np.floating)
+        )
+        assert stats._equity_curve.Equity.dtype == np.float64
+
+    single, double = results["float32"], results["float64"]
+    indicators = zip(single._strategy._indicators, double._strategy._indicators)
+    for low, high in indicators if name not in ILL_CONDITIONED else ():
+        np.testing.assert_allclose(
+            np.asarray(low, dtype=float), high, rtol=INDICATOR_RTOL, atol=1e-6
+        )
+    assert single["# Trades"] == double["# Trades"]
+    assert single["Return [%]"] == pytest.approx(double["Return [%]"], abs=1e-2)
@@ -0,0 +1,98 @@
+import importlib
+
+import numpy as np
+import pytest
+
+from pystockfilter.backtesting import Backtest, PreparedData
+from pystockfilter.strategy import StrategyName, strategy_from_name
+from pystockfilter.tool.start_seq_optimizer import StartSequentialOptimizer
+
+
+def test_prepared_data_is_read_only(dated_data):
+    prepared = PreparedData(dated_data)
+    assert len(prepared) == len(dated_data)
+    for column in ("Open", "High", "Low", "Close", "Volume"):
+        values = prepared.df[column].to_numpy()
+        assert values.dtype == np.float64
+        assert values.flags.c_contiguous and not values.flags.writeable
+    with pytest.raises(ValueError):
+        prepared.df["Close"].to_numpy()[0] = 0.0
+    # the caller's frame is left writeable
+    assert dated_data.Close.to_numpy().flags.writeable
+    assert prepared.max_close == dated_data.Close.max()
+
+
+def test_prepared_data_validation(dated_data):
+    with pytest.raises(TypeError):
+        PreparedData(dated_data.to_numpy())
+    with pytest.raises(ValueError):
+        PreparedData(dated_data.iloc[:0])
+    with pytest.raises(ValueError):
+        PreparedData(dated_data.drop(columns="Close"))
+    missing = dated_data.copy()
+    missing.iloc[3, missing.columns.get_loc("Close")] = np.nan
+    with pytest.raises(ValueError):
+        PreparedData(missing)
+    with pytest.warns(UserWarning, match="not sorted"):
+        prepared = PreparedData(dated_data.iloc[::-1])
+    assert prepared.df.index.is_monotonic_increasing
+
+
+def test_prepared_data_float32(dated_data):
+    prepared = PreparedData(dated_data, "float32")
+    assert (prepared.df[["Open", "High", "Low", "Close"]].dtypes == np.float32).all()
+    stats = Backtest(prepared, strategy_from_name(StrategyName.RSIS), cash=10000).run()
+    expected = Backtest(
+        dated_data, strategy_from_name(StrategyName.RSIS), cash=10000, precision="float32"
+    ).run()
+    assert stats["# Trades"] == expected["# Trades"]
+
+
+@pytest.mark.parametrize("name", [StrategyName.RSIS, StrategyName.ECCS])
+def test_shared_prepared_data_matches_frame(dated_data, name):
+    strategy = strategy_from_name(name)
+    prepared = PreparedData(dated_data)
+    for _ in range(2):
+        shared = Backtest(prepared, strategy, cash=10000).run()
+        single = Backtest(dated_data, strategy, cash=10000).run()
+        assert shared["# Trades"] == single["# Trades"]
+        assert shared["Equity Final [$]"] == single["Equity Final [$]"]
+
+
+def test_fingerprint_computed_once(dated_data, mocker):
+    # the package attribute `fingerprint` is the function, not the module
+    module = importlib.import_module("pystockfilter.cache.fingerprint")
+    prepared = PreparedData(dated_data)
+    digest = prepared.fingerprint
+    spy = mocker.spy(module, "_combine")
+    strategy = strategy_from_name(StrategyName.RSIS)
+    for _ in range(3):
+        Backtest(prepared, strategy, cash=10000).run()
+    assert module.fingerprint(prepared.data()) == digest
+    assert not [call for call in spy.call_args_list if call.args[0] == "frame"]
+
+
+def test_fingerprint_is_lazy(dated_data, mocker):
+    module = importlib.import_module("pystockfilter.cache.fingerprint")
+    spy = mocker.spy(module, "_combine")
+    prepared = PreparedData(dated_data)
+    assert not spy.call_count
+    assert prepared.fingerprint == prepared.fingerprint
+    # hashed on first use only
+    assert len([call for call in spy.call_args_list if call.args[0] == "frame"]) == 1
+
+
+def test_seq_optimizer_prepares_once(dated_data, mocker):
+    spy = mocker.spy(PreparedData, "__init__")
+    strategy = strategy_from_name(StrategyName.RSIS)
+    optimizer = StartSequentialOptimizer(None, None, None, None)
+    result = optimizer.run_implementation(
+        strategy,
+        "AAPL",
+        dated_data,
+        0.002,
+        10000,
+        [{"para_rsi_window": range(10, 14, 2)}, {"para_rsi_enter": range(70, 90, 10)}],
+    )
+    assert result is not None
+    assert spy.call_count == 1
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import numpy as np
+from pony.orm import db_session
+from pystockdb.db.schema.stocks import Price
+
+from pystockfilter.data.pystockdb_source import PyStockDBDataSource
+
+START, END = datetime(2018, 7, 30), datetime(2019, 7, 30)
+
+
+@db_session
+def test_get_many_matches_orm(setup_test_database, monkeypatch):
+    monkeypatch.setattr(PyStockDBDataSource, "BATCH_SIZE", 1)
+    frames = PyStockDBDataSource.get_many(["IFX.F", "XYZ", "IFX.F"], START, END)
+    assert list(frames) == ["IFX.F", "XYZ"]
+    assert frames["XYZ"].empty
+    data = frames["IFX.F"]
+    bars = sorted(
+        Price.select(
+            lambda p: p.symbol.name == "IFX.F" and p.date >= START and p.date <= END
+        ),
+        key=lambda p: p.date,
+    )
+    assert len(data) == len(bars) > 0
+    assert data.index.is_monotonic_increasing and data.index.name == "Date"
+    np.testing.assert_array_equal(data.Close, [bar.close for bar in bars])
+    np.testing.assert_array_equal(data.Volume, [bar.volume for bar in bars])
+    single = PyStockDBDataSource.get_stock_data("IFX.F", START, END)
+    assert single.equals(data)
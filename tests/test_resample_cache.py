@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from pystockfilter.backtesting import Backtest, Strategy
+from pystockfilter.backtesting.lib import OHLCV_AGG, RESAMPLE_CACHE, resample_apply
+from pystockfilter.cache import ResampleCache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    RESAMPLE_CACHE.clear()
+    yield
+    RESAMPLE_CACHE.clear()
+
+
+def _sma(values, n):
+    return pd.Series(values).rolling(n).mean()
+
+
+def _reference(rule, func, series, *args, agg="last"):
+    resampled = series.resample(rule, label="right").agg(agg).dropna()
+    result = func(resampled, *args)
+    return result.reindex(
+        index=series.index.union(resampled.index), method="ffill"
+    ).reindex(series.index)
+
+
+@pytest.mark.parametrize("rule", ["W", "2W", "QE"])
+def test_matches_reindex(dated_data, rule):
+    close = dated_data.Close
+    expected = _reference(rule, _sma, close, 5)
+    for _ in range(2):
+        result = resample_apply(rule, _sma, close, 5)
+        assert_series_equal(result, expected, check_names=False)
+    assert (RESAMPLE_CACHE.hits, RESAMPLE_CACHE.misses) == (1, 1)
+
+
+def test_frame(dated_data):
+    def ranges(bars):
+        return pd.DataFrame({"range": bars.High - bars.Low, "close": bars.Close})
+
+    expected = _reference("W", ranges, dated_data, agg=dict(OHLCV_AGG))
+    result = resample_apply("W", ranges, dated_data)
+    assert_frame_equal(result, expected)
+
+
+def test_keyed_by_content(dated_data):
+    close = dated_data.Close
+    resample_apply("W", None, close)
+    resample_apply("W", None, close.copy())
+    changed = close.copy()
+    changed.iloc[-1] += 1.0
+    result = resample_apply("W", None, changed)
+    assert (RESAMPLE_CACHE.hits, RESAMPLE_CACHE.misses) == (1, 2)
+    assert_series_equal(
+        result, _reference("W", lambda bars: bars, changed), check_names=False
+    )
+    # functions as aggregation are not cached
+    resample_apply("W", None, close, agg=lambda values: values.iloc[-1])
+    assert len(RESAMPLE_CACHE) == 2
+
+
+def test_bounded(dated_data):
+    # an entry holds the weekly bars and a position per daily bar
+    cache = ResampleCache(max_bytes=2 * dated_data.Close.nbytes)
+    for rule in ("W", "2W", "3W"):
+        cache.get(dated_data.Close, rule, "last")
+    assert 0 < len(cache) < 3
+    assert cache.nbytes <= cache.max_bytes
+
+
+class WeeklySmaStrategy(Strategy):
+    n = 4
+
+    def init(self):
+        self.weekly = resample_apply("W", _sma, self.data.Close, self.n)
+
+    def next(self):
+        if self.data.Close[-1] > self.weekly[-1]:
+            if not self.position:
+                self.buy()
+        elif self.position:
+            self.position.close()
+
+
+def test_strategy_runs_share_bars(dated_data):
+    backtest = Backtest(dated_data, WeeklySmaStrategy, cash=10000)
+    results = [backtest.run(n=n) for n in (4, 8, 4)]
+    assert RESAMPLE_CACHE.misses == 1 and RESAMPLE_CACHE.hits == 2
+    assert results[0]["# Trades"] == results[2]["# Trades"] > 0
+    expected = _reference("W", _sma, dated_data.Close, 8).to_numpy()
+    np.testing.assert_array_equal(results[1]._strategy.weekly, expected)
@@ -0,0 +1,105 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from pystockfilter.backtesting.lib import crossover
+from pystockfilter.data.stock_data_source import DataSourceModule as Data
+from pystockfilter.strategy.base_strategy import BaseStrategy
+from pystockfilter.tool.scheduler import JobScheduler, OptimizationJob
+from pystockfilter.tool.start_optimizer import StartOptimizer
+
+
+class SmaCloseStrategy(BaseStrategy):
+    para_sma = 10
+
+    def init(self):
+        self.close = self.I(lambda x: x.Close, self.data)
+        self.sma = self.I(
+            lambda x, n: pd.Series(x).rolling(n).mean(), self.data.Close, self.para_sma
+        )
+        self.setup(
+            buy_signal=lambda: crossover(self.close, self.sma),
+            sell_signal=lambda: crossover(self.sma, self.close),
+        )
+
+
+def job(parameter, bars, symbol="AAPL"):
+    return OptimizationJob(
+        SmaCloseStrategy, symbol, parameter, pd.DataFrame({"Close": range(bars)})
+    )
+
+
+def test_grid_size():
+    assert JobScheduler.grid_size({"para_a": range(10), "para_b": [1, 2]}) == 20
+    assert JobScheduler.grid_size({"para_a": 3, "constraint": lambda p: True}) == 1
+    assert JobScheduler.grid_size([{"para_a": range(10)}, {"para_b": range(5)}]) == 15
+    assert JobScheduler.grid_size({"para_a": range(100), "max_tries": 0.1}) == 10
+    assert JobScheduler.grid_size({"para_a": range(100), "max_tries": 7}) == 7
+
+
+def test_plan_longest_first():
+    small = job({"para_a": range(2)}, 100, "S")
+    large = job({"para_a": range(50)}, 100, "L")
+    long_history = job({"para_a": range(2)}, 10000, "H")
+    planned = JobScheduler().plan([small, large, long_history])
+    assert [j.symbol for j in planned] == ["H", "L", "S"]
+
+
+def test_fit_keeps_jobs_within_budget():
+    scheduler = JobScheduler(job_budget=10.0, seconds_per_unit=0.001)
+    parameter = {"para_a": range(10)}
+    assert scheduler.fit(job(parameter, 100), 10.0) is parameter
+
+
+def test_fit_samples_grid():
+    scheduler = JobScheduler(seconds_per_unit=0.001)
+    parameter = {"para_a": range(100)}
+    fitted = scheduler.fit(job(parameter, 100), 5.0)
+    assert fitted["method"] == "grid"
+    assert fitted["max_tries"] == 50
+
+
+def test_fit_switches_to_skopt():
+    scheduler = JobScheduler(seconds_per_unit=0.001, min_tries=10)
+    parameter = {"para_a": range(100), "para_b": range(100)}
+    fitted = scheduler.fit(job(parameter, 100), 2.0)
+    assert fitted["method"] == "skopt"
+    assert fitted["max_tries"] == 20
+
+
+def test_fit_sequential_stages():
+    scheduler = JobScheduler(seconds_per_unit=0.001)
+    parameter = [{"para_a": range(100)}, {"para_b": range(100)}]
+    fitted = scheduler.fit(job(parameter, 100), 10.0)
+    assert [stage["max_tries"] for stage in fitted] == [50, 50]
+
+
+def test_budget_for_shares_total_budget():
+    scheduler = JobScheduler(total_budget=100.0)
+    scheduler.start()
+    budget = scheduler.budget_for(job({"para_a": range(10)}, 100), 4000)
+    assert budget == pytest.approx(25.0, rel=0.01)
+
+
+def test_record_refines_estimate():
+    scheduler = JobScheduler(seconds_per_unit=1.0)
+    parameter = {"para_a": range(10)}
+    scheduler.record(job(parameter, 100), parameter, 2.0)
+    assert scheduler.estimated_seconds_per_unit == pytest.approx(0.002)
+
+
+@patch("pystockfilter.tool.start_base.my_now", return_value=datetime(2019, 7, 30))
+def test_run_scheduled(my_now):
+    opt = StartOptimizer(
+        ["AAPL", "MSFT"],
+        [SmaCloseStrategy],
+        [{"para_sma": range(5, 40, 1)}],
+        Data(source=Data.LOCAL, options={"STOCK_DATA_PATH": "tests/test_data"}),
+    )
+    scheduler = JobScheduler(job_budget=60.0, seconds_per_unit=1e-6)
+    result = opt.run(history_months=12, scheduler=scheduler)
+    assert len(result) == 2
+    assert {r.symbol for r in result} == {"AAPL", "MSFT"}
+    assert scheduler.estimated_seconds_per_unit > 0
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from pystockfilter.backtesting import Backtest, lib
+from pystockfilter.strategy import signals
+from pystockfilter.strategy.bollinger_volume_strategy import BollingerVolumeStrategy
+from pystockfilter.strategy.doji_rsi_strategy import DojiRsiStrategy
+from pystockfilter.strategy.ema_cross_ema_strategy import EmaCrossEmaStrategy
+from pystockfilter.strategy.uo_ema_cross_ema_strategy import (
+    UltimateEmaCrossEmaStrategy,
+)
+
+
+def per_bar(func, series1, series2):
+    # what a lambda signal sees at every bar
+    def sliced(series, i):
+        return series if np.isscalar(series) else series[: i + 1]
+
+    return np.array(
+        [bool(func(sliced(series1, i), sliced(series2, i))) for i in range(len(series1))]
+    )
+
+
+@pytest.mark.parametrize("func", ["crossover", "cross", "gt"])
+def test_signals_match_per_bar_functions(func):
+    rng = np.random.default_rng(0)
+    series1 = rng.normal(size=200).cumsum()
+    series2 = rng.normal(size=200).cumsum()
+    series2[:20] = np.nan
+    series2[100] = np.nan
+    # lib.gt indexes both arguments
+    for other in (series2, 1.5) if func != "gt" else (series2,):
+        np.testing.assert_array_equal(
+            getattr(signals, func)(series1, other),
+            per_bar(getattr(lib, func), series1, other),
+        )
+
+
+def test_precomputed_signal_follows_data(apple_data):
+    values = np.arange(len(apple_data)) % 3 == 0
+    signal = signals.PrecomputedSignal(values, apple_data)
+    assert signal() == values[-1]
+    assert signal.data is apple_data
+    with pytest.raises(ValueError):
+        signals.PrecomputedSignal(values[:-1], apple_data)
+
+
+class LambdaEmaCrossEma(EmaCrossEmaStrategy):
+    def init(self):
+        super().init()
+        self.setup(
+            buy_signal=lambda: lib.crossover(self.ema_long, self.ema_short),
+            sell_signal=lambda: lib.cross(self.ema_short, self.ema_long),
+        )
+
+
+class LambdaBollingerVolume(BollingerVolumeStrategy):
+    def init(self):
+        super().init()
+        self.setup(
+            buy_signal=lambda: lib.crossover(self.close, self.bb_lower)
+            and self.volume > self.volume_ma * self.para_volume_multiplier,
+            sell_signal=lambda: lib.crossover(self.close, self.bb_upper)
+            and self.volume > self.volume_ma * self.para_volume_multiplier,
+        )
+
+
+class LambdaUltimateEmaCrossEma(UltimateEmaCrossEmaStrategy):
+    def init(self):
+        super().init()
+        self.setup(
+            buy_signal=lambda: lib.crossover(self.ema_long, self.ema_short)
+            and self.uo > self.uo_upper,
+            sell_signal=lambda: lib.cross(self.ema_short, self.ema_long)
+            and self.uo_lower > self.uo,
+        )
+
+
+class StatefulDojiRsi(DojiRsiStrategy):
+    # the former per-bar implementation tracking the last Doji
+    def init(self):
+        super().init()
+        self.last_doji_index = None
+        self.setup(
+            buy_signal=lambda: self.condition(1),
+            sell_signal=lambda: self.condition(-1),
+        )
+
+    def condition(self, direction):
+        if self.doji != 0:
+            self.last_doji_index = len(self.close) - 1
+            return False
+        if self.last_doji_index is None:
+            return False
+        previous_close = self.close[self.last_doji_index]
+        previous_rsi = self.rsi[self.last_doji_index]
+        close, rsi = self.close[-1], self.rsi[-1]
+        divergence = (close < previous_close and rsi > previous_rsi) or (
+            close > previous_close and rsi < previous_rsi
+        )
+        confirmation = 1 + direction * self.para_confirmation_threshold / 100
+        return divergence and direction * close > direction * previous_close * confirmation
+
+
+@pytest.mark.parametrize(
+    "strategy, reference, parameters",
+    [
+        (EmaCrossEmaStrategy, LambdaEmaCrossEma, {}),
+        (BollingerVolumeStrategy, LambdaBollingerVolume, {}),
+        (
+            UltimateEmaCrossEmaStrategy,
+            LambdaUltimateEmaCrossEma,
+            {"para_uo_upper": 40, "para_uo_lower": 60},
+        ),
+        (DojiRsiStrategy, StatefulDojiRsi, {}),
+        (
+            DojiRsiStrategy,
+            StatefulDojiRsi,
+            {"para_rsi_period": 5, "para_confirmation_threshold": 0},
+        ),
+    ],
+)
+def test_vectorized_signals_match_lambdas(apple_data, strategy, reference, parameters):
+    expected = Backtest(apple_data, reference, cash=10000).run(**parameters)
+    result = Backtest(apple_data, strategy, cash=10000).run(**parameters)
+    assert result["# Trades"] == expected["# Trades"] > 0
+    assert result["Return [%]"] == expected["Return [%]"]
@@ -384,3 +384,24 @@ def test_chunked_optimizer(
     assert len(result) == 1
     assert result[0].parameter == expected_optimal_param
     assert expected_earnings == pytest.approx(result[0].earnings, 0.01)
+
+
+@patch("pystockfilter.tool.start_base.my_now", return_value=datetime(2019, 7, 30))
+def test_backtest_loads_universe_once(my_now):
+    data = Data(source=Data.LOCAL, options={"STOCK_DATA_PATH": "tests/test_data"})
+    symbols = ["AAPL", "MSFT", "GOOG"]
+    bt = StartBacktest(symbols, [ECCS, SCCS], [{}, {}], data)
+    with patch.object(
+        data.data_source, "get_many", wraps=data.data_source.get_many
+    ) as get_many, patch.object(
+        data.data_source, "get_stock_data", wraps=data.data_source.get_stock_data
+    ) as get_stock_data:
+        result = bt.run()
+    assert len(result) == 6
+    get_many.assert_called_once()
+    # the frames are not kept after the run
+    assert bt._universe is None
+    # the default get_many reads each symbol once for both strategies
+    assert sorted(call.args[0] for call in get_stock_data.call_args_list) == sorted(
+        symbols
+    )
@@ -0,0 +1,76 @@
+import gc
+import os
+import tempfile
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+from pystockfilter.backtesting import Backtest, StreamingBacktest
+from pystockfilter.strategy import StrategyName, strategy_from_name
+
+KWARGS = {"cash": 10000, "commission": 0.002, "exclusive_orders": True, "trade_on_close": True}
+
+
+def _blocks(data, size):
+    return lambda: (data.iloc[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize(
+    "name",
+    [StrategyName.ECCS, StrategyName.MACD, StrategyName.MARSI, StrategyName.UO],
+)
+def test_matches_backtest(dated_data, name, tmp_path):
+    strategy = strategy_from_name(name)
+    expected = Backtest(dated_data, strategy, **KWARGS).run()
+    stats = StreamingBacktest(
+        _blocks(dated_data, 500), strategy, warmup=100, directory=str(tmp_path), **KWARGS
+    ).run()
+    assert stats["# Trades"] == expected["# Trades"] > 0
+    assert_frame_equal(stats._trades, expected._trades)
+    assert_frame_equal(stats._equity_curve, expected._equity_curve)
+    assert stats["Sharpe Ratio"] == expected["Sharpe Ratio"]
+
+
+def test_equity_is_memory_mapped(dated_data, tmp_path):
+    strategy = strategy_from_name(StrategyName.RSIS)
+    backtest = StreamingBacktest(
+        _blocks(dated_data, 1000), strategy, directory=str(tmp_path), **KWARGS
+    )
+    first = backtest.run()
+    equity = np.fromfile(os.path.join(tmp_path, "Equity.bin"), np.float64)
+    np.testing.assert_array_equal(equity, first._equity_curve.Equity.to_numpy())
+    assert len(equity) == len(dated_data)
+    # the callable returns new blocks for every run
+    second = backtest.run()
+    assert second["Equity Final [$]"] == first["Equity Final [$]"]
+
+
+def test_temporary_directory_removed_with_results(dated_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    strategy = strategy_from_name(StrategyName.RSIS)
+    backtest = StreamingBacktest(_blocks(dated_data, 1000), strategy, **KWARGS)
+    stats = backtest.run()
+    (directory,) = tmp_path.iterdir()
+    assert len(stats._equity_curve) == len(dated_data)
+    del stats, backtest
+    gc.collect()
+    assert not directory.exists()
+
+    def failing():
+        yield dated_data.iloc[:1000]
+        raise OSError("source failed")
+
+    with pytest.raises(OSError):
+        StreamingBacktest(failing(), strategy, **KWARGS).run()
+    assert not any(tmp_path.iterdir())
+
+
+def test_invalid_blocks(dated_data):
+    strategy = strategy_from_name(StrategyName.RSIS)
+    with pytest.raises(ValueError):
+        StreamingBacktest([dated_data.iloc[:0]], strategy).run()
+    with pytest.raises(ValueError):
+        StreamingBacktest([dated_data], strategy, warmup=1)
+    with pytest.raises(TypeError):
+        StreamingBacktest([dated_data], object)
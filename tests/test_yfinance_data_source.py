@@ -1,5 +1,11 @@
+from datetime import datetime
 from unittest.mock import patch
+
+import pytest
+from freezegun import freeze_time
+
 from pystockfilter.data.yfinance_source import YFinanceDataSource
+from pystockfilter.data.yfinance_source_cache import YFinanceDataSourceCache
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
@@ -17,4 +23,79 @@ def test_get_stock_data(mock_download):
     mock_download.return_value = mock_df
     ds = YFinanceDataSource()
     result = ds.get_stock_data('AAPL', '2020-01-01', '2020-01-03')
-    assert_frame_equal(result, mock_df)
\ No newline at end of file
+    assert_frame_equal(result, mock_df)
+
+class StubDownloader:
+    """Business day bars whose Close is the day of the month."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((start, end))
+        index = pd.bdate_range(start, end, inclusive="left", name="Date")
+        return pd.DataFrame({"Close": index.day.astype(float)}, index=index)
+
+
+@pytest.fixture
+def stub_cache(tmp_path, monkeypatch):
+    stub = StubDownloader()
+    monkeypatch.setattr(YFinanceDataSourceCache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(YFinanceDataSourceCache, "downloader", staticmethod(stub))
+    return stub
+
+
+@freeze_time("2024-03-29")
+def test_cache_fetches_missing_ranges(stub_cache):
+    get = YFinanceDataSourceCache.get_stock_data
+    first = get("AAPL", datetime(2024, 2, 1), datetime(2024, 2, 29))
+    assert stub_cache.calls == [("2024-02-01", "2024-03-01")]
+    assert first.index[0] == pd.Timestamp("2024-02-01") and len(first) == 21
+
+    # sub-ranges are served locally
+    inner = get("AAPL", datetime(2024, 2, 5), datetime(2024, 2, 9))
+    assert len(stub_cache.calls) == 1 and list(inner.Close) == [5, 6, 7, 8, 9]
+
+    # a new day only downloads the tail, an earlier start only the head
+    get("AAPL", datetime(2024, 2, 1), datetime(2024, 3, 4))
+    wider = get("AAPL", datetime(2024, 1, 15), datetime(2024, 3, 4))
+    assert stub_cache.calls[1:] == [
+        ("2024-03-01", "2024-03-05"),
+        ("2024-01-15", "2024-02-01"),
+    ]
+    assert wider.index.is_unique and wider.index.is_monotonic_increasing
+    assert len(wider) == len(pd.bdate_range("2024-01-15", "2024-03-04"))
+
+
+@freeze_time("2024-03-29")
+def test_cache_refreshes_current_day(stub_cache):
+    get = YFinanceDataSourceCache.get_stock_data
+    get("AAPL", datetime(2024, 3, 1), datetime(2024, 3, 29))
+    data = get("AAPL", datetime(2024, 3, 1), datetime(2024, 3, 29))
+    assert stub_cache.calls == [
+        ("2024-03-01", "2024-03-30"),
+        ("2024-03-29", "2024-03-30"),
+    ]
+    assert data.index.is_unique and data.index[-1] == pd.Timestamp("2024-03-29")
+    start, end, _ = YFinanceDataSourceCache.load("AAPL")
+    assert (start, end) == (pd.Timestamp("2024-03-01"), pd.Timestamp("2024-03-29"))
+
+
+@patch('yfinance.download')
+def test_get_many(mock_download):
+    index = pd.DatetimeIndex(['2020-01-02', '2020-01-03'], name='Date')
+    columns = pd.MultiIndex.from_product(
+        [['AAPL', 'SAP.DE'], ['Open', 'Close']], names=['Ticker', 'Price']
+    )
+    mock_download.return_value = pd.DataFrame(
+        [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, float('nan'), float('nan')]],
+        index=index,
+        columns=columns,
+    )
+    frames = YFinanceDataSource.get_many(['AAPL', 'SAP.DE', 'XYZ'], '2020-01-01', '2020-01-04')
+    mock_download.assert_called_once()
+    assert list(mock_download.call_args.args[0]) == ['AAPL', 'SAP.DE', 'XYZ']
+    assert list(frames['AAPL'].columns) == ['Open', 'Close']
+    assert list(frames['AAPL'].Close) == [2.0, 6.0]
+    assert list(frames['SAP.DE'].Open) == [3.0]
+    assert frames['XYZ'].empty